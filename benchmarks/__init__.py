@@ -0,0 +1 @@
+"""Benchmarks de l'AFIS Console (voir benchmarks/run_benchmarks.py)."""
@@ -0,0 +1,156 @@
+"""
+Benchmarks du tri sur des rapports FAED synthétiques.
+
+Mesure, pour chaque taille de lot, le débit (fichiers/s) et le pic de
+mémoire résidente de has_no_homonyme, _extract_section_identities,
+extract_identities_details et process_folder. Chaque mesure tourne dans un
+processus neuf pour que le pic de RSS lui soit propre.
+
+Usage :
+    python benchmarks/run_benchmarks.py --sizes 100 1000 --output bench.json
+    python benchmarks/run_benchmarks.py --compare bench_0.2.0.json
+
+Les résultats sont écrits en JSON dans --output (bench_output.json par
+défaut) ; --compare signale les baisses de débit et hausses de mémoire
+au-delà de --tolerance et fait échouer la commande.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+FUNCTIONS = ('has_no_homonyme', '_extract_section_identities', 'extract_identities_details')
+
+
+def _peak_rss_kb() -> int | None:
+    """Pic de mémoire résidente du processus courant et de ses enfants, en Kio."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss est en octets sous macOS, en Kio ailleurs
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _bench_function(name: str, corpus_dir: str) -> dict:
+    from afis_console.core import sorter
+
+    func = getattr(sorter, name)
+    paths = sorted(os.path.join(corpus_dir, f) for f in os.listdir(corpus_dir))
+    start = time.perf_counter()
+    for path in paths:
+        func(path)
+    return {'seconds': time.perf_counter() - start, 'peak_rss_kb': _peak_rss_kb()}
+
+
+def _bench_process_folder(corpus_dir: str, workers: int) -> dict:
+    from afis_console.core.sorter import process_folder
+
+    with tempfile.TemporaryDirectory() as work:
+        source = os.path.join(work, 'source')
+        shutil.copytree(corpus_dir, source)
+        start = time.perf_counter()
+        process_folder(source, log_callback=lambda msg: None, workers=workers, use_cache=False)
+        seconds = time.perf_counter() - start
+    return {'seconds': seconds, 'peak_rss_kb': _peak_rss_kb()}
+
+
+def _isolated(func, *args) -> dict:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(func, *args).result()
+
+
+def run(sizes, aliases: int, pages: int, workers: int, seed: int) -> dict:
+    from afis_console import __version__
+    from benchmarks.synthetic import generate_corpus
+    import fitz
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            corpus_dir = os.path.join(tmp, f'corpus_{size}')
+            generate_corpus(corpus_dir, size, aliases=aliases, pages=pages, seed=seed)
+
+            runs = [(name, _bench_function, (name, corpus_dir)) for name in FUNCTIONS]
+            runs.append(('process_folder', _bench_process_folder, (corpus_dir, workers)))
+            for name, func, args in runs:
+                measure = _isolated(func, *args)
+                results.append({
+                    'benchmark': name,
+                    'files': size,
+                    'seconds': round(measure['seconds'], 4),
+                    'files_per_second': round(size / measure['seconds'], 2) if measure['seconds'] else None,
+                    'peak_rss_kb': measure['peak_rss_kb'],
+                })
+                print(f"  {name:<30} {size:>6} fichiers  {results[-1]['files_per_second']:>10} fichiers/s")
+            shutil.rmtree(corpus_dir)
+
+    return {
+        'afis_console': __version__,
+        'python': platform.python_version(),
+        'pymupdf': fitz.VersionBind,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'parameters': {'aliases': aliases, 'pages': pages, 'workers': workers, 'seed': seed},
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Retourne la liste des régressions (débit plus bas ou RSS plus haut que tolerance)."""
+    previous = {(r['benchmark'], r['files']): r for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        old = previous.get((r['benchmark'], r['files']))
+        if old is None:
+            continue
+        if old['files_per_second'] and r['files_per_second'] < old['files_per_second'] * (1 - tolerance):
+            regressions.append(f"{r['benchmark']} ({r['files']} fichiers) : débit "
+                               f"{old['files_per_second']} → {r['files_per_second']} fichiers/s")
+        if old['peak_rss_kb'] and r['peak_rss_kb'] and r['peak_rss_kb'] > old['peak_rss_kb'] * (1 + tolerance):
+            regressions.append(f"{r['benchmark']} ({r['files']} fichiers) : RSS "
+                               f"{old['peak_rss_kb']} → {r['peak_rss_kb']} Kio")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du tri sur des rapports FAED synthétiques")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Tailles de lot (défaut : 100 1000 10000).")
+    parser.add_argument("--aliases", type=int, default=3, help="Nombre d'alias par rapport (défaut : 3).")
+    parser.add_argument("--pages", type=int, default=2, help="Pages de signalisations par rapport (défaut : 2).")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="Processus d'analyse pour process_folder (défaut : 1).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_output.json", help="Fichier JSON de sortie (défaut : bench_output.json).")
+    parser.add_argument("--compare", help="Résultats JSON de référence à comparer.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Écart toléré avec la référence (défaut : 0.10).")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.aliases, args.pages, args.workers, args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"Résultats : {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"RÉGRESSION : {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Temps de démarrage du CLI.
+
+Importe afis_console.main sous « python -X importtime » dans un processus
+neuf (cache des modules froid côté interpréteur) et mesure l'exécution de
+« python -m afis_console.main --help ». Échoue si un module lourd
+(PyMuPDF, tkinter, customtkinter) est chargé au démarrage, ou si --max-ms
+est dépassé.
+
+Usage :
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 5 --max-ms 150 --output startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules qui ne doivent pas être importés au démarrage du CLI
+HEAVY_MODULES = ('fitz', 'pymupdf', 'tkinter', 'customtkinter')
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.join(ROOT, 'src'), env.get('PYTHONPATH')]))
+    return env
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Lignes « import time: self | cumulative | module » -> (module, self µs, cumulé µs)."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # ligne d'en-tête
+        name = fields[2].strip()
+        modules.append((name, int(fields[0]), int(fields[1])))
+    return modules
+
+
+def measure_imports() -> dict:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import afis_console.main'],
+        capture_output=True, text=True, env=_env(), check=True,
+    )
+    modules = parse_importtime(result.stderr)
+    names = {name for name, _, _ in modules}
+    total = next(cumulative for name, _, cumulative in modules if name == 'afis_console.main')
+    slowest = sorted(modules, key=lambda m: m[1], reverse=True)[:10]
+    return {
+        'import_ms': total / 1000,
+        'modules': len(modules),
+        'heavy_modules': [m for m in HEAVY_MODULES if m in names],
+        'slowest': [{'module': name, 'self_ms': own / 1000} for name, own, _ in slowest],
+    }
+
+
+def measure_help(repeat: int) -> float:
+    """Meilleur temps (ms) de « python -m afis_console.main --help » sur repeat exécutions."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'afis_console.main', '--help'],
+                       capture_output=True, env=_env(), check=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps de démarrage du CLI")
+    parser.add_argument("--repeat", type=int, default=3, help="Exécutions de --help mesurées (meilleur temps retenu)")
+    parser.add_argument("--max-ms", type=float, help="Échec si --help dépasse ce temps (ms)")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    results = measure_imports()
+    results['help_ms'] = measure_help(args.repeat)
+    results['python'] = platform.python_version()
+
+    print(f"import afis_console.main : {results['import_ms']:.1f} ms ({results['modules']} modules)")
+    for entry in results['slowest'][:5]:
+        print(f"  {entry['self_ms']:8.1f} ms  {entry['module']}")
+    print(f"--help : {results['help_ms']:.1f} ms (meilleur de {args.repeat})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failed = False
+    if results['heavy_modules']:
+        print(f"❌ Modules lourds importés au démarrage : {', '.join(results['heavy_modules'])}")
+        failed = True
+    if args.max_ms is not None and results['help_ms'] > args.max_ms:
+        print(f"❌ Démarrage trop lent : {results['help_ms']:.1f} ms > {args.max_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
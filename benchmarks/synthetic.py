@@ -0,0 +1,125 @@
+"""
+Générateur de rapports FAED synthétiques (PDF) pour les benchmarks et les
+tests de bout en bout.
+
+La mise en page reproduit ce que lit core/sorter.py :
+- page 1 : "Recherches dactyloscopiques concernant :" suivi du nom, puis la
+  ligne "Homonymes" avec "non"/"oui" dans un bloc séparé sur la même ligne ;
+- SECTION / Identités : identité, date de naissance, puis les alias
+  (né(e) le → NOM → nombre de signalisations → nombre d'homonymes) ;
+- SECTION / Signalisations : M pages de remplissage.
+"""
+import os
+import random
+
+import fitz  # PyMuPDF
+
+_FONT_SIZE = 10
+_LINE_HEIGHT = 14
+_TOP = 72
+_BOTTOM = 770
+
+_SURNAMES = ["DUPONT", "MARTIN", "DURAND", "LÉON-MARIE", "O'BRIEN", "BERNARD", "PETIT", "ROUX"]
+_FIRST_NAMES = ["JEAN", "PAUL", "ANNE", "SEAN", "LUC", "MARIE", "KARIM", "SOPHIE"]
+
+
+class _Writer:
+    """Écrit des lignes de texte en passant à la page suivante si besoin."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.new_page()
+
+    def new_page(self):
+        self.page = self.doc.new_page()
+        self.y = _TOP
+
+    def line(self, text: str, x: float = 72):
+        if self.y > _BOTTOM:
+            self.new_page()
+        self.page.insert_text((x, self.y), text, fontsize=_FONT_SIZE)
+        self.y += _LINE_HEIGHT
+
+    def same_line(self, left: str, right: str, gap: float = 130):
+        """Deux blocs séparés sur la même ligne (comme "Homonymes ... non")."""
+        if self.y > _BOTTOM:
+            self.new_page()
+        self.page.insert_text((72, self.y), left, fontsize=_FONT_SIZE)
+        self.page.insert_text((72 + gap, self.y), right, fontsize=_FONT_SIZE)
+        self.y += _LINE_HEIGHT
+
+
+def generate_report(path: str, identity: str, dob: str, aliases=(), page1_homonyms: bool = False,
+                    signalisation_pages: int = 1, with_section: bool = True):
+    """
+    Écrit un rapport synthétique.
+    aliases : séquence de (nom, date de naissance, signalisations, homonymes).
+    page1_homonyms : True → "Homonymes oui" en page 1, sinon "Homonymes non".
+    """
+    doc = fitz.open()
+    w = _Writer(doc)
+    w.line("DFAED - Rapport de signalisation")
+    w.line("Recherches dactyloscopiques concernant :")
+    w.line(identity)
+    w.same_line("Homonymes", "oui" if page1_homonyms else "non")
+    w.line("Fin de la page de garde")
+
+    if with_section:
+        w.new_page()
+        w.line("SECTION / Identités")
+        w.line(identity)
+        w.line(f"né(e) le {dob} à PARIS")
+        w.line(f"{identity} est connu(e) sous les identités suivantes :")
+        for name, alias_dob, signalisations, homonyms in aliases:
+            w.line(f"né(e) le {alias_dob}")
+            w.line(name)
+            w.line(str(signalisations))
+            w.line(f"Nombre d'homonymes : {homonyms}")
+        w.line("Nombre d'homonymes")
+        w.line("(indique le nombre de personnes partageant la même identité)")
+        w.line("SECTION / Signalisations")
+        for page in range(signalisation_pages):
+            w.new_page()
+            for row in range(45):
+                w.line(f"Signalisation {page + 1}.{row + 1} - service, lieu, date, motif")
+
+    doc.save(path)
+    doc.close()
+
+
+def random_identity(rng: random.Random) -> tuple[str, str]:
+    name = f"{rng.choice(_SURNAMES)} {rng.choice(_FIRST_NAMES)}"
+    dob = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(1940, 2005)}"
+    return name, dob
+
+
+def generate_corpus(directory: str, count: int, aliases: int = 3, pages: int = 2, seed: int = 0) -> list[str]:
+    """
+    Génère `count` rapports dans directory, avec `aliases` alias et `pages`
+    pages de signalisations chacun. La répartition des cas (propre,
+    homonymes, erreur d'état civil, espaces) est tirée avec `seed`.
+    Retourne la liste des chemins créés.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        identity, dob = random_identity(rng)
+        case = rng.random()
+        # L'alias auto-généré par la signalisation en cours
+        alias_list = [(identity, dob, 1, 0)]
+        for _ in range(max(0, aliases - 1)):
+            other, other_dob = random_identity(rng)
+            alias_list.append((other, other_dob, rng.randint(1, 5), 0))
+        if case < 0.6:
+            alias_list.append((identity, dob, rng.randint(2, 9), 0))
+        elif case < 0.75:
+            alias_list.append((identity, dob, 2, rng.randint(1, 3)))
+        elif case < 0.85:
+            alias_list.append((identity.replace(" ", "", 1), dob, 3, 0))
+        page1_homonyms = 0.95 <= case
+        path = os.path.join(directory, f"rapport_{i:06d}.pdf")
+        generate_report(path, identity, dob, alias_list, page1_homonyms=page1_homonyms,
+                        signalisation_pages=pages)
+        paths.append(path)
+    return paths
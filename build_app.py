@@ -1,25 +1,32 @@
 import PyInstaller.__main__
-import customtkinter
 import os
 import platform
 import sys
 import shutil
 
+# --cli : exécutable console sans interface graphique (tkinter et
+# customtkinter exclus), plus léger et plus rapide à démarrer pour les
+# traitements planifiés
+cli_build = '--cli' in sys.argv[1:]
+
 # Add src to path for imports to work during build analysis if not installed
 sys.path.insert(0, os.path.abspath("src"))
 
 # Determine OS specific separator
 sep = ';' if platform.system() == "Windows" else ':'
 
-# Get customtkinter path
-ctk_path = os.path.dirname(customtkinter.__file__)
-
 # Log
-print(f"Building for {platform.system()}")
-print(f"CustomTkinter path: {ctk_path}")
+print(f"Building for {platform.system()}{' (CLI)' if cli_build else ''}")
+
+if not cli_build:
+    import customtkinter
+
+    # Get customtkinter path
+    ctk_path = os.path.dirname(customtkinter.__file__)
+    print(f"CustomTkinter path: {ctk_path}")
 
 # Output name
-app_name = "TriRapportsFAED"
+app_name = "TriRapportsFAED-CLI" if cli_build else "TriRapportsFAED"
 
 # Platform-specific suffix
 if platform.system() == "Windows":
@@ -57,16 +64,24 @@ args = [
     'src/afis_console/main.py',
     '--name', app_name_with_suffix,
     '--onefile',    # Single executable file
-    '--windowed',   # No console window (GUI app)
-    f'--add-data={ctk_path}{sep}customtkinter',
     f'--add-data=src/afis_console/assets{sep}afis_console/assets',  # Include assets folder
     '--paths=src',
     '--clean',
     '--log-level=INFO',
+    # fitz est importé à la demande (ParsedReport), invisible pour l'analyse statique
     '--hidden-import=fitz',
     '--hidden-import=pymupdf',
 ]
 
+if cli_build:
+    # Console app: the GUI stack is never imported in CLI mode
+    args += ['--console', '--exclude-module=customtkinter', '--exclude-module=tkinter']
+else:
+    args += [
+        '--windowed',   # No console window (GUI app)
+        f'--add-data={ctk_path}{sep}customtkinter',
+    ]
+
 # Add icon if available
 if icon_arg:
     args.append(icon_arg)
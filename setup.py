@@ -15,6 +15,9 @@ setup(
         "pymupdf",
         "packaging"
     ],
+    extras_require={
+        "parquet": ["pyarrow"],
+    },
     entry_points={
         "console_scripts": [
             "afis-console=afis_console.main:main",
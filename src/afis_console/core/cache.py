@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+CACHE_FILENAME = ".afis_cache.sqlite"
+
+# Valeurs par défaut de l'éviction faite en fin de traitement
+DEFAULT_MAX_AGE_DAYS = 90
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Nombre d'insertions entre deux commits : un crash ne perd que ce lot
+COMMIT_EVERY = 50
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Empreinte SHA-256 du contenu du fichier (lecture par blocs)."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def data_digest(data) -> str:
+    """Empreinte SHA-256 d'un contenu déjà lu, identique à file_digest du fichier."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Cache persistant des résultats d'analyse, stocké en SQLite dans le
+    dossier de destination.
+
+    Clé : empreinte du contenu du PDF + version des règles de tri. Un fichier
+    renommé ou déplacé garde donc son entrée, et toute modification des
+    règles (rules_version) rend les anciennes entrées invisibles.
+    """
+
+    def __init__(self, directory: str, rules_version: int):
+        self.path = os.path.join(directory, CACHE_FILENAME)
+        self.rules_version = rules_version
+        self._pending = 0
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " digest TEXT NOT NULL,"
+            " rules_version INTEGER NOT NULL,"
+            " result TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (digest, rules_version))"
+        )
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get(self, digest: str) -> dict | None:
+        row = self._conn.execute(
+            "SELECT result FROM analyses WHERE digest = ? AND rules_version = ?",
+            (digest, self.rules_version),
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute(
+            "UPDATE analyses SET last_used = ? WHERE digest = ? AND rules_version = ?",
+            (time.time(), digest, self.rules_version),
+        )
+        return json.loads(row[0])
+
+    def put(self, digest: str, result: dict):
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO analyses (digest, rules_version, result, created, last_used)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (digest, self.rules_version, json.dumps(result, ensure_ascii=False), now, now),
+        )
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.commit()
+
+    def commit(self):
+        self._conn.commit()
+        self._pending = 0
+
+    def evict(self, max_age_days: float | None = DEFAULT_MAX_AGE_DAYS,
+              max_entries: int | None = DEFAULT_MAX_ENTRIES) -> int:
+        """
+        Supprime les entrées d'une autre version des règles, celles non
+        utilisées depuis max_age_days, puis les moins récemment utilisées
+        au-delà de max_entries. Retourne le nombre d'entrées supprimées.
+        """
+        removed = self._conn.execute(
+            "DELETE FROM analyses WHERE rules_version != ?", (self.rules_version,)
+        ).rowcount
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            removed += self._conn.execute(
+                "DELETE FROM analyses WHERE last_used < ?", (cutoff,)
+            ).rowcount
+        if max_entries is not None:
+            removed += self._conn.execute(
+                "DELETE FROM analyses WHERE rowid NOT IN ("
+                " SELECT rowid FROM analyses ORDER BY last_used DESC LIMIT ?)",
+                (max_entries,),
+            ).rowcount
+        self._conn.commit()
+        return removed
+
+    def clear(self) -> int:
+        """Invalide tout le cache. Retourne le nombre d'entrées supprimées."""
+        removed = self._conn.execute("DELETE FROM analyses").rowcount
+        self._conn.commit()
+        self._conn.execute("VACUUM")
+        return removed
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+CHECKPOINT_FILENAME = ".afis_checkpoint.json"
+
+
+class RunControl:
+    """
+    Annulation et pause coopératives d'un traitement.
+
+    cancel(), pause() et resume() sont appelés depuis un autre thread
+    (interface, gestionnaire de signal) ; le tri appelle checkpoint() entre
+    deux fichiers et entre deux étapes d'un même fichier.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()  # débloque un traitement en pause
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def checkpoint(self) -> bool:
+        """Attend tant que le traitement est en pause ; retourne False s'il est annulé."""
+        self._running.wait()
+        return not self._cancelled.is_set()
+
+
+def checkpoint_path(base_dest: str) -> str:
+    return os.path.join(base_dest, CHECKPOINT_FILENAME)
+
+
+def _sources(source_dir) -> list[str]:
+    roots = [source_dir] if isinstance(source_dir, (str, os.PathLike)) else source_dir
+    return [os.path.abspath(root) for root in roots]
+
+
+def write_checkpoint(base_dest: str, source_dir: str | list[str], moved: list[dict]) -> str:
+    """
+    Enregistre les fichiers déjà déplacés d'un traitement annulé et leurs
+    résultats d'analyse. Écriture atomique : un point de reprise n'est
+    jamais lu à moitié écrit.
+    """
+    path = checkpoint_path(base_dest)
+    data = {
+        'sources': _sources(source_dir),
+        'updated': datetime.now().isoformat(timespec='seconds'),
+        'files': moved,
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_checkpoint(base_dest: str, source_dir: str | list[str]) -> list[dict] | None:
+    """Résultats des fichiers déjà déplacés par un traitement annulé des mêmes dossiers, ou None."""
+    try:
+        with open(checkpoint_path(base_dest), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('sources') != _sources(source_dir):
+        return None
+    return data.get('files', [])
+
+
+def remove_checkpoint(base_dest: str):
+    try:
+        os.remove(checkpoint_path(base_dest))
+    except FileNotFoundError:
+        pass
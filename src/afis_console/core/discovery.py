@@ -0,0 +1,145 @@
+import fnmatch
+import os
+import queue
+import threading
+
+DEFAULT_INCLUDE = ('*.pdf',)
+
+
+def _matches(relpath: str, patterns) -> bool:
+    """Motif glob comparé au chemin relatif à la racine ('/' comme séparateur) et au nom seul, sans casse."""
+    relpath = relpath.lower()
+    name = relpath.rsplit('/', 1)[-1]
+    return any(fnmatch.fnmatchcase(relpath, p) or fnmatch.fnmatchcase(name, p) for p in patterns)
+
+
+def iter_pdfs(roots, recursive: bool = False, include=None, exclude=None, skip_dirs=()):
+    """
+    Chemins des fichiers à trier, au fil du parcours.
+
+    roots : un ou plusieurs dossiers, parcourus dans l'ordre donné.
+    recursive : descend dans les sous-dossiers (liens symboliques de
+        dossiers non suivis, dossiers cachés ignorés).
+    include / exclude : motifs glob ('*.pdf', '2024-*/*', 'archives'...),
+        comparés sans casse au chemin relatif à la racine et au nom ; un
+        dossier exclu n'est pas parcouru.
+    skip_dirs : dossiers jamais parcourus (dossiers de destination situés
+        dans la source, notamment).
+
+    Repose sur os.scandir : le type de chaque entrée vient du parcours du
+    dossier, sans appel stat supplémentaire par fichier. Dans chaque
+    dossier, les fichiers sont rendus par ordre alphabétique, puis les
+    sous-dossiers sont parcourus dans le même ordre.
+    """
+    if isinstance(roots, (str, os.PathLike)):
+        roots = [roots]
+    include = tuple(p.lower() for p in (include or DEFAULT_INCLUDE))
+    exclude = tuple(p.lower() for p in (exclude or ()))
+    skip_dirs = {os.path.normcase(os.path.abspath(d)) for d in skip_dirs}
+
+    for root in roots:
+        stack = [(root, '')]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                relpath = prefix + entry.name
+                try:
+                    if entry.is_file():
+                        if _matches(relpath, include) and not _matches(relpath, exclude):
+                            yield entry.path
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        if (not entry.name.startswith('.') and not _matches(relpath, exclude)
+                                and os.path.normcase(os.path.abspath(entry.path)) not in skip_dirs):
+                            subdirs.append((entry.path, relpath + '/'))
+                except OSError:
+                    continue
+            stack.extend(reversed(subdirs))
+
+
+_DONE = object()
+
+
+class BackgroundScan:
+    """
+    Parcours dans un thread : les chemins sont rendus dès qu'ils sont
+    trouvés, et l'analyse commence sans attendre la fin du listage (utile
+    sur les partages réseau lents). total vaut None tant que le parcours
+    n'est pas terminé.
+
+    release(item) est appelé pour chaque élément produit mais jamais rendu
+    (arrêt par close()) : contenus lus d'avance à libérer, par exemple.
+    """
+
+    def __init__(self, paths, maxsize: int = 1000, release=None):
+        self.found = 0
+        self._finished = False
+        self._release = release or (lambda item: None)
+        self._queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()  # dépôt dans la file / vidage par close()
+        self._thread = threading.Thread(target=self._run, args=(paths,), daemon=True)
+        self._thread.start()
+
+    def _run(self, paths):
+        error = None
+        try:
+            for item in paths:
+                if not self._put(item):
+                    # Arrêté pendant que la source produisait cet élément
+                    self._release(item)
+                    return
+                self.found += 1
+        except BaseException as e:  # remonté au consommateur
+            error = e
+        self._finished = True
+        self._put((_DONE, error))
+
+    def _put(self, item) -> bool:
+        """Dépose item dans la file ; False si le parcours est arrêté (close() dépose alors la fin)."""
+        while True:
+            with self._lock:
+                if self._stop.is_set():
+                    return False
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+
+    @property
+    def total(self) -> int | None:
+        return self.found if self._finished else None
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, tuple) and item[0] is _DONE:
+                if item[1] is not None:
+                    raise item[1]
+                return
+            yield item
+
+    def close(self):
+        """
+        Arrête le parcours s'il n'est pas terminé, sans attendre le thread :
+        il peut être bloqué dans la source (listage d'un gros dossier,
+        parcours en amont) et s'arrête de lui-même à l'élément suivant. Les
+        éléments en attente sont libérés et la fin est déposée, pour qu'un
+        consommateur en attente sur la file soit réveillé.
+        """
+        self._stop.set()
+        with self._lock:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if not (isinstance(item, tuple) and item[0] is _DONE):
+                    self._release(item)
+            self._queue.put_nowait((_DONE, None))
@@ -0,0 +1,179 @@
+import csv
+import json
+
+from afis_console.core.records import FileResult, IdentityCluster
+
+EXPORT_FORMATS = ('jsonl', 'csv', 'parquet')
+DEFAULT_EXPORT_FORMATS = ('jsonl', 'csv')
+
+# Étapes chronométrées exportées en colonnes (secondes), voir StageTimer
+STAGES = ('read', 'hash', 'open', 'page1_words', 'text', 'parse', 'report', 'move')
+
+# Colonnes des formats tabulaires (CSV, Parquet), dans l'ordre
+COLUMNS = (
+    'filename', 'category', 'message', 'destination', 'cached',
+    'p1_clean', 'is_manual', 'is_identity_error', 'is_identity_space', 'pages_decoded',
+    'identities', 'homonyms_total',
+    'main_identity', 'section_identity', 'has_identity_section', 'has_mismatch', 'mismatch_type', 'aliases',
+    'seconds_total', *(f'seconds_{stage}' for stage in STAGES),
+)
+
+PARQUET_ROW_GROUP_SIZE = 1000
+
+
+def result_record(detail: FileResult, destination: str | None = None, cached: bool = False) -> dict:
+    """
+    Résultat d'un fichier sous forme exportable : champs de l'analyse,
+    détails de la vérification d'identité à plat, dossier final et durées.
+    identities et aliases restent des listes (JSON Lines, Parquet).
+    """
+    identities = detail.identities
+    check = detail.identity_check
+    timings = detail.timings
+    record = {
+        'filename': detail.filename,
+        'category': detail.category,
+        'message': detail.message,
+        'destination': destination,
+        'cached': cached,
+        'p1_clean': detail.p1_clean,
+        'is_manual': detail.is_manual,
+        'is_identity_error': detail.is_identity_error,
+        'is_identity_space': detail.is_identity_space,
+        'pages_decoded': detail.pages_decoded,
+        'identities': [i._asdict() for i in identities] if identities is not None else None,
+        'homonyms_total': sum(i.count for i in identities) if identities is not None else None,
+        'main_identity': check.main_identity if check else None,
+        'section_identity': check.section_identity if check else None,
+        'has_identity_section': check.has_identity_section if check else None,
+        'has_mismatch': check.has_mismatch if check else None,
+        'mismatch_type': check.mismatch_type if check else None,
+        'aliases': list(check.aliases) if check else None,
+        'seconds_total': round(sum(timings.values()), 6),
+    }
+    for stage in STAGES:
+        record[f'seconds_{stage}'] = round(timings[stage], 6) if stage in timings else None
+    return record
+
+
+class _JsonlWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _CsvWriter:
+    """Une ligne par fichier ; les listes sont jointes par « | » (identités : « ALIAS (n) »)."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=COLUMNS)
+        self._writer.writeheader()
+
+    def write(self, record: dict):
+        row = dict(record)
+        if row['identities'] is not None:
+            row['identities'] = " | ".join(f"{i['alias']} ({i['count']})" for i in row['identities'])
+        if row['aliases'] is not None:
+            row['aliases'] = " | ".join(row['aliases'])
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Format colonnaire compact (pyarrow, dépendance optionnelle), écrit par groupes de lignes."""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("l'export Parquet nécessite pyarrow (pip install pyarrow)") from None
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ('filename', pa.string()), ('category', pa.string()), ('message', pa.string()),
+                ('destination', pa.string()), ('cached', pa.bool_()),
+                ('p1_clean', pa.bool_()), ('is_manual', pa.bool_()), ('is_identity_error', pa.bool_()),
+                ('is_identity_space', pa.bool_()), ('pages_decoded', pa.int32()),
+                ('identities', pa.list_(pa.struct([('alias', pa.string()), ('count', pa.int32())]))),
+                ('homonyms_total', pa.int32()),
+                ('main_identity', pa.string()), ('section_identity', pa.string()),
+                ('has_identity_section', pa.bool_()), ('has_mismatch', pa.bool_()),
+                ('mismatch_type', pa.string()), ('aliases', pa.list_(pa.string())),
+                ('seconds_total', pa.float64()),
+            ]
+            + [(f'seconds_{stage}', pa.float64()) for stage in STAGES]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression='zstd')
+        self._rows = []
+
+    def write(self, record: dict):
+        self._rows.append(record)
+        if len(self._rows) >= PARQUET_ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self._schema))
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+_WRITERS = {'jsonl': _JsonlWriter, 'csv': _CsvWriter, 'parquet': _ParquetWriter}
+
+
+class ResultExport:
+    """
+    Export des résultats au fil du traitement, à côté du rapport HTML :
+    base_path + '.jsonl', '.csv' et/ou '.parquet', une entrée par fichier
+    trié (voir result_record). Un format indisponible (pyarrow absent pour
+    Parquet) lève ImportError à l'ouverture.
+    Les identités communes à plusieurs rapports, connues en fin de lot,
+    vont dans base_path + '.clusters.jsonl' (voir add_clusters).
+    """
+
+    def __init__(self, base_path: str, formats=DEFAULT_EXPORT_FORMATS):
+        self.base_path = base_path
+        self.paths = []
+        self._writers = []
+        try:
+            for fmt in formats:
+                path = f"{base_path}.{fmt}"
+                self._writers.append(_WRITERS[fmt](path))
+                self.paths.append(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def add(self, detail: FileResult, destination: str | None = None, cached: bool = False):
+        record = result_record(detail, destination, cached)
+        for writer in self._writers:
+            writer.write(record)
+
+    def add_clusters(self, clusters: list[IdentityCluster]):
+        """Écrit les groupes de rapports d'une même identité, un par ligne (JSON Lines)."""
+        path = f"{self.base_path}.clusters.jsonl"
+        writer = _JsonlWriter(path)
+        try:
+            for cluster in clusters:
+                writer.write(cluster.to_dict())
+        finally:
+            writer.close()
+        self.paths.append(path)
+
+    def close(self):
+        for writer in self._writers:
+            writer.close()
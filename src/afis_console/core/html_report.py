@@ -0,0 +1,221 @@
+import html
+import os
+from datetime import datetime
+
+from afis_console.core.records import FileResult, IdentityCluster
+
+_HEADER = """<html>
+<head>
+    <meta charset="utf-8">
+    <title>Recherche d'homonymes - Rapport</title>
+    <style>
+        body {{ font-family: sans-serif; margin: 20px; display: flex; flex-direction: column; }}
+        /* Le bilan est écrit en fin de fichier mais affiché en tête */
+        .report-header {{ order: -2; }}
+        .report-summary {{ order: -1; }}
+        h1 {{ color: #2c3e50; }}
+        h2 {{ color: #34495e; margin-top: 30px; }}
+        .metadata {{ color: #7f8c8d; font-style: italic; margin-bottom: 20px; }}
+        .summary-box {{ background: #ecf0f1; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
+        table {{ border-collapse: collapse; width: 100%; margin-top: 10px; }}
+        th, td {{ border: 1px solid #bdc3c7; padding: 8px; text-align: left; }}
+        th {{ background-color: #34495e; color: white; }}
+        tr:nth-child(even) {{ background-color: #f2f2f2; }}
+        .status-ok {{ color: green; font-weight: bold; }}
+        .status-warning {{ color: orange; font-weight: bold; }}
+        .status-error {{ color: red; font-weight: bold; }}
+        .status-identity {{ color: #8e44ad; font-weight: bold; }}
+        .alias-list {{ margin: 0; padding-left: 20px; font-size: 0.9em; }}
+        .badge-homonym {{ background-color: #e74c3c; color: white; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; }}
+        .badge-clean {{ background-color: #27ae60; color: white; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; }}
+        .badge-mismatch {{ background-color: #8e44ad; color: white; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; }}
+    </style>
+</head>
+<body>
+    <div class="report-header">
+        <h1>Recherche d'homonymes</h1>
+        <div class="metadata">
+            <strong>DFAED - Rapports de signalisation</strong><br>
+            Traitement démarré le {timestamp}
+        </div>
+    </div>
+
+    <div class="report-details">
+    <h2>2. Détails par fichier analysé</h2>
+    <table>
+        <thead>
+            <tr>
+                <th>Fichier</th>
+                <th>Page 1 (Homonyme)</th>
+                <th>Identité / Alias</th>
+                <th>Détails des Alias (Section Identités)</th>
+                <th>Statut Final</th>
+            </tr>
+        </thead>
+        <tbody>
+"""
+
+_SUMMARY = """        </tbody>
+    </table>
+    </div>
+{clusters}
+    <div class="report-summary">
+    <h2>1. Rapport général du traitement</h2>
+    <div class="summary-box">
+        <p><em>Traitement terminé le {timestamp}</em></p>
+        <p><strong>Total analysé :</strong> {total}</p>
+        <p><span class="status-ok">✔ Pas d'homonyme :</span> {ok}</p>
+        <p><span class="status-warning">⚠ Homonymes détectés :</span> {manual}</p>
+        <p><span class="status-identity">🔴 Erreur état civil :</span> {identity_error}</p>
+        <p><span class="status-identity">🟣 Erreur espaces état civil :</span> {identity_error_space}</p>
+        <p><span class="status-identity">🟠 État civil proche :</span> {identity_error_near}</p>
+        <p><span class="status-error">✖ Erreurs de lecture :</span> {error}</p>
+    </div>
+    </div>
+</body>
+</html>
+"""
+
+
+_CLUSTERS = """
+    <div class="report-clusters">
+    <h2>3. Identités communes à plusieurs rapports</h2>
+    <table>
+        <thead>
+            <tr>
+                <th>Identités (nom normalisé, date de naissance)</th>
+                <th>Rapports</th>
+            </tr>
+        </thead>
+        <tbody>
+{rows}        </tbody>
+    </table>
+    </div>
+"""
+
+
+def _render_cluster(cluster: IdentityCluster) -> str:
+    identities = "<br>".join(f"{html.escape(name)} ({html.escape(dob)})" for name, dob in cluster.identities)
+    reports = "".join(
+        f"<li>{html.escape(member.filename)}"
+        + (f" : {html.escape(member.section_identity)}" if member.section_identity else "")
+        + f" <em>({html.escape(member.category)})</em></li>"
+        for member in cluster.reports
+    )
+    return f"""            <tr>
+                <td>{identities}</td>
+                <td><ul class='alias-list'>{reports}</ul></td>
+            </tr>
+"""
+
+
+def _render_row(detail: FileResult) -> str:
+    filename = html.escape(detail.filename)
+    # Statut Page 1
+    p1_status = ""
+    if detail.p1_clean is None: p1_status = "Erreur"
+    elif detail.p1_clean is True: p1_status = "Non (Clean)"
+    else: p1_status = "OUI (Detecté)"
+
+    # Liste alias
+    alias_html = "<ul class='alias-list'>"
+    if not detail.identities:
+        alias_html += "<li><em>Aucune section identité détectée</em></li>"
+    else:
+        for identity in detail.identities:
+            count = identity.count
+            if count > 0:
+                badge = f"<span class='badge-homonym'>{count} homonyme(s)</span>"
+            else:
+                badge = "<span class='badge-clean'>0</span>"
+            alias_html += f"<li>{html.escape(identity.alias)} : {badge}</li>"
+    alias_html += "</ul>"
+
+    # Colonne Identité / Alias
+    identity_html = ""
+    id_info = detail.identity_check
+    section_id = id_info and (id_info.section_identity or id_info.main_identity)
+    if section_id:
+        identity_html += f"<strong>Identité :</strong> {html.escape(section_id)}<br>"
+        if id_info.has_mismatch:
+            identity_html += "<span class='badge-mismatch'>⚠ Non trouvé dans les alias</span>"
+        elif id_info.has_identity_section:
+            identity_html += "<span class='badge-clean'>✔ Présent dans les alias</span>"
+    else:
+        identity_html = "<em>N/A</em>"
+
+    # Statut Final
+    if detail.is_identity_space:
+        final_class, final_text = "status-identity", "Erreur espaces état civil"
+    elif detail.category == 'identity_error_near':
+        final_class, final_text = "status-identity", "État civil proche"
+    elif detail.is_identity_error:
+        final_class, final_text = "status-identity", "Erreur état civil"
+    elif detail.is_manual:
+        final_class, final_text = "status-warning", "À vérifier"
+    elif detail.p1_clean is None:
+        final_class, final_text = "status-error", "Erreur"
+    else:
+        final_class, final_text = "status-ok", "OK"
+
+    return f"""            <tr>
+                <td>{filename}</td>
+                <td>{p1_status}</td>
+                <td>{identity_html}</td>
+                <td>{alias_html}</td>
+                <td class="{final_class}">{final_text}</td>
+            </tr>
+"""
+
+
+class HtmlReportWriter:
+    """
+    Rapport HTML écrit au fil du traitement.
+
+    L'en-tête est écrit à l'ouverture, chaque fichier classé ajoute une ligne
+    au tableau (écrite immédiatement sur disque) et le bilan est ajouté par
+    close(stats). La mémoire reste constante quelle que soit la taille du lot,
+    et un rapport partiel reste lisible si le traitement est interrompu.
+    """
+
+    def __init__(self, destination_dir: str):
+        now = datetime.now()
+        report_filename = f"rapport_traitement_{now.strftime('%Y-%m-%d_%H-%M-%S')}.html"
+        self.path = os.path.join(destination_dir, report_filename)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(_HEADER.format(timestamp=now.strftime("%d/%m/%Y à %H:%M:%S")))
+        self._file.flush()
+
+    def add(self, detail: FileResult | dict):
+        """Ajoute la ligne d'un fichier (FileResult, ou sa forme dict)."""
+        if isinstance(detail, dict):
+            detail = FileResult.from_dict(detail)
+        self._file.write(_render_row(detail))
+        self._file.flush()
+
+    def close(self, stats: dict, clusters=()):
+        """Termine le rapport : identités communes à plusieurs rapports (s'il y en a), puis bilan."""
+        # Bilans antérieurs à la catégorie « proche » : compteur absent
+        near = stats.get('identity_error_near', 0)
+        total = (stats['ok'] + stats['manual'] + stats['error']
+                 + stats['identity_error'] + stats['identity_error_space'] + near)
+        self._file.write(_SUMMARY.format(
+            timestamp=datetime.now().strftime("%d/%m/%Y à %H:%M:%S"),
+            total=total,
+            clusters=_CLUSTERS.format(rows="".join(map(_render_cluster, clusters))) if clusters else "",
+            **dict(stats, identity_error_near=near),
+        ))
+        self._file.close()
+
+
+def generate_html_report(destination_dir, stats, file_details):
+    """Écrit en une fois le rapport d'une liste de résultats. Retourne son chemin ou None."""
+    try:
+        writer = HtmlReportWriter(destination_dir)
+        for detail in file_details:
+            writer.add(detail)
+        writer.close(stats)
+        return writer.path
+    except Exception as e:
+        print(f"Erreur écriture rapport HTML: {e}")
+        return None
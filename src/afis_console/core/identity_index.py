@@ -0,0 +1,87 @@
+from afis_console.core.names import normalize_name
+from afis_console.core.records import ClusterMember, FileResult, IdentityCluster
+
+
+def identity_keys(detail: FileResult) -> set:
+    """
+    Clés (nom normalisé, date de naissance) d'un rapport : identité en tête
+    de la SECTION / Identités et chacun de ses alias. Les identités sans
+    nom ou sans date de naissance ne relient pas de rapports.
+    """
+    section = detail.section
+    if section is None:
+        return set()
+    named = [(section.identity, section.dob)] + [(alias.name, alias.dob) for alias in section.aliases]
+    keys = set()
+    for name, dob in named:
+        if name and dob:
+            key = (normalize_name(name), dob)
+            if key[0]:
+                keys.add(key)
+    return keys
+
+
+class IdentityIndex:
+    """
+    Index des identités d'un lot, alimenté au fil du tri : clé (nom
+    normalisé, date de naissance) -> rapports où elle figure.
+
+    Les rapports qui partagent une clé sont réunis (union-find), y compris
+    de proche en proche : A et B partagent un alias, B et C un autre → un
+    seul groupe. Chaque ajout coûte une recherche par clé, sans comparer
+    les rapports deux à deux.
+    """
+
+    def __init__(self):
+        self._members = []  # rapport -> ClusterMember
+        self._parent = []   # rapport -> parent dans l'union-find
+        self._keys = {}     # clé -> rapports (numéros, dans l'ordre d'ajout)
+
+    def _find(self, report: int) -> int:
+        parent = self._parent
+        root = report
+        while parent[root] != root:
+            root = parent[root]
+        # Compression du chemin
+        while parent[report] != root:
+            parent[report], report = root, parent[report]
+        return root
+
+    def _union(self, a: int, b: int):
+        a, b = self._find(a), self._find(b)
+        if a != b:
+            # Le plus ancien rapport reste la racine du groupe
+            self._parent[max(a, b)] = min(a, b)
+
+    def add(self, detail: FileResult, destination: str | None = None):
+        """Ajoute un rapport trié (destination : son emplacement final)."""
+        keys = identity_keys(detail)
+        if not keys:
+            return
+        report = len(self._members)
+        section = detail.section
+        self._members.append(ClusterMember(detail.filename, destination, detail.category, section.identity))
+        self._parent.append(report)
+        for key in keys:
+            reports = self._keys.setdefault(key, [])
+            if reports:
+                self._union(reports[0], report)
+            reports.append(report)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def clusters(self) -> list[IdentityCluster]:
+        """Groupes d'au moins deux rapports, dans l'ordre de leur premier rapport."""
+        groups = {}
+        for report in range(len(self._members)):
+            groups.setdefault(self._find(report), []).append(report)
+        shared = {}
+        for key, reports in self._keys.items():
+            if len(reports) > 1:
+                shared.setdefault(self._find(reports[0]), []).append(key)
+        return [
+            IdentityCluster(tuple(sorted(shared[root])), tuple(self._members[r] for r in reports))
+            for root, reports in sorted(groups.items())
+            if len(reports) > 1
+        ]
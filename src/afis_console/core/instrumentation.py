@@ -0,0 +1,100 @@
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """
+    Durées cumulées par étape (secondes), par exemple 'open', 'text', 'move'.
+    Les durées sont un simple dict, sérialisable et transmissible depuis un
+    processus de travail ; durations permet de cumuler dans un dict existant.
+    """
+
+    def __init__(self, durations: dict | None = None):
+        self.durations = durations if durations is not None else {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def merge(self, durations: dict):
+        for name, seconds in durations.items():
+            self.add(name, seconds)
+
+
+def format_durations(durations: dict) -> str:
+    return " · ".join(f"{name} {seconds:.2f} s" for name, seconds in durations.items())
+
+
+class TimingsWriter:
+    """
+    Fichier JSON des durées, à côté du rapport HTML, écrit au fil du
+    traitement comme le rapport : une entrée par fichier, puis le cumul par
+    étape (et le profil mémoire éventuel) à la fermeture.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write('{\n  "files": [')
+        self._first = True
+
+    def add(self, filename: str, durations: dict):
+        entry = json.dumps({'filename': filename, 'timings': _rounded(durations)}, ensure_ascii=False)
+        self._file.write(("\n    " if self._first else ",\n    ") + entry)
+        self._first = False
+        self._file.flush()
+
+    def close(self, durations: dict, profile: dict | None = None):
+        self._file.write('\n  ],\n  "aggregate": ' + json.dumps(_rounded(durations)))
+        if profile is not None:
+            self._file.write(',\n  "profile": ' + json.dumps(profile, ensure_ascii=False))
+        self._file.write('\n}\n')
+        self._file.close()
+
+
+def _rounded(durations: dict) -> dict:
+    return {name: round(seconds, 6) for name, seconds in durations.items()}
+
+
+class Profiler:
+    """
+    Profil CPU (cProfile) et mémoire (tracemalloc) du processus courant.
+    Avec une analyse parallèle, seul le processus principal est profilé :
+    le travail des processus d'analyse n'apparaît que dans les durées par étape.
+    """
+
+    def __init__(self, top: int = 15):
+        self.top = top
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        tracemalloc.start()
+        self._profile.enable()
+
+    def stop(self, prof_path: str) -> dict:
+        """Arrête le profilage, écrit le profil CPU (pstats) et retourne le résumé mémoire."""
+        self._profile.disable()
+        self._profile.dump_stats(prof_path)
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        top = [
+            {'location': str(stat.traceback), 'size_bytes': stat.size, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:self.top]
+        ]
+        return {
+            'cpu_profile': prof_path,
+            'memory_current_bytes': current,
+            'memory_peak_bytes': peak,
+            'memory_top': top,
+        }
@@ -0,0 +1,250 @@
+import errno
+import functools
+import json
+import os
+import shutil
+import sys
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+# renameat2 (Linux) : renommage refusé si la destination existe
+_RENAME_NOREPLACE = 1
+_AT_FDCWD = -100
+# Erreurs de renameat2 quand l'option n'est pas prise en charge par le
+# système de fichiers (partages SMB, NFS...) : repli sur os.rename
+_NOREPLACE_UNSUPPORTED = {errno.EINVAL, errno.ENOSYS, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+
+@functools.cache
+def _renameat2():
+    """renameat2 de la libc (Linux, glibc 2.28 ou plus), None ailleurs."""
+    if not sys.platform.startswith('linux'):
+        return None
+    import ctypes
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        function = libc.renameat2
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint)
+    function.restype = ctypes.c_int
+    return function
+
+
+def _copy_then_remove(src: str, dst: str):
+    """
+    Déplacement entre deux systèmes de fichiers : dst est d'abord réservé
+    (création exclusive, FileExistsError s'il existe déjà), puis la copie
+    par blocs est écrite dans un fichier temporaire synchronisé sur disque
+    (fsync) qui remplace la réservation ; la source n'est supprimée qu'une
+    fois la copie complète.
+    """
+    open(dst, "xb").close()
+    part = dst + ".part"
+    try:
+        with open(src, "rb") as fsrc, open(part, "wb") as fdst:
+            shutil.copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE)
+            fdst.flush()
+            os.fsync(fdst.fileno())
+        shutil.copystat(src, part)
+        os.replace(part, dst)
+    except BaseException:
+        for path in (part, dst):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+    os.remove(src)
+
+
+def _rename_exclusive(src: str, dst: str):
+    """
+    Renommage qui n'écrase jamais dst (FileExistsError s'il existe) :
+    renameat2(RENAME_NOREPLACE) si disponible, sinon os.rename, qui refuse
+    déjà une destination existante sous Windows ; ailleurs, dst est
+    d'abord réservé par une création exclusive, que le renommage remplace.
+    """
+    renameat2 = _renameat2()
+    if renameat2 is not None:
+        import ctypes
+        if renameat2(_AT_FDCWD, os.fsencode(src), _AT_FDCWD, os.fsencode(dst), _RENAME_NOREPLACE) == 0:
+            return
+        error = ctypes.get_errno()
+        if error not in _NOREPLACE_UNSUPPORTED:
+            raise OSError(error, os.strerror(error), src, None, dst)
+    if os.name == 'nt':
+        os.rename(src, dst)
+        return
+    os.close(os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+    try:
+        os.rename(src, dst)
+    except BaseException:
+        os.remove(dst)
+        raise
+
+
+def _relocate(src: str, dst: str, same_device: bool):
+    """
+    Renommage sur un même système de fichiers (repli sur la copie si
+    refusé, EXDEV), copie sinon. dst n'est jamais écrasé :
+    FileExistsError s'il existe déjà.
+    """
+    if same_device:
+        try:
+            _rename_exclusive(src, dst)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+    _copy_then_remove(src, dst)
+
+
+class MoveJournal:
+    """
+    Journal des déplacements d'un lot (JSON Lines) : chaque déplacement est
+    annoncé avant d'être fait (status « pending »), puis confirmé (« done »)
+    ou abandonné (« failed »). Après un arrêt brutal, un déplacement resté
+    « pending » est retrouvé à son emplacement de destination ou d'origine.
+    rollback_moves() rejoue le journal à l'envers pour remettre les fichiers
+    à leur place d'origine.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _write(self, src: str, dst: str, status: str):
+        self._file.write(json.dumps({'src': src, 'dst': dst, 'status': status}, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def begin(self, src: str, dst: str):
+        """Annonce un déplacement, avant de le faire."""
+        self._write(src, dst, 'pending')
+
+    def record(self, src: str, dst: str):
+        """Confirme un déplacement fait."""
+        self._write(src, dst, 'done')
+
+    def abort(self, src: str, dst: str):
+        """Déplacement annoncé mais pas fait (destination prise, erreur)."""
+        self._write(src, dst, 'failed')
+
+    def close(self):
+        self._file.close()
+
+
+class Mover:
+    """
+    Déplace les fichiers classés dans leur dossier de catégorie.
+
+    - Même système de fichiers que la source : simple renommage, sans
+      copie. Sinon, ou si le renommage est refusé (EXDEV), copie par blocs
+      avec fsync puis suppression de la source.
+    - Conflits de noms : « rapport.pdf » devient « rapport (1).pdf »,
+      « rapport (2).pdf »... Le contenu de chaque dossier de destination
+      est listé une seule fois, puis tenu à jour au fil des déplacements ;
+      un fichier créé depuis n'est jamais écrasé (renommage et copie
+      refusent une destination existante, le nom suivant est pris).
+    - journal : MoveJournal optionnel où chaque déplacement est consigné
+      avant d'être fait.
+    """
+
+    def __init__(self, journal: MoveJournal | None = None):
+        self.journal = journal
+        self._devices = {}  # dossier -> st_dev
+        self._names = {}    # dossier de destination -> noms présents (normcase)
+
+    def _device(self, directory: str) -> int:
+        if directory not in self._devices:
+            self._devices[directory] = os.stat(directory).st_dev
+        return self._devices[directory]
+
+    def _taken(self, directory: str) -> set:
+        if directory not in self._names:
+            with os.scandir(directory) as entries:
+                self._names[directory] = {os.path.normcase(entry.name) for entry in entries}
+        return self._names[directory]
+
+    def target(self, directory: str, filename: str) -> str:
+        """Chemin libre pour filename dans directory (suffixe « (n) » en cas de conflit)."""
+        taken = self._taken(directory)
+        stem, ext = os.path.splitext(filename)
+        candidate = filename
+        n = 1
+        while os.path.normcase(candidate) in taken:
+            candidate = f"{stem} ({n}){ext}"
+            n += 1
+        return os.path.join(directory, candidate)
+
+    def move(self, src: str, directory: str) -> str:
+        """
+        Déplace src dans directory et retourne le chemin final. Un fichier
+        apparu entre-temps sous le nom choisi n'est pas écrasé : le nom
+        suivant (« (n) ») est essayé.
+        """
+        same_device = self._device(os.path.dirname(os.path.abspath(src))) == self._device(directory)
+        taken = self._taken(directory)
+        while True:
+            dst = self.target(directory, os.path.basename(src))
+            if self.journal is not None:
+                self.journal.begin(os.path.abspath(src), os.path.abspath(dst))
+            try:
+                _relocate(src, dst, same_device)
+            except BaseException as e:
+                if self.journal is not None:
+                    self.journal.abort(os.path.abspath(src), os.path.abspath(dst))
+                if not isinstance(e, FileExistsError):
+                    raise
+                taken.add(os.path.normcase(os.path.basename(dst)))
+                continue
+            taken.add(os.path.normcase(os.path.basename(dst)))
+            if self.journal is not None:
+                self.journal.record(os.path.abspath(src), os.path.abspath(dst))
+            return dst
+
+
+def rollback_moves(journal_path: str, log_callback=None) -> int:
+    """
+    Annule un lot : remet chaque fichier du journal à son emplacement
+    d'origine, du dernier déplacé au premier. Un fichier absent de sa
+    destination, ou dont l'emplacement d'origine est de nouveau occupé,
+    est laissé en place et signalé. Retourne le nombre de fichiers remis.
+    """
+    if not log_callback:
+        log_callback = print
+    with open(journal_path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    # Dernier état de chaque déplacement, dans l'ordre où ils ont été
+    # annoncés (les lignes sans status sont des déplacements faits)
+    moves = {}
+    for entry in entries:
+        key = (entry['src'], entry['dst'])
+        if entry.get('status', 'done') == 'failed':
+            moves.pop(key, None)
+        else:
+            moves[key] = entry.get('status', 'done')
+
+    restored = 0
+    for (src, dst), status in reversed(moves.items()):
+        if status == 'pending' and not (os.path.exists(dst) and not os.path.exists(src)):
+            # Interrompu avant d'être fait : le fichier est resté à sa place
+            continue
+        if not os.path.exists(dst):
+            log_callback(f"⚠️  Introuvable, ignoré : {dst}")
+            continue
+        if os.path.exists(src):
+            log_callback(f"⚠️  Emplacement d'origine occupé, ignoré : {src}")
+            continue
+        os.makedirs(os.path.dirname(src), exist_ok=True)
+        same_device = os.stat(os.path.dirname(dst)).st_dev == os.stat(os.path.dirname(src)).st_dev
+        try:
+            _relocate(dst, src, same_device)
+        except OSError as e:
+            log_callback(f"❌ Erreur remise en place {dst}: {e}")
+            continue
+        restored += 1
+    log_callback(f"↩️  {restored}/{len(moves)} fichier(s) remis à leur emplacement d'origine")
+    return restored
@@ -0,0 +1,138 @@
+import functools
+import unicodedata
+
+# Noms normalisés conservés : les mêmes noms reviennent d'un rapport à
+# l'autre dans un lot (identité, alias, homonymes)
+NAME_CACHE_SIZE = 4096
+
+# Caractères remplacés par une espace : tirets, apostrophes
+NAME_PUNCTUATION = "-'`"
+
+# Table précalculée pour l'alphabet latin (jusqu'au Latin étendu B), complétée
+# à la demande pour les autres caractères
+_PRECOMPUTED_LIMIT = 0x250
+
+
+def _fold(char: str) -> str:
+    """Forme normalisée d'un caractère : sans diacritique, ponctuation en espace, en majuscules."""
+    base = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+    return ''.join(' ' if c in NAME_PUNCTUATION else c for c in base).upper()
+
+
+class _FoldTable(dict):
+    """Table de str.translate : point de code -> forme normalisée, calculée au premier usage."""
+
+    def __missing__(self, code: int) -> str:
+        folded = self[code] = _fold(chr(code))
+        return folded
+
+
+_FOLD_TABLE = _FoldTable((code, _fold(chr(code))) for code in range(_PRECOMPUTED_LIMIT))
+
+
+@functools.lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_name(name: str) -> str:
+    """
+    Normalise un nom pour comparaison :
+    - Supprime accents, tirets, apostrophes
+    - Passe en majuscule
+    - Supprime les espaces multiples
+    """
+    # Une seule traduction par table (décomposition, diacritiques,
+    # ponctuation et majuscules caractère par caractère), puis les espaces
+    return ' '.join(name.translate(_FOLD_TABLE).split())
+
+
+def name_keys(aliases) -> frozenset:
+    """Clés (nom normalisé, date de naissance) des alias, pour une recherche en temps constant."""
+    return frozenset((normalize_name(a.name), a.dob) for a in aliases)
+
+
+# Correspondance « proche » : au plus NEAR_MATCH_MAX_DISTANCE opérations
+# (insertion, suppression, substitution ou inversion de deux lettres voisines)
+NEAR_MATCH_MAX_DISTANCE = 1
+_GRAM = 3
+
+
+def token_sorted(name: str) -> str:
+    """Nom aux mots triés : « JEAN DUPONT » et « DUPONT JEAN » ont la même forme."""
+    return ' '.join(sorted(name.split()))
+
+
+def _grams(text: str) -> set:
+    return {text[i:i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+def within_edit_distance(a: str, b: str, limit: int) -> bool:
+    """
+    Vrai si la distance d'édition entre a et b (avec inversion de deux
+    caractères voisins) est au plus limit ; calcul arrêté dès qu'elle la
+    dépasse forcément.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return False
+    if a == b:
+        return True
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if j > 1 and i > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before[j - 2] + 1)
+            current[j] = distance
+        # Les lignes suivantes ne descendent pas sous le minimum des deux
+        # dernières (celle d'avant via une inversion, plus un)
+        if min(current) > limit and min(previous) >= limit:
+            return False
+        before, previous = previous, current
+    return previous[-1] <= limit
+
+
+class NameIndex:
+    """
+    Index par trigrammes de noms normalisés datés (clés (nom, date de
+    naissance), voir name_keys), pour trouver un nom proche sans comparer
+    toutes les clés : chaque nom est indexé tel quel et mots triés.
+
+    Une opération d'édition fait disparaître au plus _GRAM + 1 trigrammes :
+    un nom à distance d ne peut manquer plus de d * (_GRAM + 1) des
+    trigrammes distincts du nom cherché. Seuls les noms qui en partagent
+    assez (et de même date de naissance, de longueur compatible) sont
+    comparés par within_edit_distance.
+    """
+
+    def __init__(self, keys, max_distance: int = NEAR_MATCH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._forms = []      # forme indexée -> (forme, date de naissance)
+        self._postings = {}   # trigramme -> formes qui le contiennent
+        self._by_dob = {}     # date de naissance -> formes
+        for name, dob in keys:
+            for form in {name, token_sorted(name)}:
+                position = len(self._forms)
+                self._forms.append((form, dob))
+                self._by_dob.setdefault(dob, []).append(position)
+                for gram in _grams(form):
+                    self._postings.setdefault(gram, []).append(position)
+
+    def _candidates(self, form: str, dob: str):
+        grams = _grams(form)
+        needed = len(grams) - self.max_distance * (_GRAM + 1)
+        if needed <= 0:
+            # Nom trop court pour filtrer : toutes les formes de même date
+            return self._by_dob.get(dob, ())
+        shared = {}
+        for gram in grams:
+            for position in self._postings.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+        return [position for position, count in shared.items() if count >= needed]
+
+    def near(self, name: str, dob: str) -> bool:
+        """Vrai si un nom indexé de même date de naissance est à au plus max_distance de name (mots dans n'importe quel ordre)."""
+        for form in {name, token_sorted(name)}:
+            for position in self._candidates(form, dob):
+                candidate, candidate_dob = self._forms[position]
+                if candidate_dob == dob and within_edit_distance(form, candidate, self.max_distance):
+                    return True
+        return False
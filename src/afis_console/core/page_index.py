@@ -0,0 +1,71 @@
+import functools
+from typing import NamedTuple
+
+# Tolérance verticale par défaut entre deux mots d'une même ligne (points PDF)
+DEFAULT_LINE_TOLERANCE = 3.0
+
+
+class Word(NamedTuple):
+    """Mot de get_text('words') : position, texte, numéros de bloc, de ligne et de mot."""
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    text: str
+    block: int
+    line: int
+    index: int
+
+
+class PageWordIndex:
+    """
+    Index des mots d'une page, construit une fois à partir de
+    get_text('words') et partagé entre les règles positionnelles :
+
+    - par texte en minuscules : les mots égaux à un texte donné sans
+      parcourir la page ;
+    - par ligne MuPDF (bloc, ligne), dans l'ordre d'extraction : la ligne
+      qui suit un intitulé.
+
+    Les recherches gardent l'ordre d'extraction des mots.
+    """
+
+    def __init__(self, words):
+        self.words = [Word._make(w[:8]) for w in words]
+        self._tokens = {}  # texte en minuscules -> positions dans words
+        lines = {}         # (bloc, ligne) -> positions dans words
+        for position, word in enumerate(self.words):
+            self._tokens.setdefault(word.text.lower(), []).append(position)
+            lines.setdefault((word.block, word.line), []).append(position)
+        self._lines = [[self.words[p] for p in positions] for positions in lines.values()]
+
+    def find(self, text: str) -> list[Word]:
+        """Mots égaux à text (insensible à la casse)."""
+        return [self.words[p] for p in self._tokens.get(text.lower(), ())]
+
+    def first_containing(self, fragment: str) -> Word | None:
+        """Premier mot, dans l'ordre d'extraction, qui contient fragment (insensible à la casse)."""
+        fragment = fragment.lower()
+        positions = [positions[0] for token, positions in self._tokens.items() if fragment in token]
+        return self.words[min(positions)] if positions else None
+
+    def on_same_line(self, word: Word, text: str, tolerance: float = DEFAULT_LINE_TOLERANCE) -> list[Word]:
+        """Mots égaux à text (insensible à la casse) sur la même ligne que word, à tolerance près sur y0."""
+        return [w for w in self.find(text) if abs(w.y0 - word.y0) <= tolerance]
+
+    @functools.cached_property
+    def lines(self) -> list[str]:
+        """Texte de chaque ligne MuPDF, mots séparés par une espace."""
+        return [' '.join(word.text for word in line) for line in self._lines]
+
+    def line_after(self, phrase: str) -> str | None:
+        """
+        Ligne qui suit la première ligne contenant phrase (insensible à la
+        casse) et qui compte plus d'un caractère ; None sinon.
+        """
+        phrase = phrase.lower()
+        lines = self.lines
+        for i, line in enumerate(lines[:-1]):
+            if phrase in line.lower() and len(lines[i + 1]) > 1:
+                return lines[i + 1]
+        return None
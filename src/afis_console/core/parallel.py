@@ -0,0 +1,24 @@
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+
+def resolve_workers(workers: int | None) -> int:
+    """
+    Nombre de processus d'analyse à utiliser.
+    0 ou None → tous les cœurs disponibles.
+    """
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def _ignore_sigint():
+    # Ctrl+C est traité par le processus principal (annulation coopérative) ;
+    # les processus d'analyse terminent leur tâche puis sont arrêtés par le pool.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Pool de processus d'analyse (Ctrl+C ignoré dans les processus, voir _ignore_sigint)."""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_ignore_sigint)
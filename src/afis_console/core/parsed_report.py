@@ -0,0 +1,161 @@
+from afis_console.core.instrumentation import StageTimer
+from afis_console.core.page_index import PageWordIndex
+
+
+class ParsedReport:
+    """
+    Rapport PDF ouvert une seule fois et partagé entre toutes les règles.
+
+    Le document est ouvert à la première demande, puis les mots de la page 1
+    et le texte de chaque page sont extraits une seule fois, à la demande, et
+    gardés en cache (mots et texte de la page 1 à partir d'une même
+    analyse de la page) : une règle qui s'arrête à la page 3 ne coûte pas le
+    décodage des pages suivantes. pages_decoded compte les pages réellement
+    décodées et timer cumule les durées d'ouverture et d'extraction. Une
+    erreur d'ouverture est mémorisée et relevée à chaque accès, pour que
+    chaque règle garde sa propre gestion d'erreur.
+
+    data : contenu du fichier déjà lu (bytes ou memoryview, voir
+    core.reader) ; le document est alors ouvert en mémoire, sans relire le
+    fichier. Sinon, MuPDF ouvre pdf_path lui-même.
+
+    S'utilise comme gestionnaire de contexte :
+        with ParsedReport(pdf_path) as report:
+            report.page1_words
+    """
+
+    def __init__(self, pdf_path: str, data=None):
+        self.pdf_path = pdf_path
+        self.data = data
+        self._doc = None
+        self._error = None
+        self._page1_textpage = None
+        self._page1_words = None
+        self._page1_index = None
+        self._page_texts = []
+        self._decoded = set()
+        self._sections = {}
+        self._memo = {}
+        self.timer = StageTimer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _document(self):
+        if self._error is not None:
+            raise self._error
+        if self._doc is None:
+            # PyMuPDF n'est chargé qu'au premier rapport ouvert (démarrage rapide du CLI)
+            import fitz
+            try:
+                with self.timer.stage('open'):
+                    if self.data is not None:
+                        self._doc = fitz.open(stream=self.data, filetype='pdf')
+                    else:
+                        self._doc = fitz.open(self.pdf_path)
+            except Exception as e:
+                self._error = e
+                raise
+        return self._doc
+
+    @property
+    def page_count(self) -> int:
+        return len(self._document())
+
+    def _page_text(self, doc, index: int, option: str = 'text'):
+        # Page 1 : mots et texte tirés de la même TextPage, décodée une fois.
+        # La TextPage ne garde qu'une référence faible vers sa page : la
+        # page est conservée avec elle.
+        if index != 0:
+            return doc[index].get_text(option)
+        if self._page1_textpage is None:
+            page = doc[0]
+            self._page1_textpage = (page, page.get_textpage())
+        page, textpage = self._page1_textpage
+        return page.get_text(option, textpage=textpage)
+
+    @property
+    def page1_words(self) -> list:
+        """Mots de la page 1 : (x0, y0, x1, y1, mot, bloc, ligne, mot_idx)."""
+        if self._page1_words is None:
+            doc = self._document()
+            with self.timer.stage('page1_words'):
+                self._page1_words = self._page_text(doc, 0, 'words') if len(doc) else []
+            if len(doc):
+                self._decoded.add(0)
+        return self._page1_words
+
+    @property
+    def page1_index(self) -> PageWordIndex:
+        """Index des mots de la page 1 (par texte et par ligne), construit une fois."""
+        if self._page1_index is None:
+            words = self.page1_words
+            with self.timer.stage('page1_words'):
+                self._page1_index = PageWordIndex(words)
+        return self._page1_index
+
+    @property
+    def pages_decoded(self) -> int:
+        return len(self._decoded)
+
+    def iter_page_texts(self):
+        """Texte page par page, décodé seulement quand l'appelant avance."""
+        doc = self._document()
+        for index in range(len(doc)):
+            if index == len(self._page_texts):
+                with self.timer.stage('text'):
+                    self._page_texts.append(self._page_text(doc, index))
+                self._decoded.add(index)
+            yield self._page_texts[index]
+
+    @property
+    def page1_text(self) -> str:
+        return next(self.iter_page_texts(), '')
+
+    @property
+    def full_text(self) -> str:
+        """Texte de toutes les pages, concaténé dans l'ordre."""
+        return ''.join(self.iter_page_texts())
+
+    def text_through_section(self, start: str, end: str) -> str:
+        """
+        Texte des pages depuis le début du document jusqu'à la page où la
+        section `start` se termine par `end` (incluse). Comme pour
+        section_parser.scan_section, chaque repère doit occuper une ligne
+        entière : `start` à l'identique, `end` sans tenir compte de la casse,
+        et `end` n'est pris en compte qu'après `start`. Une simple mention
+        dans une ligne (sommaire, renvoi) ne compte pas. Si la fin n'est
+        jamais trouvée, tout le document est décodé.
+        """
+        key = (start, end)
+        if key not in self._sections:
+            end_lower = end.lower()
+            pages = []
+            started = False
+            for text in self.iter_page_texts():
+                pages.append(text)
+                if not started and start not in text:
+                    continue
+                # Un seul parcours des lignes : la fin n'est cherchée qu'après le début
+                lines = (line.strip() for line in text.split('\n'))
+                if not started:
+                    started = any(line == start for line in lines)
+                if started and any(line.lower() == end_lower for line in lines):
+                    break
+            self._sections[key] = ''.join(pages)
+        return self._sections[key]
+
+    def memoize(self, key: str, compute):
+        """Résultat de compute(self), calculé une fois par rapport (lecture partagée entre règles)."""
+        if key not in self._memo:
+            self._memo[key] = compute(self)
+        return self._memo[key]
+
+    def close(self):
+        self._page1_textpage = None
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
@@ -0,0 +1,255 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from afis_console.core.control import RunControl
+from afis_console.core.instrumentation import StageTimer
+from afis_console.core.mover import Mover
+from afis_console.core.parallel import process_pool
+from afis_console.core.progress import FileClassified, FileMoved, FileStarted
+from afis_console.core.reader import DEFAULT_PREFETCH, read_sources, release_source
+from afis_console.core.sorter import (
+    _analyze_source, _cache_get, _cached_result, _file_timer, _log_moved, _log_simulation, _record_result,
+    _source_digest, _store_result,
+)
+
+# Fichiers en attente entre deux étapes d'entrée-sortie (déplacement, rapport)
+STAGE_QUEUE_SIZE = 8
+
+_END = object()
+
+
+async def _checkpoint(loop, control: RunControl) -> bool:
+    # La pause bloque : attendue dans un thread pour ne pas figer les autres étapes
+    if control.paused:
+        return await loop.run_in_executor(None, control.checkpoint)
+    return not control.cancelled
+
+
+def _drain(queue: asyncio.Queue):
+    """Vide une file après un arrêt : libère les contenus lus et abandonne les analyses en attente."""
+    while not queue.empty():
+        item = queue.get_nowait()
+        if item is _END:
+            continue
+        release_source(item[1])
+        if isinstance(item[-1], asyncio.Future):
+            item[-1].cancel()
+
+
+async def _run(filepaths, destinations, stats, log_callback, workers, cache, report_writer, timings_writer,
+               export, progress, control, moved, total, mover, dry_run, io_mode, prefetch, identity_index,
+               executor) -> bool:
+    loop = asyncio.get_running_loop()
+    timer = StageTimer(stats["timings"])
+    stop = asyncio.Event()
+
+    # Lecture et empreinte → cache et analyse → classement → déplacement → rapport
+    read_queue = asyncio.Queue(max(1, prefetch))
+    parse_queue = asyncio.Queue(workers * 4)   # analyses en vol, comme sort_files
+    move_queue = asyncio.Queue(STAGE_QUEUE_SIZE)
+    report_queue = asyncio.Queue(STAGE_QUEUE_SIZE)
+
+    read_executor = ThreadPoolExecutor(1, thread_name_prefix='afis-read')
+    if workers > 1:
+        parse_executor = executor if executor is not None else process_pool(workers)
+    else:
+        parse_executor = ThreadPoolExecutor(1, thread_name_prefix='afis-parse')
+    move_executor = ThreadPoolExecutor(1, thread_name_prefix='afis-move')
+    report_executor = ThreadPoolExecutor(1, thread_name_prefix='afis-report')
+
+    sources = read_sources(filepaths, io_mode, workers)
+
+    def read_next():
+        # Lecture et empreinte dans le thread de lecture : le fichier n'est
+        # jamais relu ni haché dans la boucle
+        item = next(sources, _END)
+        if item is _END:
+            return item
+        filepath, data, read_time = item
+        if stop.is_set():
+            # Tri arrêté pendant que la recherche des fichiers produisait celui-ci
+            release_source(data)
+            return _END
+        digest, hash_time = _source_digest(filepath, data) if cache is not None else (None, 0.0)
+        return filepath, data, read_time, digest, hash_time
+
+    async def read():
+        item = None
+        try:
+            while not stop.is_set():
+                item = await loop.run_in_executor(read_executor, read_next)
+                if item is _END:
+                    break
+                await read_queue.put(item)
+                item = None
+        except asyncio.CancelledError:
+            # Tri arrêté (voir halt) : la lecture en cours, qui peut attendre
+            # la recherche des fichiers, est abandonnée au thread de lecture
+            if item is not None and item is not _END:
+                release_source(item[1])
+        await read_queue.put(_END)
+
+    def halt():
+        # Annulation : plus rien n'est lu, les étapes amont se terminent.
+        # Une seule fois : la lecture interrompue doit encore déposer _END
+        if not stop.is_set():
+            stop.set()
+            tasks[0].cancel()
+
+    async def parse():
+        # Recherche dans le cache dans la boucle (connexion SQLite de ce
+        # thread), analyses dans le pool : au plus parse_queue.maxsize en vol
+        while (item := await read_queue.get()) is not _END:
+            filepath, data, read_time, digest, hash_time = item
+            if stop.is_set():
+                release_source(data)
+                continue
+            cached, lookup_time = _cache_get(cache, digest) if cache is not None else (None, 0.0)
+            analysis = None
+            if cached is None:
+                analysis = loop.run_in_executor(parse_executor, _analyze_source, (filepath, data))
+            await parse_queue.put((filepath, data, read_time, digest, cached, hash_time + lookup_time, analysis))
+        await parse_queue.put(_END)
+
+    async def classify() -> bool:
+        # Dans l'ordre des fichiers ; après une annulation, la file est vidée
+        # sans rien classer pour que les étapes amont se terminent
+        completed = True
+        index = 0
+        while (item := await parse_queue.get()) is not _END:
+            filepath, data, read_time, digest, cached, lookup_time, analysis = item
+            if not completed or not await _checkpoint(loop, control):
+                completed = False
+                halt()
+                release_source(data)
+                if analysis is not None:
+                    analysis.cancel()
+                continue
+            index += 1
+            progress(FileStarted(os.path.basename(filepath), index, total()))
+            if cached is not None:
+                detail = _cached_result(filepath, cached, stats)
+            else:
+                detail = await analysis
+                _store_result(detail, digest, cache, stats)
+            release_source(data)
+            # Annulé pendant l'analyse : le fichier reste dans la source
+            if not await _checkpoint(loop, control):
+                completed = False
+                halt()
+                continue
+            file_timer = _file_timer(detail, data, read_time, cache, lookup_time)
+            stats[detail.category] += 1
+            progress(FileClassified(detail.filename, detail.category, sum(detail.timings.values()),
+                                    cached is not None))
+            await move_queue.put((filepath, detail, file_timer, cached is not None))
+        await move_queue.put(_END)
+        return completed
+
+    def timed_move(file_timer: StageTimer, filepath: str, directory: str) -> str:
+        with file_timer.stage('move'):
+            return mover.move(filepath, directory)
+
+    async def move():
+        # Un seul thread de déplacement : journal et conflits de noms dans l'ordre
+        while (item := await move_queue.get()) is not _END:
+            filepath, detail, file_timer, from_cache = item
+            filename, category = detail.filename, detail.category
+            if dry_run:
+                destination = filepath
+                _log_simulation(detail, filepath, stats, log_callback)
+                progress(FileMoved(filename, category, destination))
+            else:
+                destination = os.path.join(destinations[category], filename)
+                try:
+                    destination = await loop.run_in_executor(move_executor, timed_move, file_timer, filepath,
+                                                             destinations[category])
+                    _log_moved(detail, destination, log_callback)
+                    progress(FileMoved(filename, category, destination))
+                    if moved is not None:
+                        moved.append((detail, destination))
+                except Exception as e:
+                    log_callback(f"❌ Erreur déplacement {filename}: {e}")
+                    progress(FileMoved(filename, category, destination, error=str(e)))
+                    destination = None
+            await report_queue.put((detail, destination, from_cache, file_timer))
+        await report_queue.put(_END)
+
+    def write(items):
+        for detail, destination, from_cache, file_timer in items:
+            if report_writer is not None:
+                with file_timer.stage('report'):
+                    report_writer.add(detail)
+            _record_result(detail, destination, from_cache, file_timer, timer, timings_writer, export,
+                           identity_index)
+
+    async def report():
+        # Les fichiers en attente sont écrits par lots : un passage par le
+        # thread d'écriture pour plusieurs fichiers
+        done = False
+        while not done:
+            items = [await report_queue.get()]
+            while not report_queue.empty():
+                items.append(report_queue.get_nowait())
+            if items[-1] is _END:
+                items.pop()
+                done = True
+            if items:
+                await loop.run_in_executor(report_executor, write, items)
+
+    tasks = [asyncio.create_task(stage()) for stage in (read, parse, classify, move, report)]
+    try:
+        return (await asyncio.gather(*tasks))[2]
+    finally:
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for queue in (read_queue, parse_queue):
+            _drain(queue)
+        # La lecture en cours peut attendre la recherche des fichiers : pas attendue
+        read_executor.shutdown(wait=False, cancel_futures=True)
+        # Un pool partagé reste ouvert : ses analyses en attente ont été
+        # abandonnées avec les files
+        for stage_executor in (parse_executor, move_executor, report_executor):
+            if stage_executor is not executor:
+                stage_executor.shutdown(wait=True, cancel_futures=True)
+
+
+def sort_files_pipelined(filepaths, destinations: dict, stats: dict, log_callback, workers: int = 1,
+                         cache=None, report_writer=None, timings_writer=None, export=None, progress_callback=None,
+                         control: RunControl | None = None, moved: list | None = None, total=None,
+                         mover: Mover | None = None, dry_run: bool = False,
+                         io_mode: str = 'auto', prefetch: int = DEFAULT_PREFETCH, identity_index=None,
+                         executor: Executor | None = None) -> bool:
+    """
+    Même contrat que sorter.sort_files, en étapes concurrentes (asyncio)
+    reliées par des files bornées :
+
+        lecture (thread) → empreinte et analyse (pool) → classement
+        → déplacement (thread) → rapport et export (thread)
+
+    La lecture des fichiers suivants, leur analyse, le déplacement des
+    fichiers déjà classés et l'écriture du rapport se recouvrent ; chaque
+    file bornée retient l'étape amont quand l'aval prend du retard, et la
+    mémoire reste bornée. Les fichiers sont classés, déplacés et ajoutés au
+    rapport dans leur ordre d'arrivée.
+    workers : processus d'analyse (1 = un thread d'analyse) ; executor, pool
+    d'analyse partagé utilisé si workers > 1, comme pour sort_files.
+    Retourne False si le tri a été annulé avant la fin ; les fichiers déjà
+    classés à ce moment sont encore déplacés.
+    """
+    if control is None:
+        control = RunControl()
+    if mover is None:
+        mover = Mover()
+    if total is None:
+        count = len(filepaths) if hasattr(filepaths, '__len__') else None
+        total = lambda: count
+    progress = progress_callback or (lambda event: None)
+    if dry_run:
+        stats.setdefault("reclassified", 0)
+    return asyncio.run(_run(filepaths, destinations, stats, log_callback, max(1, workers), cache, report_writer,
+                            timings_writer, export, progress, control, moved, total, mover, dry_run, io_mode,
+                            prefetch, identity_index, executor))
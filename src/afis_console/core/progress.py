@@ -0,0 +1,101 @@
+import time
+from collections import deque
+from typing import NamedTuple
+
+
+class FileStarted(NamedTuple):
+    """Le fichier index (à partir de 1) sur total entre dans le tri."""
+    filename: str
+    index: int
+    total: int | None
+
+
+class FileClassified(NamedTuple):
+    """Analyse terminée : seconds est la durée d'analyse (0 si reprise du cache)."""
+    filename: str
+    category: str
+    seconds: float
+    cached: bool
+
+
+class FileMoved(NamedTuple):
+    """Fin du traitement d'un fichier ; error est renseigné si le déplacement a échoué."""
+    filename: str
+    category: str
+    destination: str
+    error: str | None = None
+
+
+class BatchSummary(NamedTuple):
+    """Fin du lot : stats finales et durée totale en secondes."""
+    stats: dict
+    files: int
+    seconds: float
+
+
+class ProgressMeter:
+    """
+    Avancement, débit et temps restant calculés à partir des événements.
+
+    Le débit est mesuré sur les `window` derniers fichiers terminés, pour
+    suivre les changements de rythme (fichiers repris du cache, gros
+    rapports) sans être faussé par le démarrage du pool.
+    """
+
+    def __init__(self, total: int | None = None, window: int = 100):
+        self.total = total
+        self.done = 0
+        self.started = time.monotonic()
+        self._recent = deque([(self.started, 0)], maxlen=window + 1)
+
+    def update(self, event):
+        if isinstance(event, FileStarted) and event.total is not None:
+            self.total = event.total
+        elif isinstance(event, FileMoved):
+            self.done += 1
+            self._recent.append((time.monotonic(), self.done))
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Fichiers par seconde, sur la fenêtre récente."""
+        (t0, n0), (t1, n1) = self._recent[0], self._recent[-1]
+        return (n1 - n0) / (t1 - t0) if t1 > t0 else 0.0
+
+    @property
+    def fraction(self) -> float | None:
+        if not self.total:
+            return None
+        return min(self.done / self.total, 1.0)
+
+    @property
+    def eta(self) -> float | None:
+        """Secondes restantes estimées, None tant que le débit est inconnu."""
+        if self.total is None or not self.rate:
+            return None
+        return max(self.total - self.done, 0) / self.rate
+
+    def describe(self) -> str:
+        """Ligne d'avancement lisible, par exemple « 120/6000 (2 %) · 45.3 fichiers/s · reste ~2 min 10 s »."""
+        parts = [f"{self.done}/{self.total}" if self.total is not None else f"{self.done}"]
+        if self.fraction is not None:
+            parts[0] += f" ({self.fraction * 100:.0f} %)"
+        if self.rate:
+            parts.append(f"{self.rate:.1f} fichiers/s")
+        if self.eta is not None and self.done < self.total:
+            parts.append(f"reste ~{format_seconds(self.eta)}")
+        return " · ".join(parts)
+
+
+def format_seconds(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} min {seconds:02d} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes:02d} min"
@@ -0,0 +1,105 @@
+import functools
+import mmap
+import os
+import sys
+import time
+
+IO_MODES = ('auto', 'path', 'bulk', 'mmap')
+# Fichiers lus d'avance par le thread de lecture (0 = lecture au fil de l'analyse)
+DEFAULT_PREFETCH = 8
+
+# Types de systèmes de fichiers considérés comme distants (/proc/mounts)
+NETWORK_FILESYSTEMS = frozenset({
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'ncpfs', 'afs', '9p', 'davfs', 'fuse.sshfs', 'fuse.rclone',
+})
+
+
+@functools.lru_cache(maxsize=1)
+def _mounts() -> tuple:
+    """Points de montage (chemin, type), du plus long au plus court ; vide hors Linux."""
+    try:
+        with open('/proc/mounts', encoding='utf-8') as f:
+            entries = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return ()
+    entries = [(point.replace('\\040', ' '), fstype) for point, fstype in entries]
+    return tuple(sorted(entries, key=lambda entry: len(entry[0]), reverse=True))
+
+
+@functools.lru_cache(maxsize=256)
+def is_network_path(directory: str) -> bool:
+    """Vrai si directory est sur un partage réseau (SMB, NFS...)."""
+    directory = os.path.abspath(directory)
+    if sys.platform == 'win32':
+        if directory.startswith('\\\\'):
+            return True  # chemin UNC
+        import ctypes
+        DRIVE_REMOTE = 4
+        return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(directory)[0] + '\\') == DRIVE_REMOTE
+    for point, fstype in _mounts():
+        if directory == point or directory.startswith(point.rstrip('/') + '/'):
+            return fstype in NETWORK_FILESYSTEMS
+    return False
+
+
+def resolve_io_mode(mode: str, path: str, workers: int = 1) -> str:
+    """
+    Mode de lecture effectif d'un fichier :
+    - 'path'  : MuPDF ouvre le fichier lui-même (nombreuses petites lectures) ;
+    - 'bulk'  : une seule lecture séquentielle, le PDF est ouvert en mémoire ;
+    - 'mmap'  : projection en mémoire, sans copie (disque local, analyse
+      dans le processus courant : une projection ne passe pas d'un
+      processus à l'autre, 'bulk' la remplace si workers > 1) ;
+    - 'auto'  : 'bulk' sur un partage réseau, 'path' sur un disque local.
+    """
+    if mode == 'auto':
+        return 'bulk' if is_network_path(os.path.dirname(path) or '.') else 'path'
+    if mode == 'mmap' and workers > 1:
+        return 'bulk'
+    return mode
+
+
+def read_source(path: str, mode: str):
+    """
+    Contenu du fichier pour fitz.open(stream=...) : bytes ('bulk'),
+    memoryview d'une projection ('mmap', à libérer avec release_source une
+    fois le document fermé) ou None ('path', fichier vide).
+    """
+    if mode == 'path':
+        return None
+    with open(path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return None  # l'ouverture par chemin signalera le fichier vide
+        if mode == 'mmap':
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mapped, 'madvise'):
+                # Lecture anticipée par le système pendant l'analyse du fichier précédent
+                mapped.madvise(mmap.MADV_WILLNEED)
+            return memoryview(mapped)
+        return f.read(size)
+
+
+def release_source(data):
+    """Libère une projection rendue par read_source (sans effet sur des bytes)."""
+    if isinstance(data, memoryview):
+        mapped = data.obj
+        data.release()
+        mapped.close()
+
+
+def read_sources(paths, mode: str = 'auto', workers: int = 1):
+    """
+    Rend (chemin, contenu, durée de lecture) pour chaque fichier, dans
+    l'ordre. Une erreur de lecture donne un contenu None : l'analyse rouvre
+    alors le fichier par son chemin et signale l'erreur comme avant.
+    À envelopper dans un BackgroundScan pour lire les fichiers suivants
+    pendant l'analyse du fichier courant.
+    """
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            data = read_source(path, resolve_io_mode(mode, path, workers))
+        except (OSError, ValueError):
+            data = None
+        yield path, data, time.perf_counter() - start
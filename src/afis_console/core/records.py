@@ -0,0 +1,176 @@
+from typing import NamedTuple
+
+
+class AliasEntry(NamedTuple):
+    """Alias de la SECTION / Identités : nom, date de naissance, nombre de signalisations."""
+    name: str
+    dob: str
+    signalisations: int
+
+
+class SectionIdentities(NamedTuple):
+    """Contenu de la SECTION / Identités : identité en tête, sa date de naissance, ses alias."""
+    identity: str | None
+    dob: str | None
+    aliases: tuple[AliasEntry, ...]
+
+    def to_dict(self) -> dict:
+        return {
+            'section_identity': self.identity,
+            'section_dob': self.dob,
+            'aliases': [alias._asdict() for alias in self.aliases],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SectionIdentities':
+        return cls(data.get('section_identity'), data.get('section_dob'),
+                   tuple(AliasEntry(a['name'], a['dob'], a['signalisations']) for a in data.get('aliases', ())))
+
+
+class HomonymCount(NamedTuple):
+    """Nombre d'homonymes indiqué pour un alias (« Nombre d'homonymes : n »)."""
+    alias: str
+    count: int
+
+
+class SectionScan(NamedTuple):
+    """Lecture en une passe de la SECTION / Identités : en-tête et alias, nombres d'homonymes."""
+    identities: SectionIdentities
+    homonyms: tuple[HomonymCount, ...]
+
+
+class IdentityCheck(NamedTuple):
+    """
+    Comparaison de l'identité de la SECTION / Identités avec ses alias.
+    mismatch_type ('none', 'space_only', 'near', 'real') n'est renseigné que si la
+    comparaison a eu lieu (section et alias présents).
+    """
+    main_identity: str | None
+    section_identity: str | None
+    aliases: tuple[str, ...]
+    has_mismatch: bool
+    has_identity_section: bool
+    mismatch_type: str | None = None
+
+    def to_dict(self) -> dict:
+        data = {
+            'main_identity': self.main_identity,
+            'section_identity': self.section_identity,
+            'aliases': list(self.aliases),
+            'has_mismatch': self.has_mismatch,
+        }
+        if self.mismatch_type is not None:
+            data['mismatch_type'] = self.mismatch_type
+        data['has_identity_section'] = self.has_identity_section
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'IdentityCheck':
+        return cls(data.get('main_identity'), data.get('section_identity'), tuple(data.get('aliases', ())),
+                   data.get('has_mismatch', False), data.get('has_identity_section', False),
+                   data.get('mismatch_type'))
+
+
+def _category_from_flags(data: dict) -> str:
+    # Anciens résultats sans catégorie : déduite des indicateurs
+    if data.get('is_identity_space'):
+        return 'identity_error_space'
+    if data.get('is_identity_error'):
+        return 'identity_error'
+    if data.get('is_manual'):
+        return 'error' if data.get('p1_clean') is None else 'manual'
+    return 'ok'
+
+
+class FileResult(NamedTuple):
+    """
+    Résultat de l'analyse d'un fichier (voir analyze_report). Les
+    extractions non nécessaires à la décision valent None.
+    Un tuple nommé plutôt qu'un dict : pas de clés répétées par fichier,
+    accès aux champs par attribut, sérialisation compacte entre processus.
+    section (identité et alias datés) alimente l'index des identités du lot
+    (voir core.identity_index) ; None si le rapport n'a pas pu être lu.
+    """
+    filename: str
+    category: str
+    message: str
+    p1_clean: bool | None
+    identities: tuple[HomonymCount, ...] | None
+    identity_check: IdentityCheck | None
+    pages_decoded: int
+    timings: dict
+    section: SectionIdentities | None = None
+
+    @property
+    def is_manual(self) -> bool:
+        return self.category in ('manual', 'error')
+
+    @property
+    def is_identity_error(self) -> bool:
+        return self.category in ('identity_error', 'identity_error_space', 'identity_error_near')
+
+    @property
+    def is_identity_space(self) -> bool:
+        return self.category == 'identity_error_space'
+
+    def to_dict(self, timings: bool = True) -> dict:
+        """Forme dict historique (cache, point de reprise, fonctions publiques)."""
+        data = {
+            'filename': self.filename,
+            'p1_clean': self.p1_clean,
+            'identities': ([identity._asdict() for identity in self.identities]
+                           if self.identities is not None else None),
+            'is_manual': self.is_manual,
+            'is_identity_error': self.is_identity_error,
+            'is_identity_space': self.is_identity_space,
+            'identity_check': self.identity_check.to_dict() if self.identity_check is not None else None,
+            'category': self.category,
+            'message': self.message,
+            'pages_decoded': self.pages_decoded,
+            'section': self.section.to_dict() if self.section is not None else None,
+        }
+        if timings:
+            data['timings'] = self.timings
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FileResult':
+        identities = data.get('identities')
+        check = data.get('identity_check')
+        section = data.get('section')
+        return cls(
+            filename=data['filename'],
+            category=data.get('category') or _category_from_flags(data),
+            message=data.get('message', ''),
+            p1_clean=data.get('p1_clean'),
+            identities=(tuple(HomonymCount(i['alias'], i['count']) for i in identities)
+                        if identities is not None else None),
+            identity_check=IdentityCheck.from_dict(check) if check is not None else None,
+            pages_decoded=data.get('pages_decoded', 0),
+            timings=data.get('timings') or {},
+            section=SectionIdentities.from_dict(section) if section is not None else None,
+        )
+
+
+class ClusterMember(NamedTuple):
+    """Rapport d'un groupe d'identités communes : fichier, dossier final, catégorie, identité en tête."""
+    filename: str
+    destination: str | None
+    category: str
+    section_identity: str | None
+
+
+class IdentityCluster(NamedTuple):
+    """
+    Rapports d'un même lot reliés par une identité commune (nom normalisé,
+    date de naissance), en identité principale ou en alias. identities :
+    les clés partagées par au moins deux rapports du groupe.
+    """
+    identities: tuple[tuple[str, str], ...]
+    reports: tuple[ClusterMember, ...]
+
+    def to_dict(self) -> dict:
+        return {
+            'identities': [{'name': name, 'dob': dob} for name, dob in self.identities],
+            'reports': [member._asdict() for member in self.reports],
+        }
@@ -0,0 +1,47 @@
+from typing import Callable, NamedTuple
+
+
+class Rule(NamedTuple):
+    """
+    Règle de tri déclarative.
+
+    needs : noms des extractions passées, dans l'ordre, à `matches`.
+    Si matches(*valeurs) est vrai, le rapport prend `category` et `message`.
+    """
+    name: str
+    needs: tuple[str, ...]
+    matches: Callable[..., bool]
+    category: str
+    message: str
+
+
+class AnalysisContext:
+    """
+    Extractions paresseuses d'un rapport.
+
+    Chaque extraction n'est calculée qu'à la première demande d'une règle,
+    puis mémorisée. Une décision prise tôt évite donc les extractions
+    coûteuses dont les règles suivantes auraient eu besoin.
+    """
+
+    def __init__(self, report, extractors: dict[str, Callable]):
+        self.report = report
+        self._extractors = extractors
+        self._values = {}
+
+    def __getitem__(self, name: str):
+        if name not in self._values:
+            self._values[name] = self._extractors[name](self)
+        return self._values[name]
+
+    def get_computed(self, name: str, default=None):
+        """Valeur d'une extraction si elle a été calculée, sans la déclencher."""
+        return self._values.get(name, default)
+
+
+def evaluate(rules, context: AnalysisContext) -> Rule:
+    """Retourne la première règle (par priorité) qui s'applique au rapport."""
+    for rule in rules:
+        if rule.matches(*(context[name] for name in rule.needs)):
+            return rule
+    raise LookupError("Aucune règle de tri ne s'applique")
@@ -0,0 +1,189 @@
+import re
+
+from afis_console.core.records import AliasEntry, HomonymCount, SectionIdentities, SectionScan
+
+# Bornes de la SECTION / Identités : les pages suivantes (signalisations)
+# ne sont jamais décodées.
+SECTION_IDENTITIES = 'SECTION / Identités'
+SECTION_IDENTITIES_END = 'SECTION / Signalisations'
+
+ALIASES_HEADER = 'est connu(e) sous les identités suivantes'
+UNIDENTIFIED_ALIAS = "Non identifié"
+
+# Expressions régulières compilées une seule fois
+_DOB_RE = re.compile(r'né\(e\)\s+le\s+(\d{2}/\d{2}/\d{4})')
+# Repères d'une ligne en minuscules, dans l'ordre : « né(e) le » ou
+# « nombre d'homonymes », suivi de sa valeur si elle est sur la même ligne
+_TOKEN_RE = re.compile(r"(?P<born>né\(e\)\s+le)|nombre\s+d[’']homonymes(?:\s*[:\s]\s*(?P<count>\d+))?")
+# Fin de ligne après « nombre d'homonymes » sans valeur : la valeur peut
+# suivre sur une des lignes suivantes (au plus un « : » en tout)
+_PENDING_TAIL_RE = re.compile(r"\s*(?P<colon>:)?\s*$")
+_PENDING_VALUE_RE = re.compile(r"\s*(?P<colon>:)?\s*(?P<count>\d+)")
+
+# États de la lecture des alias
+_OUTSIDE, _LIST, _NAME, _SIGNALISATIONS, _LEGEND, _DONE = range(6)
+
+
+def _valid_alias_name(name: str) -> bool:
+    return (len(name) > 2
+            and name == name.upper()
+            and not any(map(str.isdigit, name))
+            and 'nombre' not in name.lower()
+            and 'signalisation' not in name.lower())
+
+
+def _homonym_alias(name: str | None) -> str:
+    """Nom retenu pour un nombre d'homonymes, « Non identifié » s'il manque ou ressemble à un intitulé."""
+    if name is None or len(name) <= 2 or 'signalisation' in name.lower():
+        return UNIDENTIFIED_ALIAS
+    return name
+
+
+def scan_section(lines) -> SectionScan:
+    """
+    Lecture en une passe, ligne par ligne, de la SECTION / Identités
+    (lines : texte de la section ou itérable de lignes, lu au fil de l'eau).
+
+    Deux automates avancent ensemble sur chaque ligne :
+
+    - les nombres d'homonymes : chaque « nombre d'homonymes : n », y
+      compris quand n est sur une ligne suivante, est rattaché à la
+      première ligne non vide qui suit le dernier « né(e) le » rencontré
+      depuis le nombre précédent (« Non identifié » à défaut) ;
+    - les alias : en-tête de section (identité, date de naissance), puis
+      après « est connu(e) sous les identités suivantes », des blocs
+      « né(e) le JJ/MM/AAAA » → NOM → nombre de signalisations, jusqu'à
+      « SECTION / Signalisations » ou à la légende « Nombre d'homonymes »
+      suivie d'une ligne « (indique ...) ».
+    """
+    if isinstance(lines, str):
+        # Passage en minuscules du texte entier plutôt que ligne par ligne
+        lines = zip(lines.split('\n'), lines.lower().split('\n'))
+    else:
+        lines = ((line, line.lower()) for line in lines)
+    # En-tête et alias
+    identity = dob = None
+    aliases = []
+    section = False
+    header = 0             # lignes d'en-tête restant à lire après « SECTION / Identités »
+    state = _OUTSIDE
+    alias_dob = alias_name = None
+    deferred = None        # ligne « Nombre d'homonymes » en attente de la suivante (légende ?)
+    # Nombres d'homonymes
+    homonyms = []
+    born = False           # « né(e) le » vu depuis le dernier nombre
+    name = None            # première ligne non vide après « né(e) le »
+    pending = None         # libellé sans valeur : (nom si c'est un nombre, texte de la ligne, « : » déjà vu)
+
+    for line, lower in lines:
+
+        # --- Nombres d'homonymes ---
+        start = 0
+        if pending is not None:
+            pending_name, pending_text, colon = pending
+            m = _PENDING_VALUE_RE.match(lower)
+            if m and not (colon and m.group('colon')):
+                pending = None
+                homonyms.append(HomonymCount(_homonym_alias(pending_name), int(m.group('count'))))
+                born, name = False, None
+                start = m.end()
+            elif not lower.strip() or lower.strip() == ':' and not colon:
+                if lower.strip():
+                    pending = (pending_name, pending_text, True)
+                start = None
+            else:
+                # Pas de valeur : le libellé était du texte ordinaire
+                pending = None
+                if born and name is None and pending_text.strip():
+                    name = pending_text.strip()
+        if start is None:
+            pass
+        elif start == 0 and 'né(e)' not in lower and 'homonymes' not in lower:
+            # Ligne sans repère (cas le plus fréquent)
+            if born and name is None and line.strip():
+                name = line.strip()
+        else:
+            segment = start  # début du texte de la ligne qui peut porter le nom (None après « né(e) le »)
+            for m in _TOKEN_RE.finditer(lower, start):
+                if m.group('born'):
+                    born, name, segment = True, None, None
+                    continue
+                prefix = line[segment:m.start()].strip() if segment is not None else ''
+                candidate = prefix if born and name is None and prefix else name
+                if m.group('count') is not None:
+                    homonyms.append(HomonymCount(_homonym_alias(candidate), int(m.group('count'))))
+                    born, name, segment = False, None, m.end()
+                    continue
+                tail = _PENDING_TAIL_RE.match(lower, m.end())
+                if tail:
+                    # Valeur attendue sur une ligne suivante ; si ce n'en est
+                    # pas une, la ligne reste du texte ordinaire
+                    pending = (candidate, line[segment:] if segment is not None else '',
+                               tail.group('colon') is not None)
+                    segment = None
+                    break
+            if segment is not None and born and name is None and line[segment:].strip():
+                name = line[segment:].strip()
+
+        # --- En-tête : identité puis date de naissance ---
+        if header:
+            if header == 2:
+                identity = line.strip()
+            else:
+                m = _DOB_RE.search(line)
+                if m:
+                    dob = m.group(1)
+            header -= 1
+
+        # --- Alias ---
+        if state == _LEGEND:
+            if 'indique' in lower:
+                state = _DONE
+            else:
+                # Pas la légende : la ligne « Nombre d'homonymes » est lue normalement
+                m = _DOB_RE.search(deferred) if 'né(e)' in deferred else None
+                if m:
+                    alias_dob, state = m.group(1), _NAME
+                else:
+                    state = _LIST
+            deferred = None
+        if state == _NAME:
+            candidate = line.strip()
+            if _valid_alias_name(candidate):
+                alias_name, state = candidate, _SIGNALISATIONS
+                continue
+            state = _LIST  # pas un nom : ligne lue comme les autres
+        elif state == _SIGNALISATIONS:
+            try:
+                count = int(line.strip())
+            except ValueError:
+                count = 0
+            aliases.append(AliasEntry(alias_name, alias_dob, count))
+            state = _LIST
+            continue
+        elif state == _DONE:
+            continue
+        if state == _LIST:
+            if 'section / signalisations' in lower:
+                state = _DONE
+            elif 'homonymes' in lower and line.strip().startswith('Nombre d'):
+                # Légende de fin de liste si la ligne suivante contient « indique »
+                deferred, state = line, _LEGEND
+            elif 'né(e)' in line:
+                m = _DOB_RE.search(line)
+                if m:
+                    alias_dob, state = m.group(1), _NAME
+            continue
+
+        # --- Ouverture de la section, puis de la liste des alias ---
+        if not section:
+            if line.strip() == SECTION_IDENTITIES:
+                section, header = True, 2
+        elif ALIASES_HEADER in lower:
+            # La liste commence à la ligne suivante
+            state = _LIST
+
+    if state == _SIGNALISATIONS:
+        # Nom en dernière ligne : pas de nombre de signalisations
+        aliases.append(AliasEntry(alias_name, alias_dob, 0))
+    return SectionScan(SectionIdentities(identity, dob, tuple(aliases)), tuple(homonyms))
@@ -1,10 +1,43 @@
+import itertools
 import os
-import shutil
-import fitz  # PyMuPDF
-import re
-import unicodedata
+import time
+from collections import deque
+from concurrent.futures import Executor, wait as futures_wait
 from datetime import datetime
 
+from afis_console.core.cache import AnalysisCache, data_digest, file_digest
+from afis_console.core.discovery import BackgroundScan, iter_pdfs
+from afis_console.core.export import DEFAULT_EXPORT_FORMATS, ResultExport
+from afis_console.core.html_report import HtmlReportWriter, generate_html_report
+from afis_console.core.identity_index import IdentityIndex
+from afis_console.core.control import RunControl, load_checkpoint, remove_checkpoint, write_checkpoint
+from afis_console.core.instrumentation import Profiler, StageTimer, TimingsWriter, format_durations
+from afis_console.core.mover import MoveJournal, Mover
+from afis_console.core.names import NameIndex, name_keys, normalize_name
+from afis_console.core.parallel import process_pool, resolve_workers
+from afis_console.core.parsed_report import ParsedReport
+from afis_console.core.reader import DEFAULT_PREFETCH, IO_MODES, read_sources, release_source
+from afis_console.core.records import (
+    FileResult, HomonymCount, IdentityCheck, SectionIdentities, SectionScan,
+)
+from afis_console.core.progress import BatchSummary, FileClassified, FileMoved, FileStarted
+from afis_console.core.rules import AnalysisContext, Rule, evaluate
+from afis_console.core.section_parser import SECTION_IDENTITIES, SECTION_IDENTITIES_END, scan_section
+
+# Version des règles de tri : à incrémenter dès qu'une règle ou le format des
+# résultats change, pour invalider les analyses conservées dans le cache.
+RULES_VERSION = 8
+
+# Moteurs de process_folder : boucle fichier par fichier (sort_files) ou
+# étapes concurrentes reliées par des files bornées
+# (core.pipeline.sort_files_pipelined)
+ENGINES = ('sequential', 'pipeline')
+
+# Page 1 : intitulé précédant l'identité principale, et tolérance verticale
+# (points) pour que « non » soit sur la même ligne que « Homonymes »
+MAIN_IDENTITY_HEADER = 'recherches dactyloscopiques concernant'
+HOMONYM_LINE_TOLERANCE = 3
+
 def has_no_homonyme(pdf_path: str) -> bool | None:
     """
     Analyse la page 1 du PDF via extraction par mots (avec positions).
@@ -13,76 +46,55 @@ def has_no_homonyme(pdf_path: str) -> bool | None:
     sur la même ligne que "Homonymes" dans le PDF.
     Retourne True si "Homonymes ... non" sur la même ligne, False sinon, None si erreur.
     """
+    with ParsedReport(pdf_path) as report:
+        return _has_no_homonyme(report)
+
+def _has_no_homonyme(report: ParsedReport) -> bool | None:
     try:
-        doc = fitz.open(pdf_path)
-        if len(doc) == 0:
-            doc.close()
+        if report.page_count == 0:
             return None
-        page = doc[0]
-        words = page.get_text('words')  # (x0, y0, x1, y1, mot, bloc, ligne, mot_idx)
-        doc.close()
-
-        # Trouver le mot "Homonymes" et sa position Y
-        homonyme_y = None
-        for w in words:
-            if 'homonyme' in w[4].lower():
-                homonyme_y = w[1]  # coordonnée Y du haut du mot
-                break
+        index = report.page1_index
 
-        if homonyme_y is None:
+        # Premier mot contenant "homonyme" (sa coordonnée Y est celle de la ligne)
+        homonyme = index.first_containing('homonyme')
+        if homonyme is None:
             # Pas de mention d'homonymes → traitement manuel
             return False
 
-        # Chercher "non" sur la même ligne (tolérance de 3px sur Y)
-        tolerance = 3
-        for w in words:
-            if w[4].lower() == 'non' and abs(w[1] - homonyme_y) <= tolerance:
-                return True
-
-        return False
+        # Chercher "non" sur la même ligne (tolérance sur Y)
+        return bool(index.on_same_line(homonyme, 'non', HOMONYM_LINE_TOLERANCE))
     except Exception as e:
-        print(f"  ⚠ Erreur lecture {os.path.basename(pdf_path)}: {e}")
+        print(f"  ⚠ Erreur lecture {os.path.basename(report.pdf_path)}: {e}")
         return None
 
-def _normalize_name(name: str) -> str:
-    """
-    Normalise un nom pour comparaison :
-    - Supprime accents, tirets, apostrophes
-    - Passe en majuscule
-    - Supprime les espaces multiples
-    """
-    # Décomposer les caractères Unicode et supprimer les diacritiques
-    nfkd = unicodedata.normalize('NFKD', name)
-    without_accents = ''.join(c for c in nfkd if not unicodedata.combining(c))
-    # Supprimer tirets, apostrophes, caractères spéciaux
-    cleaned = re.sub(r"[\-''`]", ' ', without_accents)
-    # Majuscule, supprimer espaces multiples
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip().upper()
-    return cleaned
-
 def extract_main_identity(pdf_path: str) -> str | None:
     """
     Extrait l'identité principale de la page 1 du PDF.
     C'est le nom affiché après 'Recherches dactyloscopiques concernant :'.
     Retourne le nom (str) ou None si non trouvé.
     """
+    with ParsedReport(pdf_path) as report:
+        return _extract_main_identity(report)
+
+def _extract_main_identity(report: ParsedReport) -> str | None:
     try:
-        doc = fitz.open(pdf_path)
-        if len(doc) == 0:
-            doc.close()
+        if report.page_count == 0:
             return None
-        page = doc[0]
-        text = page.get_text()
-        doc.close()
-
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            if 'recherches dactyloscopiques concernant' in line.lower():
-                if i + 1 < len(lines):
-                    name = lines[i + 1].strip()
-                    if name and len(name) > 1:
-                        return name
-        return None
+        # Ligne suivant l'intitulé, repérée dans l'index des mots déjà
+        # extraits pour la page 1
+        words = report.page1_index.line_after(MAIN_IDENTITY_HEADER)
+        if words is None:
+            return None
+        # Texte affiché : la ligne telle qu'écrite dans le PDF (espaces
+        # multiples compris, voir la catégorie « espaces »), retrouvée après
+        # l'intitulé dans le texte de la page 1 (même analyse de la page que
+        # les mots, puis reprise par la SECTION / Identités)
+        after_header = False
+        for line in report.page1_text.split('\n'):
+            if after_header and ' '.join(line.split()) == words:
+                return line.strip()
+            after_header = after_header or MAIN_IDENTITY_HEADER in line.lower()
+        return words
     except Exception:
         return None
 
@@ -96,98 +108,31 @@ def _extract_section_identities(pdf_path: str) -> dict:
             'aliases': list[dict],  # [{'name': str, 'dob': str, 'signalisations': int}, ...]
         }
     """
-    result = {'section_identity': None, 'section_dob': None, 'aliases': []}
-    try:
-        doc = fitz.open(pdf_path)
-        text = ''
-        for p in doc:
-            text += p.get_text()
-        doc.close()
-
-        lines = text.split('\n')
-
-        # 1. Trouver "SECTION / Identités"
-        section_idx = None
-        for i, line in enumerate(lines):
-            if line.strip() == 'SECTION / Identités':
-                section_idx = i
-                break
+    with ParsedReport(pdf_path) as report:
+        return _parse_section_identities(report).to_dict()
 
-        if section_idx is None:
-            return result
-
-        # 2. Identité du header
-        if section_idx + 1 < len(lines):
-            result['section_identity'] = lines[section_idx + 1].strip()
-        if section_idx + 2 < len(lines):
-            m = re.search(r'né\(e\)\s+le\s+(\d{2}/\d{2}/\d{4})', lines[section_idx + 2])
-            if m:
-                result['section_dob'] = m.group(1)
-
-        # 3. Trouver "est connu(e) sous les identités suivantes :"
-        alias_start = None
-        for i in range(section_idx, len(lines)):
-            if 'est connu(e) sous les identités suivantes' in lines[i].lower():
-                alias_start = i
-                break
-
-        if alias_start is None:
-            return result
-
-        # 4. Parser les alias : "né(e) le" → NOM → nombre (signalisations) → homonymes
-        i = alias_start + 1
-        while i < len(lines):
-            stripped = lines[i].strip()
+def _scan_section(report: ParsedReport) -> SectionScan:
+    """
+    Lecture unique de la SECTION / Identités (alias et nombres
+    d'homonymes), partagée par toutes les règles d'un même rapport.
+    """
+    return report.memoize('section_scan', lambda r: scan_section(
+        r.text_through_section(SECTION_IDENTITIES, SECTION_IDENTITIES_END)))
 
-            # Fin de la section
-            if 'section / signalisations' in stripped.lower():
-                break
-            if stripped.startswith('Nombre d') and 'homonymes' in stripped.lower():
-                if i + 1 < len(lines) and 'indique' in lines[i + 1].lower():
-                    break
-
-            # Chercher "né(e) le DD/MM/YYYY"
-            m = re.search(r'né\(e\)\s+le\s+(\d{2}/\d{2}/\d{4})', stripped)
-            if m:
-                alias_dob = m.group(1)
-                # Ligne suivante = NOM
-                if i + 1 < len(lines):
-                    alias_name = lines[i + 1].strip()
-                    if (alias_name
-                        and alias_name == alias_name.upper()
-                        and not any(c.isdigit() for c in alias_name)
-                        and len(alias_name) > 2
-                        and 'nombre' not in alias_name.lower()
-                        and 'signalisation' not in alias_name.lower()):
-                        
-                        # Ligne suivante du nom = nombre de signalisations (chiffre)
-                        signa_count = 0
-                        if i + 2 < len(lines):
-                            try:
-                                signa_count = int(lines[i + 2].strip())
-                            except ValueError:
-                                signa_count = 0
-                        
-                        result['aliases'].append({
-                            'name': alias_name,
-                            'dob': alias_dob,
-                            'signalisations': signa_count
-                        })
-                        i += 3  # Skip: né(e), NOM, nombre
-                        continue
-            i += 1
-
-        return result
+def _parse_section_identities(report: ParsedReport) -> SectionIdentities:
+    """Parse la SECTION / Identités à partir du rapport déjà ouvert."""
+    try:
+        return _scan_section(report).identities
     except Exception:
-        return result
+        return SectionIdentities(None, None, ())
 
 def extract_alias_names(pdf_path: str) -> list[str]:
     """
     Extrait les noms d'alias listés dans la SECTION / Identités.
     Retourne une liste de noms (str).
     """
-    data = _extract_section_identities(pdf_path)
-    return [a['name'] for a in data['aliases']]
+    with ParsedReport(pdf_path) as report:
+        return [a.name for a in _parse_section_identities(report).aliases]
 
 def check_identity_mismatch(pdf_path: str) -> dict:
     """
@@ -202,307 +147,606 @@ def check_identity_mismatch(pdf_path: str) -> dict:
     
     Si après exclusion il ne reste aucun alias → pas d'erreur (pas de passif).
     """
-    main_id = extract_main_identity(pdf_path)
-    section_data = _extract_section_identities(pdf_path)
+    with ParsedReport(pdf_path) as report:
+        return _check_identity_mismatch(report).to_dict()
+
+def _check_identity_mismatch(report: ParsedReport) -> IdentityCheck:
+    main_id = _extract_main_identity(report)
+    section_data = _parse_section_identities(report)
 
-    section_id = section_data['section_identity']
-    all_aliases = section_data['aliases']
+    section_id = section_data.identity
+    all_aliases = section_data.aliases
+    alias_names = tuple(a.name for a in all_aliases)
 
     if not section_id or not all_aliases:
-        return {
-            'main_identity': main_id,
-            'section_identity': section_id,
-            'aliases': [a['name'] for a in all_aliases],
-            'has_mismatch': False,
-            'has_identity_section': len(all_aliases) > 0
-        }
+        return IdentityCheck(main_id, section_id, alias_names, has_mismatch=False,
+                             has_identity_section=len(all_aliases) > 0)
 
-    section_norm = _normalize_name(section_id)
-    section_dob = section_data['section_dob']
+    section_norm = normalize_name(section_id)
+    section_dob = section_data.dob
 
     # Filtrer : exclure l'alias auto-généré par la signalisation en cours
     # (même nom + même date de naissance + exactement 1 signalisation)
-    filtered_aliases = []
-    auto_excluded = False
-    for a in all_aliases:
-        if (not auto_excluded
-            and _normalize_name(a['name']) == section_norm
-            and a['dob'] == section_dob
-            and a['signalisations'] == 1):
-            auto_excluded = True
-            continue
-        filtered_aliases.append(a)
+    filtered_aliases = list(all_aliases)
+    for i, a in enumerate(all_aliases):
+        if a.signalisations == 1 and a.dob == section_dob and normalize_name(a.name) == section_norm:
+            del filtered_aliases[i]
+            break
 
     # S'il ne reste aucun alias après filtrage → pas d'erreur (personne sans passif)
     if not filtered_aliases:
-        return {
-            'main_identity': main_id,
-            'section_identity': section_id,
-            'aliases': [a['name'] for a in all_aliases],
-            'has_mismatch': False,
-            'has_identity_section': True
-        }
+        return IdentityCheck(main_id, section_id, alias_names, has_mismatch=False, has_identity_section=True)
 
     # Vérifier si l'identité section (nom + date de naissance) apparaît dans les alias restants
-    has_mismatch = not any(
-        _normalize_name(a['name']) == section_norm and a['dob'] == section_dob
-        for a in filtered_aliases
-    )
+    keys = name_keys(filtered_aliases)
+    has_mismatch = (section_norm, section_dob) not in keys
 
     # Classifier le type de mismatch
     mismatch_type = 'none'
     if has_mismatch:
         # Vérifier si la différence est uniquement due aux espaces
-        section_nospace = section_norm.replace(' ', '')
-        space_match = any(
-            _normalize_name(a['name']).replace(' ', '') == section_nospace
-            and a['dob'] == section_dob
-            for a in filtered_aliases
-        )
-        mismatch_type = 'space_only' if space_match else 'real'
-
-    return {
-        'main_identity': main_id,
-        'section_identity': section_id,
-        'aliases': [a['name'] for a in all_aliases],
-        'has_mismatch': has_mismatch,
-        'mismatch_type': mismatch_type,  # 'none', 'space_only', 'real'
-        'has_identity_section': True
-    }
+        nospace_keys = {(name.replace(' ', ''), dob) for name, dob in keys}
+        space_match = (section_norm.replace(' ', ''), section_dob) in nospace_keys
+        if space_match:
+            mismatch_type = 'space_only'
+        elif NameIndex(keys).near(section_norm, section_dob):
+            # Faute de frappe ou prénoms dans un autre ordre : vérification allégée
+            mismatch_type = 'near'
+        else:
+            mismatch_type = 'real'
+
+    return IdentityCheck(main_id, section_id, alias_names, has_mismatch=has_mismatch,
+                         has_identity_section=True, mismatch_type=mismatch_type)
 
 def extract_identities_details(pdf_path: str) -> list:
     """
     Extrait les détails des identités/alias et leur nombre d'homonymes.
     Retourne une liste de dicts: [{'alias': 'NOM PRENOM', 'count': 0}, ...]
     """
+    with ParsedReport(pdf_path) as report:
+        return [identity._asdict() for identity in _extract_identities_details(report)]
+
+def _extract_identities_details(report: ParsedReport) -> tuple[HomonymCount, ...]:
     try:
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        
-        text_lower = text.lower()
-        
-        # Regex pour capturer la valeur après "nombre d'homonymes"
-        pattern_count = r"nombre\s+d[’']homonymes\s*[:\s]\s*(\d+)"
-        matches = list(re.finditer(pattern_count, text_lower))
-        
-        identities = []
-        last_pos = 0
-        
-        for m in matches:
-            count = int(m.group(1))
-            start_pos = m.start()
-            
-            # Chercher "né(e) le" avant cette occurrence pour délimiter le bloc
-            subtext = text_lower[last_pos:start_pos]
-            ne_le_matches = list(re.finditer(r"né\(e\)\s+le", subtext))
-            
-            alias_name = "Non identifié"
-            if ne_le_matches:
-                block_start_rel = ne_le_matches[-1].start()
-                block_start_abs = last_pos + block_start_rel
-                
-                # Extraire le morceau de texte entre "né(e) le" et le compteur
-                chunk = text[block_start_abs:start_pos]
-                lines_in_chunk = chunk.split('\n')
-                # Nettoyage des lignes vides
-                lines_in_chunk = [l.strip() for l in lines_in_chunk if l.strip()]
-                
-                # Heuristique : Ligne 0 = "Né(e) le ...", Ligne 1 = NOM PRENOM
-                if len(lines_in_chunk) > 1:
-                    possible_name = lines_in_chunk[1]
-                    # Petit filtre pour éviter de prendre des labels techniques
-                    if "signalisation" not in possible_name.lower() and len(possible_name) > 2:
-                         alias_name = possible_name
-            
-            identities.append({
-                'alias': alias_name,
-                'count': count
-            })
-            
-            last_pos = start_pos + len(m.group(0))
-
-        return identities
+        # Chaque « nombre d'homonymes » rattaché au nom qui suit le dernier
+        # « né(e) le » qui le précède (voir core.section_parser)
+        return _scan_section(report).homonyms
     except Exception as e:
-        print(f"  ⚠ Erreur extraction identités {os.path.basename(pdf_path)}: {e}")
-        return []
+        print(f"  ⚠ Erreur extraction identités {os.path.basename(report.pdf_path)}: {e}")
+        return ()
 
 def check_homonym_counts(pdf_path: str) -> bool:
     """
     Retourne True si 'Section/identités' est présente ET qu'au moins 
     une ligne 'nombre d'homonymes' > 0.
-    Utilise extract_identities_details en interne.
+    Utilise _extract_identities_details en interne.
     """
-    identities = extract_identities_details(pdf_path)
+    with ParsedReport(pdf_path) as report:
+        identities = _extract_identities_details(report)
     # On vérifie aussi la présence de la section textuelle pour être cohérent avec l'ancienne logique
     # Mais ici, si on a trouvé des identités avec un count > 0, c'est qu'il y a homonyme.
     for identity in identities:
-        if identity['count'] > 0:
+        if identity.count > 0:
             return True
     return False
 
-def generate_html_report(destination_dir, stats, file_details):
-    timestamp = datetime.now().strftime("%d/%m/%Y à %H:%M:%S")
-    
-    html_content = f"""
-    <html>
-    <head>
-        <title>Recherche d'homonymes - Rapport</title>
-        <style>
-            body {{ font-family: sans-serif; margin: 20px; }}
-            h1 {{ color: #2c3e50; }}
-            h2 {{ color: #34495e; margin-top: 30px; }}
-            .metadata {{ color: #7f8c8d; font-style: italic; margin-bottom: 20px; }}
-            .summary-box {{ background: #ecf0f1; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-            table {{ border-collapse: collapse; width: 100%; margin-top: 10px; }}
-            th, td {{ border: 1px solid #bdc3c7; padding: 8px; text-align: left; }}
-            th {{ background-color: #34495e; color: white; }}
-            tr:nth-child(even) {{ background-color: #f2f2f2; }}
-            .status-ok {{ color: green; font-weight: bold; }}
-            .status-warning {{ color: orange; font-weight: bold; }}
-            .status-error {{ color: red; font-weight: bold; }}
-            .status-identity {{ color: #8e44ad; font-weight: bold; }}
-            .alias-list {{ margin: 0; padding-left: 20px; font-size: 0.9em; }}
-            .badge-homonym {{ background-color: #e74c3c; color: white; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; }}
-            .badge-clean {{ background-color: #27ae60; color: white; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; }}
-            .badge-mismatch {{ background-color: #8e44ad; color: white; padding: 2px 6px; border-radius: 4px; font-size: 0.8em; }}
-        </style>
-    </head>
-    <body>
-        <h1>Recherche d'homonymes</h1>
-        <div class="metadata">
-            <strong>DFAED - Rapports de signalisation</strong><br>
-            Traitement effectué le {timestamp}
-        </div>
-
-        <h2>1. Rapport général du traitement</h2>
-        <div class="summary-box">
-            <p><strong>Total analysé :</strong> {stats['ok'] + stats['manual'] + stats['error'] + stats['identity_error'] + stats['identity_error_space']}</p>
-            <p><span class="status-ok">✔ Pas d'homonyme :</span> {stats['ok']}</p>
-            <p><span class="status-warning">⚠ Homonymes détectés :</span> {stats['manual']}</p>
-            <p><span class="status-identity">🔴 Erreur état civil :</span> {stats['identity_error']}</p>
-            <p><span class="status-identity">🟣 Erreur espaces état civil :</span> {stats['identity_error_space']}</p>
-            <p><span class="status-error">✖ Erreurs de lecture :</span> {stats['error']}</p>
-        </div>
-
-        <h2>2. Détails par fichier analysé</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>Fichier</th>
-                    <th>Page 1 (Homonyme)</th>
-                    <th>Identité / Alias</th>
-                    <th>Détails des Alias (Section Identités)</th>
-                    <th>Statut Final</th>
-                </tr>
-            </thead>
-            <tbody>
-    """
-
-    for detail in file_details:
-        filename = detail['filename']
-        # Statut Page 1
-        p1_status = ""
-        if detail['p1_clean'] is None: p1_status = "Erreur"
-        elif detail['p1_clean'] is True: p1_status = "Non (Clean)"
-        else: p1_status = "OUI (Detecté)"
-
-        # Liste alias
-        alias_html = "<ul class='alias-list'>"
-        has_alias_homonym = False
-        if not detail['identities']:
-             alias_html += "<li><em>Aucune section identité détectée</em></li>"
-        else:
-            for identity in detail['identities']:
-                count = identity['count']
-                badge = ""
-                if count > 0:
-                    badge = f"<span class='badge-homonym'>{count} homonyme(s)</span>"
-                    has_alias_homonym = True
-                else:
-                    badge = "<span class='badge-clean'>0</span>"
-                
-                alias_html += f"<li>{identity['alias']} : {badge}</li>"
-        alias_html += "</ul>"
-
-        # Colonne Identité / Alias
-        identity_html = ""
-        id_info = detail.get('identity_check', {})
-        section_id = id_info.get('section_identity', None) or id_info.get('main_identity', None)
-        if section_id:
-            identity_html += f"<strong>Identité :</strong> {section_id}<br>"
-            if id_info.get('has_mismatch', False):
-                identity_html += "<span class='badge-mismatch'>⚠ Non trouvé dans les alias</span>"
-            elif id_info.get('has_identity_section', False):
-                identity_html += "<span class='badge-clean'>✔ Présent dans les alias</span>"
+# Extractions disponibles pour les règles, calculées à la demande (AnalysisContext)
+EXTRACTORS = {
+    # Logique 1 : Page 1 "Homonymes ... non"
+    'p1_clean': lambda ctx: _has_no_homonyme(ctx.report),
+    # Logique 2 : détail des identités et de leur nombre d'homonymes
+    'identities': lambda ctx: _extract_identities_details(ctx.report),
+    # Logique 3 : Vérification identité page 1 vs alias
+    'identity_check': lambda ctx: _check_identity_mismatch(ctx.report),
+    # Identité et alias datés, pour l'index des identités du lot
+    'section': lambda ctx: _parse_section_identities(ctx.report),
+}
+
+# Chaîne de décision, par ordre de priorité : la première règle qui
+# s'applique donne la catégorie (qui est aussi la clé de stats).
+RULES = (
+    # Erreur technique sur la lecture page 1 : rien d'autre n'est extrait
+    Rule('erreur_lecture', ('p1_clean',), lambda p1: p1 is None,
+         'error', "⚠️  (erreur lecture)"),
+    # Différence uniquement due aux espaces → sous-dossier dédié
+    Rule('espaces_etat_civil', ('identity_check',),
+         lambda check: check.has_mismatch and check.mismatch_type == 'space_only',
+         'identity_error_space', "🟣 (erreur espaces état civil)"),
+    # Nom proche d'un alias (une lettre, ordre des mots) → sous-dossier dédié
+    Rule('proche_etat_civil', ('identity_check',),
+         lambda check: check.has_mismatch and check.mismatch_type == 'near',
+         'identity_error_near', "🟠 (état civil proche)"),
+    # Identité absente des alias → erreur état civil réelle
+    Rule('etat_civil', ('identity_check',), lambda check: check.has_mismatch,
+         'identity_error', "🔴 (erreur état civil)"),
+    # Page 1 dit "Homonyme" (ou pas "non")
+    Rule('homonyme_page1', ('p1_clean',), lambda p1: p1 is False,
+         'manual', "🔶 (detecté par page 1)"),
+    Rule('homonyme_identites', ('identities',), lambda ids: any(i.count > 0 for i in ids),
+         'manual', "🔶 (detecté par section identités)"),
+    # Tout est clean
+    Rule('ok', (), lambda: True, 'ok', "✅"),
+)
+
+def analyze_report(filepath: str, data=None) -> FileResult:
+    """
+    Analyse d'un rapport : applique RULES et détermine sa catégorie.
+    Les extractions ne sont faites que si une règle en a besoin : une
+    extraction non nécessaire à la décision vaut None dans le résultat.
+    Ne déplace rien. Fonction de niveau module pour pouvoir être exécutée
+    dans un processus de travail (voir process_folder(workers=...)).
+    data : contenu du fichier déjà lu (voir core.reader), sinon le PDF est
+    ouvert par son chemin.
+    """
+    # Le PDF est ouvert une seule fois et partagé entre toutes les règles
+    with ParsedReport(filepath, data) as report:
+        context = AnalysisContext(report, EXTRACTORS)
+        start = time.perf_counter()
+        rule = evaluate(RULES, context)
+        # Lecture de section déjà faite pour les règles (sauf erreur de
+        # lecture) : identité, alias et nombres d'homonymes toujours
+        # renseignés, même quand une règle prioritaire a décidé du tri
+        section = identities = None
+        if rule.category != 'error':
+            section = context['section']
+            identities = context['identities']
+        elapsed = time.perf_counter() - start
+        pages_decoded = report.pages_decoded
+
+    # Temps des règles hors ouverture et extraction du PDF (regex, parsing)
+    timings = dict(report.timer.durations)
+    timings['parse'] = max(0.0, elapsed - sum(timings.values()))
+
+    return FileResult(
+        filename=os.path.basename(filepath),
+        category=rule.category,
+        message=rule.message,
+        p1_clean=context.get_computed('p1_clean'),
+        identities=identities,
+        identity_check=context.get_computed('identity_check'),
+        pages_decoded=pages_decoded,
+        timings=timings,
+        section=section,
+    )
+
+def _analyze_source(source: tuple) -> FileResult:
+    # Tâche de pool : un seul argument, (chemin, contenu)
+    return analyze_report(*source)
+
+def open_cache(base_dest: str, log_callback) -> AnalysisCache | None:
+    try:
+        return AnalysisCache(base_dest, RULES_VERSION)
+    except Exception as e:
+        log_callback(f"⚠️  Cache d'analyse indisponible : {e}\n")
+        return None
+
+def _source_digest(filepath: str, data=None) -> tuple:
+    """
+    Retourne (empreinte, durée du calcul) ; empreinte None si le fichier
+    est illisible. Calculée sur data s'il est fourni, sans relire le fichier.
+    """
+    start = time.perf_counter()
+    try:
+        digest = data_digest(data) if data is not None else file_digest(filepath)
+    except OSError:
+        digest = None
+    return digest, time.perf_counter() - start
+
+def _cache_get(cache: AnalysisCache, digest: str | None) -> tuple:
+    """Retourne (résultat en cache ou None, durée de la recherche)."""
+    if digest is None:
+        return None, 0.0
+    start = time.perf_counter()
+    return cache.get(digest), time.perf_counter() - start
+
+def _cache_lookup(cache: AnalysisCache | None, filepath: str, data=None) -> tuple:
+    """
+    Retourne (empreinte, résultat en cache ou None, durée de la recherche).
+    L'empreinte est calculée sur data s'il est fourni, sans relire le fichier.
+    """
+    if cache is None:
+        return None, None, 0.0
+    digest, hash_time = _source_digest(filepath, data)
+    cached, lookup_time = _cache_get(cache, digest)
+    return digest, cached, hash_time + lookup_time
+
+def _scheduled(sources, cache: AnalysisCache | None, workers: int, executor: Executor | None = None):
+    """
+    Rend (chemin, contenu, durée de lecture, empreinte, résultat en cache,
+    durée de la recherche, analyse) pour chaque fichier lu, dans l'ordre.
+
+    workers > 1 : les fichiers absents du cache sont soumis au pool dès
+    leur lecture (analyse = Future, None pour un fichier en cache). Au plus
+    une fenêtre de workers * 4 fichiers, en cache ou non, est lue et
+    retenue d'avance : la lecture anticipée reste bornée quelle que soit la
+    part du lot déjà en cache. Le pool est executor s'il est fourni (laissé
+    ouvert), sinon un pool créé pour l'occasion.
+    workers == 1 : analyse None, faite par l'appelant quand il y arrive.
+    """
+    if workers <= 1:
+        for filepath, data, read_time in sources:
+            yield (filepath, data, read_time, *_cache_lookup(cache, filepath, data), None)
+        return
+    window = workers * 4
+    shared = executor is not None
+    if not shared:
+        executor = process_pool(workers)
+    pending = deque()
+    try:
+        for filepath, data, read_time in sources:
+            digest, cached, lookup_time = _cache_lookup(cache, filepath, data)
+            analysis = executor.submit(_analyze_source, (filepath, data)) if cached is None else None
+            pending.append((filepath, data, read_time, digest, cached, lookup_time, analysis))
+            if len(pending) >= window:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+    finally:
+        # Arrêt anticipé de l'appelant : on abandonne les analyses non
+        # démarrées, puis on libère les contenus lus d'avance
+        if shared:
+            analyses = [item[-1] for item in pending if item[-1] is not None]
+            for analysis in analyses:
+                analysis.cancel()
+            futures_wait(analyses)
         else:
-            identity_html = "<em>N/A</em>"
-        
-        # Statut Final
-        final_class = ""
-        final_text = ""
-        if detail.get('is_identity_space', False):
-             final_class = "status-identity"
-             final_text = "Erreur espaces état civil"
-        elif detail.get('is_identity_error', False):
-             final_class = "status-identity"
-             final_text = "Erreur état civil"
-        elif detail['is_manual']:
-             final_class = "status-warning"
-             final_text = "À vérifier"
-        elif detail['p1_clean'] is None:
-             final_class = "status-error"
-             final_text = "Erreur"
+            executor.shutdown(wait=True, cancel_futures=True)
+        for item in pending:
+            release_source(item[1])
+
+def clear_cache(directory: str) -> int:
+    """Invalide le cache d'analyse du dossier. Retourne le nombre d'entrées supprimées."""
+    with AnalysisCache(directory, RULES_VERSION) as cache:
+        return cache.clear()
+
+# Sous-dossier de destination de chaque catégorie (relatif au dossier de destination)
+CATEGORY_DIRS = {
+    'ok': "Pas_d_homonyme",
+    'manual': "Homonymes_detectes",
+    'error': "Homonymes_detectes",
+    'identity_error': "Erreur_Etat_civil",
+    'identity_error_space': "Erreur_Etat_civil/Espaces_inseres",
+    'identity_error_near': "Erreur_Etat_civil/Noms_proches",
+}
+
+def new_stats() -> dict:
+    return {"ok": 0, "manual": 0, "error": 0, "identity_error": 0, "identity_error_space": 0,
+            "identity_error_near": 0, "cached": 0, "pages_decoded": 0, "timings": {}}
+
+def merge_stats(into: dict, other: dict):
+    """Ajoute les compteurs et les durées par étape de other à into."""
+    for key, value in other.items():
+        if key == "timings":
+            timer = StageTimer(into["timings"])
+            timer.merge(value)
         else:
-             final_class = "status-ok"
-             final_text = "OK"
-
-        html_content += f"""
-            <tr>
-                <td>{filename}</td>
-                <td>{p1_status}</td>
-                <td>{identity_html}</td>
-                <td>{alias_html}</td>
-                <td class="{final_class}">{final_text}</td>
-            </tr>
-        """
-
-    html_content += """
-            </tbody>
-        </table>
-    </body>
-    </html>
-    """
-
-    timestamp_filename = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    report_filename = f"rapport_traitement_{timestamp_filename}.html"
-    report_path = os.path.join(destination_dir, report_filename)
+            into[key] += value
+
+def category_paths(base_dest: str) -> dict:
+    """Chemins des dossiers de destination {catégorie: chemin}, sans les créer."""
+    return {category: os.path.join(base_dest, *subdir.split('/')) for category, subdir in CATEGORY_DIRS.items()}
+
+def prepare_destinations(base_dest: str) -> dict:
+    """Crée les dossiers de destination et retourne {catégorie: chemin}."""
+    destinations = category_paths(base_dest)
+    for path in destinations.values():
+        os.makedirs(path, exist_ok=True)
+    return destinations
+
+def current_category_dir(filepath: str) -> str | None:
+    """
+    Dossier de catégorie (valeur de CATEGORY_DIRS) où se trouve déjà
+    filepath, pour un fichier d'une archive déjà triée ; None sinon.
+    """
+    parts = os.path.normpath(os.path.dirname(os.path.abspath(filepath))).split(os.sep)
+    # Le plus long d'abord : « Erreur_Etat_civil/Espaces_inseres » avant « Erreur_Etat_civil »
+    for subdir in sorted(set(CATEGORY_DIRS.values()), key=len, reverse=True):
+        subdir_parts = subdir.split('/')
+        if parts[-len(subdir_parts):] == subdir_parts:
+            return subdir
+    return None
+
+def _cached_result(filepath: str, cached: dict, stats: dict) -> FileResult:
+    """Résultat repris du cache, au nom actuel du fichier."""
+    stats["cached"] += 1
+    return FileResult.from_dict(cached)._replace(filename=os.path.basename(filepath), timings={})
+
+def _store_result(detail: FileResult, digest: str | None, cache: AnalysisCache | None, stats: dict):
+    """Comptabilise une analyse et la conserve dans le cache."""
+    stats["pages_decoded"] += detail.pages_decoded
+    # Une erreur de lecture peut être passagère : on ne la garde pas
+    if digest is not None and detail.category != 'error':
+        cache.put(digest, detail.to_dict(timings=False))
+
+def _file_timer(detail: FileResult, data, read_time: float, cache: AnalysisCache | None,
+                lookup_time: float) -> StageTimer:
+    """Durées du fichier : analyse, puis lecture et empreinte faites en amont."""
+    file_timer = StageTimer(detail.timings)
+    if data is not None:
+        file_timer.add('read', read_time)
+    if cache is not None:
+        file_timer.add('hash', lookup_time)
+    return file_timer
+
+def _log_simulation(detail: FileResult, filepath: str, stats: dict, log_callback):
+    """Simulation : le fichier reste en place ; reclassement d'une archive déjà triée."""
+    category = detail.category
+    current = current_category_dir(filepath)
+    if current is not None and current != CATEGORY_DIRS[category]:
+        stats["reclassified"] += 1
+        log_callback(f"{detail.message} {detail.filename} : {current}/ → {CATEGORY_DIRS[category]}/ (simulation)")
+    else:
+        log_callback(f"{detail.message} {detail.filename} → {CATEGORY_DIRS[category]}/ (simulation)")
+
+def _log_moved(detail: FileResult, destination: str, log_callback):
+    renamed = os.path.basename(destination)
+    log_callback(f"{detail.message} {detail.filename} → {CATEGORY_DIRS[detail.category]}/"
+                 + (renamed if renamed != detail.filename else ""))
+
+def _record_result(detail: FileResult, destination: str | None, cached: bool, file_timer: StageTimer,
+                   timer: StageTimer, timings_writer: TimingsWriter | None, export: ResultExport | None,
+                   identity_index: IdentityIndex | None):
+    """Durées, export et index des identités d'un fichier placé."""
+    timer.merge(file_timer.durations)
+    if timings_writer is not None:
+        timings_writer.add(detail.filename, file_timer.durations)
+    if export is not None:
+        export.add(detail, destination, cached)
+    if identity_index is not None:
+        identity_index.add(detail, destination)
+
+def sort_files(filepaths, destinations: dict, stats: dict, log_callback, workers: int = 1,
+               cache: AnalysisCache | None = None, report_writer: HtmlReportWriter | None = None,
+               timings_writer: TimingsWriter | None = None, export: ResultExport | None = None,
+               progress_callback=None,
+               control: RunControl | None = None, moved: list | None = None, total=None,
+               mover: Mover | None = None, dry_run: bool = False,
+               io_mode: str = 'auto', prefetch: int = DEFAULT_PREFETCH,
+               identity_index: IdentityIndex | None = None, executor: Executor | None = None) -> bool:
+    """
+    Analyse, classe et déplace une liste de PDF, dans l'ordre donné.
+    Met à jour stats (dont les durées cumulées par étape dans stats['timings'])
+    et ajoute une ligne par fichier au rapport, au fichier des durées et à
+    l'export des résultats (une fois le fichier déplacé).
+    progress_callback(event) reçoit FileStarted, FileClassified et FileMoved
+    pour chaque fichier (voir core.progress).
+    control permet de suspendre ou d'annuler le tri entre deux fichiers, ou
+    entre l'analyse et le déplacement d'un fichier ; moved reçoit
+    (FileResult, destination) pour chaque fichier déplacé.
+    total() donne le nombre de fichiers attendus quand filepaths est un
+    flux (None tant qu'il est inconnu) ; par défaut, len(filepaths).
+    mover fait les déplacements (conflits de noms, journal) ; par défaut, un
+    Mover sans journal.
+    dry_run : simulation, les fichiers restent en place (destination de
+    l'export = emplacement actuel) ; un fichier déjà rangé dans un autre
+    dossier de catégorie est compté dans stats['reclassified'].
+    io_mode : lecture des fichiers ('auto', 'path', 'bulk', 'mmap', voir
+    core.reader.resolve_io_mode) ; prefetch : nombre de fichiers lus
+    d'avance dans un thread pendant l'analyse (0 = aucun).
+    identity_index reçoit chaque fichier trié et son emplacement final
+    (identités communes à plusieurs rapports du lot).
+    executor : pool d'analyse déjà ouvert, partagé entre plusieurs appels
+    (voir watcher.watch_folder) et utilisé si workers > 1 ; il n'est pas
+    arrêté ici. Par défaut, un pool est créé pour l'appel.
+    Retourne False si le tri a été annulé avant la fin.
+    """
+    if control is None:
+        control = RunControl()
+    if mover is None:
+        mover = Mover()
+    timer = StageTimer(stats["timings"])
+    if total is None:
+        count = len(filepaths) if hasattr(filepaths, '__len__') else None
+        total = lambda: count
+    progress = progress_callback or (lambda event: None)
+    if dry_run:
+        stats.setdefault("reclassified", 0)
+
+    # L'analyse peut tourner dans un pool de processus ; les résultats
+    # reviennent dans l'ordre des fichiers et les déplacements restent
+    # faits ici, un par un.
+    # Chaque fichier est lu en une fois (voir core.reader), éventuellement
+    # d'avance dans un thread : sur un partage réseau, la lecture du fichier
+    # suivant recouvre l'analyse du fichier courant. Le contenu lu sert à
+    # l'empreinte du cache et à l'analyse, sans relire le fichier.
+    # Les fichiers déjà présents dans le cache ne sont pas envoyés à
+    # l'analyse (voir _scheduled).
+    sources = read_sources(filepaths, io_mode, workers)
+    if prefetch > 0:
+        sources = BackgroundScan(sources, maxsize=prefetch, release=lambda source: release_source(source[1]))
+    lookups = _scheduled(sources, cache, workers, executor)
+
+    completed = True
     try:
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-        return report_path
-    except Exception as e:
-        print(f"Erreur écriture rapport HTML: {e}")
+        for index, (filepath, data, read_time, digest, cached, lookup_time, analysis) in enumerate(lookups, 1):
+            if not control.checkpoint():
+                release_source(data)
+                completed = False
+                break
+            progress(FileStarted(os.path.basename(filepath), index, total()))
+            if cached is not None:
+                detail = _cached_result(filepath, cached, stats)
+            else:
+                detail = analysis.result() if analysis is not None else _analyze_source((filepath, data))
+                _store_result(detail, digest, cache, stats)
+            # Document fermé : la projection éventuelle peut être libérée
+            # avant le déplacement du fichier
+            release_source(data)
+            # Annulé pendant l'analyse : le fichier reste dans la source (son
+            # analyse est dans le cache pour la reprise)
+            if not control.checkpoint():
+                completed = False
+                break
+            file_timer = _file_timer(detail, data, read_time, cache, lookup_time)
+            filename = detail.filename
+            category = detail.category
+            stats[category] += 1
+            progress(FileClassified(filename, category, sum(detail.timings.values()), cached is not None))
+
+            if report_writer is not None:
+                with file_timer.stage('report'):
+                    report_writer.add(detail)
+
+            if dry_run:
+                destination = filepath
+                _log_simulation(detail, filepath, stats, log_callback)
+                progress(FileMoved(filename, category, destination))
+            else:
+                destination = os.path.join(destinations[category], filename)
+                try:
+                    with file_timer.stage('move'):
+                        destination = mover.move(filepath, destinations[category])
+                    _log_moved(detail, destination, log_callback)
+                    progress(FileMoved(filename, category, destination))
+                    if moved is not None:
+                        moved.append((detail, destination))
+                except Exception as e:
+                    log_callback(f"❌ Erreur déplacement {filename}: {e}")
+                    progress(FileMoved(filename, category, destination, error=str(e)))
+                    destination = None
+
+            _record_result(detail, destination, cached is not None, file_timer, timer, timings_writer, export,
+                           identity_index)
+    finally:
+        # Arrête le pool et la lecture anticipée ; en cas d'annulation, les
+        # analyses en attente sont abandonnées
+        lookups.close()
+        if isinstance(sources, BackgroundScan):
+            sources.close()
+    return completed
+
+def log_summary(stats: dict, log_callback):
+    log_callback(f"\n{'='*50}")
+    log_callback(f"📊 Résultat :")
+    log_callback(f"   ✅ Pas d'homonyme     : {stats['ok']}")
+    log_callback(f"   🔶 Homonymes détectés : {stats['manual']}")
+    log_callback(f"   🔴 Erreur état civil  : {stats['identity_error']}")
+    log_callback(f"   🟣 Erreur espaces     : {stats['identity_error_space']}")
+    log_callback(f"   🟠 État civil proche  : {stats['identity_error_near']}")
+    log_callback(f"   ⚠️  Erreurs            : {stats['error']}")
+    log_callback(f"   📑 Pages décodées     : {stats['pages_decoded']}")
+    if "reclassified" in stats:
+        log_callback(f"   🔁 Reclassés          : {stats['reclassified']}")
+    if stats["timings"]:
+        log_callback(f"   ⏱️  Durées par étape   : {format_durations(stats['timings'])}")
+    log_callback(f"{'='*50}")
+
+def sort_engine(engine: str):
+    """Fonction de tri du moteur engine (voir ENGINES, même contrat que sort_files)."""
+    if engine not in ENGINES:
+        raise ValueError(f"Moteur de tri inconnu : {engine!r} (attendu : {', '.join(ENGINES)})")
+    if engine == 'pipeline':
+        # Import local : core.pipeline s'appuie sur ce module
+        from afis_console.core.pipeline import sort_files_pipelined
+        return sort_files_pipelined
+    return sort_files
+
+def open_move_journal(base_dest: str, log_callback) -> MoveJournal | None:
+    """Journal des déplacements d'un lot, pour pouvoir l'annuler (--rollback)."""
+    try:
+        return MoveJournal(os.path.join(base_dest, f"deplacements_{datetime.now():%Y-%m-%d_%H-%M-%S}.jsonl"))
+    except OSError as e:
+        log_callback(f"⚠️  Journal des déplacements impossible à créer : {e}\n")
         return None
 
-def process_folder(source_dir: str, log_callback=None, destination_dir: str = None):
+def open_result_export(base_dest: str, report_writer: HtmlReportWriter | None, export_formats,
+                       log_callback) -> ResultExport | None:
+    """
+    Export des résultats à côté du rapport HTML (None si export_formats est
+    vide ou en cas d'erreur). Un format demandé plusieurs fois (--export csv
+    --export csv) n'est ouvert qu'une fois, l'ordre des formats est gardé.
     """
-    Traite le dossier source.
+    export_formats = tuple(dict.fromkeys(export_formats or ()))
+    if not export_formats:
+        return None
+    export_base = (os.path.splitext(report_writer.path)[0] if report_writer is not None
+                   else os.path.join(base_dest, f"resultats_{datetime.now():%Y-%m-%d_%H-%M-%S}"))
+    try:
+        return ResultExport(export_base, export_formats)
+    except (ImportError, OSError) as e:
+        log_callback(f"⚠️  Export des résultats impossible : {e}\n")
+        return None
+
+def close_result_export(export: ResultExport, clusters: list, log_callback):
+    """Ajoute les identités communes à l'export, puis le ferme."""
+    if clusters:
+        try:
+            export.add_clusters(clusters)
+        except OSError as e:
+            log_callback(f"⚠️  Export des identités communes impossible : {e}")
+    export.close()
+    log_callback(f"📤 Export des résultats : {', '.join(os.path.basename(p) for p in export.paths)}")
+
+def process_folder(source_dir: str | list[str], log_callback=None, destination_dir: str = None, workers: int = 1,
+                   use_cache: bool = True, profile: bool = False, progress_callback=None,
+                   control: RunControl | None = None, recursive: bool = False,
+                   include: list[str] | None = None, exclude: list[str] | None = None,
+                   export_formats=DEFAULT_EXPORT_FORMATS, dry_run: bool = False,
+                   io_mode: str = 'auto', prefetch: int = DEFAULT_PREFETCH, engine: str = 'sequential'):
+    """
+    Traite le dossier source (ou plusieurs dossiers sources : les résultats
+    vont alors dans destination_dir, ou à défaut dans le premier).
     log_callback(msg: str) : fonction pour remonter les logs.
+    progress_callback(event) : événements d'avancement typés (FileStarted,
+        FileClassified, FileMoved, puis BatchSummary en fin de lot), à
+        passer par exemple à un ProgressMeter pour le débit et le temps restant.
     destination_dir: Dossier de destination optionnel.
-    Retourne un dict stats ou None si erreur critique.
+    workers: nombre de processus d'analyse (1 = séquentiel, 0 = tous les cœurs).
+    use_cache: réutilise les analyses des fichiers déjà vus (même contenu,
+        même version des règles), conservées dans le dossier de destination.
+    profile: ajoute un profil CPU (cProfile, fichier .prof) et mémoire
+        (tracemalloc) au fichier des durées.
+    control: RunControl pour suspendre ou annuler le traitement depuis un
+        autre thread. Après une annulation, les fichiers déjà déplacés et
+        leurs résultats sont enregistrés dans un point de reprise
+        (.afis_checkpoint.json) : le traitement suivant du même dossier les
+        reprend dans son rapport et son bilan sans les réanalyser.
+    recursive: parcourt aussi les sous-dossiers (sauf les dossiers de résultat).
+    include / exclude: motifs glob de sélection des fichiers ('*.pdf' par
+        défaut), voir core.discovery.iter_pdfs.
+    export_formats: formats de l'export des résultats à côté du rapport
+        HTML ('jsonl', 'csv', 'parquet' si pyarrow est installé) ; vide
+        pour ne rien exporter.
+    dry_run: simulation, analyse complète (rapport, export, bilan) sans
+        rien créer ni déplacer dans les dossiers sources ; les résultats
+        vont dans destination_dir, à défaut dans le dossier courant. Les
+        dossiers de catégorie ne sont pas ignorés : une archive déjà
+        triée est reclassée sur place (avec recursive) et
+        stats['reclassified'] compte les fichiers qui changeraient de
+        dossier. Ni point de reprise ni journal des déplacements.
+    io_mode: lecture des PDF — 'auto' (lecture en une fois sur un partage
+        réseau, par chemin sur un disque local), 'path', 'bulk' ou 'mmap',
+        voir core.reader.
+    prefetch: nombre de fichiers lus d'avance dans un thread pendant
+        l'analyse (0 = aucun).
+    engine: 'sequential' (fichier par fichier, voir sort_files) ou
+        'pipeline' (lecture, analyse, déplacement et rapport en étapes
+        concurrentes reliées par des files bornées, voir
+        core.pipeline.sort_files_pipelined).
+    Un engine ou un io_mode inconnu lève ValueError.
+    Les durées par étape (ouverture, extraction, parsing, déplacement...)
+    sont cumulées dans stats['timings'] et détaillées par fichier dans un
+    fichier .timings.json à côté du rapport HTML.
+    Retourne un dict stats (stats['cancelled'] vrai si annulé) ou None si
+    erreur critique.
     """
+    sort = sort_engine(engine)
+    if io_mode not in IO_MODES:
+        raise ValueError(f"Mode de lecture inconnu : {io_mode!r} (attendu : {', '.join(IO_MODES)})")
     if not log_callback:
         log_callback = print
 
-    if not os.path.isdir(source_dir):
-        log_callback(f"Erreur : '{source_dir}' n'est pas un dossier valide.")
-        return None
+    roots = [source_dir] if isinstance(source_dir, (str, os.PathLike)) else list(source_dir)
+    for root in roots:
+        if not os.path.isdir(root):
+            log_callback(f"Erreur : '{root}' n'est pas un dossier valide.")
+            return None
 
     # Determine destination base
-    base_dest = destination_dir if destination_dir else source_dir
+    if destination_dir:
+        base_dest = destination_dir
+    else:
+        base_dest = os.getcwd() if dry_run else roots[0]
     if not os.path.isdir(base_dest):
          try:
              os.makedirs(base_dest, exist_ok=True)
@@ -510,121 +754,139 @@ def process_folder(source_dir: str, log_callback=None, destination_dir: str = No
              log_callback(f"Erreur création dossier destination : {e}")
              return None
 
-    # Créer les dossiers de destination
-    dir_ok = os.path.join(base_dest, "Pas_d_homonyme")
-    dir_manual = os.path.join(base_dest, "Homonymes_detectes")
-    dir_identity_error = os.path.join(base_dest, "Erreur_Etat_civil")
-    dir_identity_space = os.path.join(dir_identity_error, "Espaces_inseres")
-    os.makedirs(dir_ok, exist_ok=True)
-    os.makedirs(dir_manual, exist_ok=True)
-    os.makedirs(dir_identity_error, exist_ok=True)
-    os.makedirs(dir_identity_space, exist_ok=True)
-
-    # Lister les PDFs
-    pdfs = [f for f in os.listdir(source_dir)
-            if f.lower().endswith('.pdf') and os.path.isfile(os.path.join(source_dir, f))]
-
-    if not pdfs:
+    # Créer les dossiers de destination (pas en simulation)
+    destinations = category_paths(base_dest) if dry_run else prepare_destinations(base_dest)
+
+    # Recherche des PDF dans un thread : le tri commence dès le premier
+    # fichier trouvé. Les dossiers de résultat ne sont jamais reparcourus,
+    # sauf en simulation (reclassement d'une archive sur place).
+    scan = BackgroundScan(iter_pdfs(roots, recursive=recursive, include=include, exclude=exclude,
+                                    skip_dirs=() if dry_run else destinations.values()))
+    found = iter(scan)
+    first = next(found, None)
+    if first is None:
+        scan.close()
         log_callback("Aucun fichier PDF trouvé dans le dossier source.")
         return {"ok": 0, "manual": 0, "error": 0}
 
-    log_callback(f"📂 {len(pdfs)} PDF(s) trouvé(s) dans '{source_dir}'\n")
-    if destination_dir:
+    where = ", ".join(f"'{root}'" for root in roots)
+    log_callback(f"📂 Recherche des PDF dans {where}{' (sous-dossiers compris)' if recursive else ''}\n")
+    if dry_run:
+        log_callback(f"🧪 Simulation : aucun fichier déplacé, résultats dans '{base_dest}'\n")
+    elif destination_dir:
         log_callback(f"↪️  Destination : '{destination_dir}'\n")
 
-    stats = {"ok": 0, "manual": 0, "error": 0, "identity_error": 0, "identity_error_space": 0}
-    file_details = []
-
-    for filename in sorted(pdfs):
-        filepath = os.path.join(source_dir, filename)
-        
-        # Logique 1 : Page 1 "Homonymes ... non"
-        res_p1 = has_no_homonyme(filepath)
-        
-        # Extraction détaillée pour le rapport et Logique 2
-        identities = extract_identities_details(filepath)
-        
-        # Logique 2 : Y a-t-il un homonyme dans les identités ?
-        homonym_in_identities = any(i['count'] > 0 for i in identities)
-
-        # Logique 3 : Vérification identité page 1 vs alias
-        identity_check = check_identity_mismatch(filepath)
-
-        destination_dir_final = dir_manual
-        message = ""
-        is_manual = False
-        is_identity_error = False
-        is_identity_space = False
-
-        if res_p1 is None:
-            # Erreur technique sur la lecture page 1
-            destination_dir_final = dir_manual
-            message = "⚠️  (erreur lecture)"
-            stats["error"] += 1
-            is_manual = True 
-        elif identity_check['has_mismatch'] and identity_check.get('mismatch_type') == 'space_only':
-            # Différence uniquement due aux espaces → sous-dossier dédié
-            destination_dir_final = dir_identity_space
-            message = "🟣 (erreur espaces état civil)"
-            stats["identity_error_space"] += 1
-            is_identity_error = True
-            is_identity_space = True
-        elif identity_check['has_mismatch']:
-            # Identité absente des alias → erreur état civil réelle
-            destination_dir_final = dir_identity_error
-            message = "🔴 (erreur état civil)"
-            stats["identity_error"] += 1
-            is_identity_error = True
-        elif res_p1 is False: # Page 1 dit "Homonyme" (ou pas "non")
-            destination_dir_final = dir_manual
-            message = "🔶 (detecté par page 1)"
-            stats["manual"] += 1
-            is_manual = True
-        elif homonym_in_identities:
-            destination_dir_final = dir_manual
-            message = "🔶 (detecté par section identités)"
-            stats["manual"] += 1
-            is_manual = True
-        else:
-            # Tout est clean
-            destination_dir_final = dir_ok
-            message = "✅"
-            stats["ok"] += 1
-            is_manual = False
-
-        # Store details for report
-        file_details.append({
-            'filename': filename,
-            'p1_clean': res_p1,
-            'identities': identities,
-            'is_manual': is_manual,
-            'is_identity_error': is_identity_error,
-            'is_identity_space': is_identity_space,
-            'identity_check': identity_check
-        })
+    stats = new_stats()
+    started = time.perf_counter()
+    # Identités communes à plusieurs rapports du lot (reprise comprise)
+    identity_index = IdentityIndex()
 
+    profiler = None
+    if profile:
+        profiler = Profiler()
+        profiler.start()
+
+    # Rapport HTML écrit au fil de l'eau : une ligne par fichier classé
+    try:
+        report_writer = HtmlReportWriter(base_dest)
+        timings_writer = TimingsWriter(os.path.splitext(report_writer.path)[0] + ".timings.json")
+    except Exception as e:
+        log_callback(f"⚠️  Rapport HTML impossible à créer : {e}\n")
+        report_writer = None
+        timings_writer = None
+
+    # Export des résultats pour les outils d'audit (JSON Lines, CSV, Parquet)
+    export = open_result_export(base_dest, report_writer, export_formats, log_callback)
+
+    workers = resolve_workers(workers)
+    if scan.total is not None:
+        workers = min(workers, scan.total)
+    if workers > 1:
+        log_callback(f"⚙️  Analyse parallèle : {workers} processus\n")
+
+    cache = open_cache(base_dest, log_callback) if use_cache else None
+
+    # Reprise d'un traitement annulé : les fichiers déjà triés figurent dans
+    # le rapport et le bilan de ce traitement
+    moved = [(FileResult.from_dict(data), data.get('destination'))
+             for data in (None if dry_run else load_checkpoint(base_dest, roots)) or []]
+    resumed = len(moved)
+    if moved:
+        log_callback(f"⏯️  Reprise du traitement interrompu : {len(moved)} fichier(s) déjà trié(s)\n")
+        for detail, destination in moved:
+            stats[detail.category] += 1
+            if report_writer is not None:
+                report_writer.add(detail)
+            if export is not None:
+                export.add(detail, destination, cached=True)
+            identity_index.add(detail, destination)
+
+    # Journal des déplacements, pour pouvoir annuler le lot (--rollback)
+    journal = None if dry_run else open_move_journal(base_dest, log_callback)
+    try:
+        completed = sort(itertools.chain([first], found), destinations, stats, log_callback,
+                         workers=workers, cache=cache, report_writer=report_writer,
+                         timings_writer=timings_writer, export=export,
+                         progress_callback=progress_callback,
+                         control=control, moved=moved, total=lambda: scan.total,
+                         mover=Mover(journal), dry_run=dry_run, io_mode=io_mode, prefetch=prefetch,
+                         identity_index=identity_index)
+    finally:
+        scan.close()
+        if journal is not None:
+            journal.close()
+    log_callback(f"\n📂 {scan.found} PDF(s) trouvé(s)")
+    if journal is not None:
+        log_callback(f"🗂️  Journal des déplacements : {os.path.basename(journal.path)}")
+    if dry_run:
+        if not completed:
+            log_callback("\n⏹️  Simulation annulée")
+    elif completed:
+        remove_checkpoint(base_dest)
+    else:
         try:
-            shutil.move(filepath, os.path.join(destination_dir_final, filename))
-            dest_label = os.path.basename(destination_dir_final)
-            # Ajouter le parent si c'est un sous-dossier
-            if destination_dir_final == dir_identity_space:
-                dest_label = 'Erreur_Etat_civil/Espaces_inseres'
-            log_callback(f"{message} {filename} → {dest_label}/")
-        except Exception as e:
-            log_callback(f"❌ Erreur déplacement {filename}: {e}")
-
-    # Generate HTML Report
-    report_file = generate_html_report(base_dest, stats, file_details)
-    if report_file:
-         log_callback(f"\n📄 Rapport HTML généré : {os.path.basename(report_file)}")
+            path = write_checkpoint(base_dest, roots, [dict(detail.to_dict(timings=False), destination=destination)
+                                                       for detail, destination in moved])
+            log_callback(f"\n⏹️  Traitement annulé : {len(moved)} fichier(s) trié(s), "
+                         f"point de reprise {os.path.basename(path)}")
+        except OSError as e:
+            log_callback(f"\n⏹️  Traitement annulé ; point de reprise impossible à écrire : {e}")
+    stats["cancelled"] = not completed
+
+    clusters = identity_index.clusters()
+    if clusters:
+        log_callback(f"\n👥 {len(clusters)} identité(s) commune(s) à plusieurs rapports "
+                     f"({sum(len(c.reports) for c in clusters)} rapports)")
+
+    if cache is not None:
+        if stats["cached"]:
+            log_callback(f"\n♻️  {stats['cached']} analyse(s) reprise(s) du cache")
+        cache.evict()
+        cache.close()
+
+    if report_writer is not None:
+        timer = StageTimer(stats["timings"])
+        with timer.stage('report'):
+            report_writer.close(stats, clusters)
+        log_callback(f"\n📄 Rapport HTML généré : {os.path.basename(report_writer.path)}")
+
+    profile_summary = None
+    if profiler is not None:
+        prof_path = os.path.join(base_dest, "profil_traitement.prof")
+        if report_writer is not None:
+            prof_path = os.path.splitext(report_writer.path)[0] + ".prof"
+        profile_summary = profiler.stop(prof_path)
+        log_callback(f"🔬 Profil CPU : {os.path.basename(prof_path)} · "
+                     f"pic mémoire {profile_summary['memory_peak_bytes'] / 1e6:.1f} Mo")
+    if timings_writer is not None:
+        timings_writer.close(stats["timings"], profile_summary)
+        log_callback(f"⏱️  Durées par étape : {os.path.basename(timings_writer.path)}")
+    if export is not None:
+        close_result_export(export, clusters, log_callback)
+
+    log_summary(stats, log_callback)
+    if progress_callback is not None:
+        handled = sum(stats[category] for category in CATEGORY_DIRS) - resumed
+        progress_callback(BatchSummary(stats, handled, time.perf_counter() - started))
 
-    log_callback(f"\n{'='*50}")
-    log_callback(f"📊 Résultat :")
-    log_callback(f"   ✅ Pas d'homonyme     : {stats['ok']}")
-    log_callback(f"   🔶 Homonymes détectés : {stats['manual']}")
-    log_callback(f"   🔴 Erreur état civil  : {stats['identity_error']}")
-    log_callback(f"   🟣 Erreur espaces     : {stats['identity_error_space']}")
-    log_callback(f"   ⚠️  Erreurs            : {stats['error']}")
-    log_callback(f"{'='*50}")
-    
     return stats
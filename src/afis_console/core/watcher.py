@@ -0,0 +1,273 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from datetime import date
+
+from afis_console.core.export import DEFAULT_EXPORT_FORMATS
+from afis_console.core.html_report import HtmlReportWriter
+from afis_console.core.identity_index import IdentityIndex
+from afis_console.core.instrumentation import TimingsWriter
+from afis_console.core.mover import Mover
+from afis_console.core.parallel import process_pool, resolve_workers
+from afis_console.core.reader import DEFAULT_PREFETCH, IO_MODES
+from afis_console.core.sorter import (
+    close_result_export, log_summary, merge_stats, new_stats, open_cache, open_move_journal, open_result_export,
+    prepare_destinations, sort_engine,
+)
+
+# Masques inotify (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class _Inotify:
+    """
+    Notifications inotify (Linux) sur un dossier, via la libc.
+    Signale les fichiers fermés après écriture ou déplacés dans le dossier.
+    """
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, "inotify_add_watch")
+
+    def wait(self, timeout: float) -> list[str]:
+        """Attend au plus timeout secondes ; retourne les noms des fichiers terminés."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name:
+                names.append(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self._fd)
+
+
+def _open_notifier(directory: str, log_callback):
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        return _Inotify(directory)
+    except Exception as e:
+        log_callback(f"⚠️  inotify indisponible ({e}), surveillance par scrutation\n")
+        return None
+
+
+class _StabilityTracker:
+    """
+    Repère les PDF dont l'écriture est terminée : taille et date de
+    modification inchangées depuis settle_time secondes, ou fermeture après
+    écriture signalée par inotify. Un fichier vide n'est jamais prêt.
+    """
+
+    def __init__(self, settle_time: float):
+        self.settle_time = settle_time
+        self._seen = {}      # chemin -> (signature, instant de la dernière modification vue)
+        self._closed = set()  # chemins signalés par inotify
+        self._failed = {}    # chemin -> signature : échec, à ne retenter que si le fichier change
+
+    def mark_closed(self, path: str):
+        self._closed.add(path)
+
+    def mark_failed(self, path: str):
+        if path in self._seen:
+            self._failed[path] = self._seen[path][0]
+
+    def ready(self, directory: str) -> list[str]:
+        now = time.monotonic()
+        present = set()
+        ready = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith('.pdf') or not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                path = entry.path
+                present.add(path)
+                signature = (st.st_size, st.st_mtime_ns)
+                previous = self._seen.get(path)
+                if previous is None or previous[0] != signature:
+                    self._seen[path] = (signature, now)
+                    previous = self._seen[path]
+                if self._failed.get(path) == signature or st.st_size == 0:
+                    continue
+                if path in self._closed or now - previous[1] >= self.settle_time:
+                    ready.append(path)
+
+        # Oublier les fichiers disparus (déplacés, supprimés)
+        for path in list(self._seen):
+            if path not in present:
+                del self._seen[path]
+                self._failed.pop(path, None)
+        self._closed &= present
+        return sorted(ready)
+
+    def forget(self, path: str):
+        self._closed.discard(path)
+
+
+class _DailyOutputs:
+    """
+    Sorties d'une journée de surveillance, comme celles d'un lot de
+    process_folder : rapport HTML et durées par étape, export des
+    résultats, journal des déplacements (--rollback) et identités communes
+    aux rapports du jour.
+    """
+
+    def __init__(self, base_dest: str, export_formats, log_callback):
+        self.day = date.today()
+        self.stats = new_stats()
+        self.identity_index = IdentityIndex()
+        try:
+            self.report_writer = HtmlReportWriter(base_dest)
+            self.timings_writer = TimingsWriter(os.path.splitext(self.report_writer.path)[0] + ".timings.json")
+            log_callback(f"📄 Rapport HTML : {os.path.basename(self.report_writer.path)}")
+        except Exception as e:
+            log_callback(f"⚠️  Rapport HTML impossible à créer : {e}")
+            self.report_writer = None
+            self.timings_writer = None
+        self.export = open_result_export(base_dest, self.report_writer, export_formats, log_callback)
+        self.journal = open_move_journal(base_dest, log_callback)
+
+    def close(self, log_callback):
+        clusters = self.identity_index.clusters()
+        if clusters:
+            log_callback(f"👥 {len(clusters)} identité(s) commune(s) à plusieurs rapports "
+                         f"({sum(len(c.reports) for c in clusters)} rapports)")
+        if self.report_writer is not None:
+            self.report_writer.close(self.stats, clusters)
+            log_callback(f"📄 Rapport HTML : {os.path.basename(self.report_writer.path)}")
+        if self.timings_writer is not None:
+            self.timings_writer.close(self.stats["timings"])
+        if self.export is not None:
+            close_result_export(self.export, clusters, log_callback)
+        if self.journal is not None:
+            self.journal.close()
+            log_callback(f"🗂️  Journal des déplacements : {os.path.basename(self.journal.path)}")
+
+
+def watch_folder(source_dir: str, log_callback=None, destination_dir: str = None, workers: int = 1,
+                 use_cache: bool = True, poll_interval: float = 2.0, settle_time: float = 2.0,
+                 stop_event: threading.Event | None = None, export_formats=DEFAULT_EXPORT_FORMATS,
+                 io_mode: str = 'auto', prefetch: int = DEFAULT_PREFETCH, engine: str = 'sequential'):
+    """
+    Mode surveillance : trie les PDF au fur et à mesure de leur arrivée dans
+    source_dir, jusqu'à ce que stop_event soit levé (ou Ctrl+C).
+
+    Un fichier n'est traité qu'une fois son écriture terminée (voir
+    _StabilityTracker). Sous Linux, inotify réveille la boucle dès qu'un
+    fichier est fermé ; ailleurs, ou si inotify est indisponible (partages
+    réseau notamment), le dossier est scruté toutes les poll_interval
+    secondes. Chaque jour a ses sorties (voir _DailyOutputs), complétées
+    à chaque lot : rapport HTML, durées, export, journal des déplacements.
+    Avec workers > 1, un seul pool d'analyse sert à tous les lots.
+    export_formats, io_mode, prefetch et engine : comme pour
+    sorter.process_folder (ValueError si engine ou io_mode est inconnu).
+    Retourne les stats cumulées, ou None si erreur critique.
+    """
+    sort = sort_engine(engine)
+    if io_mode not in IO_MODES:
+        raise ValueError(f"Mode de lecture inconnu : {io_mode!r} (attendu : {', '.join(IO_MODES)})")
+    if not log_callback:
+        log_callback = print
+    if stop_event is None:
+        stop_event = threading.Event()
+
+    if not os.path.isdir(source_dir):
+        log_callback(f"Erreur : '{source_dir}' n'est pas un dossier valide.")
+        return None
+
+    base_dest = destination_dir if destination_dir else source_dir
+    try:
+        os.makedirs(base_dest, exist_ok=True)
+        destinations = prepare_destinations(base_dest)
+    except Exception as e:
+        log_callback(f"Erreur création dossier destination : {e}")
+        return None
+
+    workers = resolve_workers(workers)
+    cache = open_cache(base_dest, log_callback) if use_cache else None
+    notifier = _open_notifier(source_dir, log_callback)
+    tracker = _StabilityTracker(settle_time)
+    # Pool ouvert pour toute la surveillance : pas de processus relancés à chaque lot
+    pool = process_pool(workers) if workers > 1 else None
+
+    total_stats = new_stats()
+    outputs = None
+
+    mode = "inotify" if notifier is not None else f"scrutation toutes les {poll_interval:g} s"
+    log_callback(f"👀 Surveillance de '{source_dir}' ({mode}). Ctrl+C pour arrêter.\n")
+
+    try:
+        while not stop_event.is_set():
+            ready = tracker.ready(source_dir)
+            if ready:
+                # Des sorties par jour, complétées à chaque lot
+                if outputs is None or outputs.day != date.today():
+                    if outputs is not None:
+                        outputs.close(log_callback)
+                    outputs = _DailyOutputs(base_dest, export_formats, log_callback)
+
+                batch_stats = new_stats()
+                sort(ready, destinations, batch_stats, log_callback,
+                     workers=min(workers, len(ready)), cache=cache, report_writer=outputs.report_writer,
+                     timings_writer=outputs.timings_writer, export=outputs.export,
+                     mover=Mover(outputs.journal), io_mode=io_mode, prefetch=prefetch,
+                     identity_index=outputs.identity_index, executor=pool)
+                if cache is not None:
+                    cache.commit()
+                merge_stats(total_stats, batch_stats)
+                merge_stats(outputs.stats, batch_stats)
+                for path in ready:
+                    if os.path.exists(path):
+                        tracker.mark_failed(path)
+                    tracker.forget(path)
+
+            if notifier is not None:
+                for name in notifier.wait(poll_interval):
+                    tracker.mark_closed(os.path.join(source_dir, name))
+            else:
+                stop_event.wait(poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        log_callback("\n⏹️  Arrêt de la surveillance")
+        if notifier is not None:
+            notifier.close()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if cache is not None:
+            cache.evict()
+            cache.close()
+        if outputs is not None:
+            outputs.close(log_callback)
+        log_summary(total_stats, log_callback)
+
+    return total_stats
@@ -2,11 +2,22 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog
 import threading
+import queue
 import os
 import sys
+from datetime import datetime
 
 # Import the logic module
 from afis_console.core import sorter as logic
+from afis_console.core.control import RunControl
+from afis_console.core.progress import BatchSummary, ProgressMeter, format_seconds
+
+# Journal : le thread de traitement dépose les lignes dans une file, vidée
+# par l'interface à intervalle fixe et insérée par lots dans la zone de texte.
+LOG_DRAIN_INTERVAL_MS = 100
+LOG_BATCH_MAX = 1000
+# Nombre de lignes conservées à l'écran ; le journal complet est dans un fichier
+LOG_MAX_LINES = 2000
 
 class App(ctk.CTk):
     def __init__(self):
@@ -110,10 +121,38 @@ class App(ctk.CTk):
         # STEP 3: Action
         self.step3_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         self.step3_frame.grid(row=3, column=0, padx=15, pady=20, sticky="ew")
+
+        self.options_frame = ctk.CTkFrame(self.step3_frame, fg_color="transparent")
+        self.options_frame.pack(fill="x", pady=(0, 10))
+
+        ctk.CTkLabel(self.options_frame, text="Processus d'analyse en parallèle :", font=ctk.CTkFont(size=12)).pack(side="left")
+        self.workers_var = tk.StringVar(value="1")
+        self.workers_menu = ctk.CTkOptionMenu(self.options_frame, variable=self.workers_var, values=[str(n) for n in range(1, (os.cpu_count() or 1) + 1)], width=80, height=28)
+        self.workers_menu.pack(side="left", padx=(10, 0))
+        self.recursive_var = tk.BooleanVar(value=False)
+        self.recursive_check = ctk.CTkCheckBox(self.options_frame, text="Inclure les sous-dossiers", variable=self.recursive_var, font=ctk.CTkFont(size=12))
+        self.recursive_check.pack(side="left", padx=(20, 0))
+        self.dry_run_var = tk.BooleanVar(value=False)
+        self.dry_run_check = ctk.CTkCheckBox(self.options_frame, text="Simulation (ne déplace rien)", variable=self.dry_run_var, font=ctk.CTkFont(size=12))
+        self.dry_run_check.pack(side="left", padx=(20, 0))
         
         self.action_button = ctk.CTkButton(self.step3_frame, text="LANCER L'ANALYSE ET LE TRI", command=self.start_process, state="disabled", fg_color="#2ecc71", hover_color="#27ae60", font=ctk.CTkFont(size=16, weight="bold"), height=50)
         self.action_button.pack(fill="x")
 
+        # Avancement : barre, débit et temps restant, rafraîchis avec le journal
+        self.progress_frame = ctk.CTkFrame(self.step3_frame, fg_color="transparent")
+        self.progress_frame.pack(fill="x", pady=(10, 0))
+        self.progress_bar = ctk.CTkProgressBar(self.progress_frame)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x")
+        self.progress_label = ctk.CTkLabel(self.progress_frame, text="", font=ctk.CTkFont(size=11), text_color="gray")
+        self.progress_label.pack(side="left")
+        self.cancel_button = ctk.CTkButton(self.progress_frame, text="Annuler", command=self.cancel_process, state="disabled", width=90, height=24, font=ctk.CTkFont(size=11), fg_color="#e74c3c", hover_color="#c0392b")
+        self.cancel_button.pack(side="right", pady=(5, 0))
+        self.pause_button = ctk.CTkButton(self.progress_frame, text="Pause", command=self.toggle_pause, state="disabled", width=90, height=24, font=ctk.CTkFont(size=11))
+        self.pause_button.pack(side="right", padx=(0, 10), pady=(5, 0))
+        self.control = None
+
         # --- Logs Section ---
         self.logs_frame = ctk.CTkFrame(self)
         self.logs_frame.grid(row=2, column=0, padx=20, pady=(0, 20), sticky="nsew")
@@ -132,8 +171,12 @@ class App(ctk.CTk):
         self.log_textbox = ctk.CTkTextbox(self.logs_frame, font=ctk.CTkFont(family="Courier", size=12))
         self.log_textbox.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
         
+        self.log_queue = queue.SimpleQueue()
+        # Dernier état d'avancement (fraction, texte) publié par le thread de traitement
+        self.progress_snapshot = None
         self.log_message("Bienvenue. Veuillez sélectionner un dossier source pour commencer.")
         self.final_dest_dir = None
+        self.after(LOG_DRAIN_INTERVAL_MS, self.drain_log_queue)
 
     def select_folder(self):
         folder_selected = filedialog.askdirectory(title="Sélectionner le dossier contenant les rapports")
@@ -162,20 +205,66 @@ class App(ctk.CTk):
                 self.log_message(f"❌ Impossible d'ouvrir le dossier : {e}")
 
     def log_message(self, message):
-        self.log_textbox.insert("end", message + "\n")
+        self.append_log_lines([message])
+
+    def append_log_lines(self, lines):
+        """Insère un lot de lignes en une fois et ne garde que les LOG_MAX_LINES dernières."""
+        self.log_textbox.insert("end", "\n".join(lines) + "\n")
+        line_count = int(self.log_textbox.index("end-1c").split(".")[0])
+        if line_count > LOG_MAX_LINES:
+            self.log_textbox.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
         self.log_textbox.see("end")
 
+    def flush_log_queue(self, limit=None):
+        """Affiche les lignes en attente (au plus limit). Appelé depuis le thread de l'interface."""
+        lines = []
+        while limit is None or len(lines) < limit:
+            try:
+                lines.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            self.append_log_lines(lines)
+
+    def render_progress(self):
+        snapshot = self.progress_snapshot
+        if snapshot is None:
+            return
+        self.progress_snapshot = None
+        fraction, text = snapshot
+        if fraction is not None:
+            self.progress_bar.set(fraction)
+        self.progress_label.configure(text=text)
+
+    def drain_log_queue(self):
+        self.flush_log_queue(LOG_BATCH_MAX)
+        self.render_progress()
+        self.after(LOG_DRAIN_INTERVAL_MS, self.drain_log_queue)
+
     def start_process(self):
         source_dir = self.folder_path.get()
         dest_dir = self.dest_path.get()
         if not source_dir or not os.path.exists(source_dir):
             self.log_message("❌ Erreur : Le dossier source est invalide.")
             return
+        dry_run = self.dry_run_var.get()
+        if dry_run and not dest_dir:
+            # La simulation n'écrit rien dans la source, rapport compris
+            self.log_message("❌ Erreur : Choisissez un dossier destination pour le rapport de simulation.")
+            return
 
         self.action_button.configure(state="disabled", text="TRAITEMENT EN COURS...")
         self.browse_button.configure(state="disabled")
         self.dest_button.configure(state="disabled")
+        self.workers_menu.configure(state="disabled")
+        self.recursive_check.configure(state="disabled")
+        self.dry_run_check.configure(state="disabled")
         self.open_result_button.configure(state="disabled") # Reset state
+        self.progress_bar.set(0)
+        self.progress_label.configure(text="")
+        self.control = RunControl()
+        self.pause_button.configure(state="normal", text="Pause")
+        self.cancel_button.configure(state="normal")
         
         self.log_message(f"\n🚀 Démarrage du traitement...")
         self.log_message(f"   Source : {source_dir}")
@@ -185,33 +274,106 @@ class App(ctk.CTk):
         else:
             self.final_dest_dir = source_dir
         
+        workers = int(self.workers_var.get())
+        if workers > 1:
+            self.log_message(f"   Processus : {workers}")
+
         # Run in thread to not freeze UI
-        thread = threading.Thread(target=self.run_logic, args=(source_dir, dest_dir))
+        recursive = self.recursive_var.get()
+        if recursive:
+            self.log_message("   Sous-dossiers inclus")
+        if dry_run:
+            self.log_message("   Simulation : aucun fichier déplacé")
+
+        thread = threading.Thread(target=self.run_logic, args=(source_dir, dest_dir, workers, self.control, recursive, dry_run))
         thread.start()
 
-    def run_logic(self, source_dir, dest_dir):
+    def toggle_pause(self):
+        if self.control is None:
+            return
+        if self.control.paused:
+            self.control.resume()
+            self.pause_button.configure(text="Pause")
+            self.log_message("▶️ Reprise du traitement")
+        else:
+            self.control.pause()
+            self.pause_button.configure(text="Reprendre")
+            self.log_message("⏸️ Traitement en pause (après le fichier en cours)")
+
+    def cancel_process(self):
+        if self.control is None:
+            return
+        self.control.cancel()
+        self.pause_button.configure(state="disabled")
+        self.cancel_button.configure(state="disabled")
+        self.log_message("⏹️ Annulation demandée, fin du fichier en cours...")
+
+    def open_log_file(self, dest_dir):
+        """Journal complet du traitement, dans le dossier de résultat (None si impossible)."""
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        try:
+            os.makedirs(dest_dir, exist_ok=True)
+            return open(os.path.join(dest_dir, f"journal_traitement_{timestamp}.log"), "w", encoding="utf-8")
+        except OSError as e:
+            self.log_queue.put(f"⚠️ Journal complet impossible à créer : {e}")
+            return None
+
+    def make_progress_callback(self):
+        """Callback d'avancement appelé depuis le thread de traitement ; l'affichage suit le timer du journal."""
+        meter = ProgressMeter()
+
+        def on_event(event):
+            if isinstance(event, BatchSummary):
+                rate = event.files / event.seconds if event.seconds else 0.0
+                self.progress_snapshot = (1.0, f"{event.files} fichier(s) en {format_seconds(event.seconds)} · {rate:.1f} fichiers/s")
+                return
+            meter.update(event)
+            self.progress_snapshot = (meter.fraction, meter.describe())
+
+        return on_event
+
+    def run_logic(self, source_dir, dest_dir, workers=1, control=None, recursive=False, dry_run=False):
+        log_file = self.open_log_file(dest_dir or source_dir)
+        stats = None
         try:
             if logic:
                 def safe_log(msg):
-                    self.after(0, lambda: self.log_message(msg))
+                    # Appelé depuis le thread de traitement : aucune opération Tk ici
+                    if log_file is not None:
+                        log_file.write(msg + "\n")
+                    self.log_queue.put(msg)
 
-                stats = logic.process_folder(source_dir, log_callback=safe_log, destination_dir=dest_dir)
-                
-                self.after(0, lambda: self.finish_process(stats))
+                stats = logic.process_folder(source_dir, log_callback=safe_log, destination_dir=dest_dir, workers=workers,
+                                             progress_callback=self.make_progress_callback(), control=control,
+                                             recursive=recursive, dry_run=dry_run)
             else:
-                self.after(0, lambda: self.log_message("❌ Erreur critique : Module de logique introuvable."))
-                self.after(0, lambda: self.finish_process(None))
+                self.log_queue.put("❌ Erreur critique : Module de logique introuvable.")
 
         except Exception as e:
-            self.after(0, lambda: self.log_message(f"❌ Erreur inattendue : {e}"))
-            self.after(0, lambda: self.finish_process(None))
+            self.log_queue.put(f"❌ Erreur inattendue : {e}")
+        finally:
+            if log_file is not None:
+                log_file.close()
+            self.after(0, lambda: self.finish_process(stats))
 
     def finish_process(self, stats):
+        # Afficher les dernières lignes du traitement avant le bilan
+        self.flush_log_queue()
+        self.render_progress()
         self.action_button.configure(state="normal", text="LANCER L'ANALYSE ET LE TRI")
         self.browse_button.configure(state="normal")
         self.dest_button.configure(state="normal")
+        self.workers_menu.configure(state="normal")
+        self.recursive_check.configure(state="normal")
+        self.dry_run_check.configure(state="normal")
+        self.pause_button.configure(state="disabled", text="Pause")
+        self.cancel_button.configure(state="disabled")
+        self.control = None
         
-        if stats:
+        if stats and stats.get("cancelled"):
+             self.log_message(f"\n⏹️ Traitement annulé : relancez-le sur le même dossier pour le reprendre.")
+             self.open_result_button.configure(state="normal")
+        elif stats:
              self.log_message(f"\n✨ Traitement terminé avec succès!")
              self.open_result_button.configure(state="normal") # Enable opening folder
         else:
@@ -1,7 +1,21 @@
 import sys
 import argparse
 import os
-from afis_console.core.sorter import process_folder
+import signal
+import threading
+import time
+from afis_console.core.control import RunControl
+from afis_console.core.export import DEFAULT_EXPORT_FORMATS, EXPORT_FORMATS
+from afis_console.core.progress import BatchSummary, ProgressMeter, format_seconds
+from afis_console.core.reader import DEFAULT_PREFETCH, IO_MODES
+
+# Imports légers uniquement au niveau du module : PyMuPDF (via core.sorter) et
+# l'interface graphique (tkinter, customtkinter) ne sont chargés qu'au moment
+# où ils servent, pour que --help et les lancements planifiés du CLI
+# démarrent vite (voir benchmarks/startup.py).
+
+# Intervalle minimal entre deux lignes d'avancement en mode CLI (secondes)
+PROGRESS_INTERVAL = 2.0
 
 def run_gui():
     try:
@@ -17,22 +31,112 @@ def run_gui():
         print(f"Erreur lors du chargement de l'interface graphique : {e}")
         sys.exit(1)
 
+def cli_progress(interval=PROGRESS_INTERVAL):
+    """Callback d'avancement du mode CLI : une ligne de débit/temps restant toutes les interval secondes."""
+    meter = ProgressMeter()
+    last_print = time.monotonic()
+
+    def on_event(event):
+        nonlocal last_print
+        if isinstance(event, BatchSummary):
+            rate = event.files / event.seconds if event.seconds else 0.0
+            print(f"⏱️  {event.files} fichier(s) en {format_seconds(event.seconds)} · {rate:.1f} fichiers/s")
+            return
+        meter.update(event)
+        now = time.monotonic()
+        if now - last_print >= interval:
+            last_print = now
+            print(f"⏳ {meter.describe()}")
+
+    return on_event
+
 def run_cli(args):
-    source_dir = args.directory
-    if not os.path.isdir(source_dir):
-        print(f"Erreur : '{source_dir}' n'est pas un dossier valide.")
-        sys.exit(1)
+    for directory in args.directories:
+        if not os.path.isdir(directory):
+            print(f"Erreur : '{directory}' n'est pas un dossier valide.")
+            sys.exit(1)
+    source_dir = args.directories[0]
         
-    print(f"Démarrage du tri en mode CLI pour : {source_dir}")
-    process_folder(source_dir)
+    if args.clear_cache:
+        from afis_console.core.sorter import clear_cache
+        removed = clear_cache(source_dir)
+        print(f"Cache d'analyse vidé : {removed} entrée(s) supprimée(s).")
+        return
+
+    if args.watch:
+        from afis_console.core.watcher import watch_folder
+
+        # SIGTERM (arrêt du service) : fin propre, rapport HTML complété
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+        watch_folder(source_dir, workers=args.workers, use_cache=not args.no_cache,
+                     poll_interval=args.poll_interval, stop_event=stop_event,
+                     export_formats=() if args.no_export else (args.export or DEFAULT_EXPORT_FORMATS),
+                     io_mode=args.io, prefetch=args.prefetch, engine=args.engine)
+        return
+
+    # Ctrl+C ou SIGTERM : annulation propre entre deux fichiers, avec point
+    # de reprise ; un second Ctrl+C interrompt immédiatement.
+    control = RunControl()
+    def request_cancel(signum, frame):
+        print("\n⏹️  Annulation demandée, fin du fichier en cours... (Ctrl+C à nouveau pour forcer)")
+        control.cancel()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGINT, request_cancel)
+    signal.signal(signal.SIGTERM, request_cancel)
+
+    from afis_console.core.sorter import process_folder
+
+    print(f"Démarrage du {'tri simulé' if args.dry_run else 'tri'} en mode CLI pour : {', '.join(args.directories)}")
+    stats = process_folder(args.directories, workers=args.workers, use_cache=not args.no_cache, profile=args.profile,
+                           progress_callback=cli_progress(), control=control, recursive=args.recursive,
+                           include=args.include, exclude=args.exclude,
+                           export_formats=() if args.no_export else (args.export or DEFAULT_EXPORT_FORMATS),
+                           dry_run=args.dry_run, io_mode=args.io, prefetch=args.prefetch, engine=args.engine)
+    if stats and stats.get("cancelled"):
+        sys.exit(130)
 
 def main():
+    # Indispensable pour le pool de processus dans l'exécutable PyInstaller
+    # (sans effet hors exécutable : multiprocessing n'est alors pas importé)
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+
     parser = argparse.ArgumentParser(description="Tri Automatique des Rapports FAED")
-    parser.add_argument("directory", nargs="?", help="Chemin du dossier à trier (Mode CLI). Si omis, lance l'interface graphique.")
+    parser.add_argument("directories", nargs="*", metavar="directory", help="Dossier(s) à trier (Mode CLI) ; les résultats vont dans le premier. Si omis, lance l'interface graphique.")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Parcourt aussi les sous-dossiers (dossiers datés d'un partage, par exemple).")
+    parser.add_argument("--include", action="append", metavar="MOTIF", help="Motif glob des fichiers à trier, sur le nom ou le chemin relatif (répétable, défaut : *.pdf).")
+    parser.add_argument("--exclude", action="append", metavar="MOTIF", help="Motif glob des fichiers ou sous-dossiers à ignorer (répétable).")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="Nombre de processus d'analyse en parallèle (0 = tous les cœurs, défaut : 1).")
+    parser.add_argument("--io", choices=IO_MODES, default="auto", help="Lecture des PDF : auto (en une fois sur un partage réseau, par chemin sinon), path, bulk (une lecture séquentielle) ou mmap (disque local).")
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH, metavar="N", help=f"Nombre de PDF lus d'avance pendant l'analyse (0 = aucun, défaut : {DEFAULT_PREFETCH}).")
+    # Valeurs de core.sorter.ENGINES, non importé ici (démarrage rapide)
+    parser.add_argument("--engine", choices=("sequential", "pipeline"), default="sequential", help="Moteur de tri : sequential (fichier par fichier) ou pipeline (lecture, analyse, déplacement et rapport en étapes concurrentes, utile sur un partage réseau).")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore le cache d'analyse : tous les PDF sont réanalysés.")
+    parser.add_argument("--export", action="append", choices=EXPORT_FORMATS, help="Format d'export des résultats à côté du rapport HTML (répétable, défaut : jsonl et csv ; parquet nécessite pyarrow).")
+    parser.add_argument("--no-export", action="store_true", help="N'exporte pas les résultats (rapport HTML seul).")
+    parser.add_argument("--dry-run", action="store_true", help="Simulation : analyse, rapport et export sans rien déplacer, résultats dans le dossier courant. Avec -r sur une archive déjà triée, reclasse sur place les dossiers de catégorie.")
+    parser.add_argument("--profile", action="store_true", help="Profil CPU (cProfile) et mémoire (tracemalloc) du traitement, à côté du rapport HTML.")
+    parser.add_argument("--watch", action="store_true", help="Surveille le dossier et trie les PDF dès leur arrivée (Ctrl+C pour arrêter).")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Mode --watch : intervalle de scrutation du dossier, en secondes (défaut : 2).")
+    parser.add_argument("--rollback", metavar="JOURNAL", help="Remet à leur place d'origine les fichiers d'un lot, d'après son journal deplacements_<date>.jsonl, puis quitte.")
+    parser.add_argument("--clear-cache", action="store_true", help="Vide le cache d'analyse du dossier puis quitte.")
     
     args = parser.parse_args()
+    if args.watch:
+        # La surveillance porte sur un seul dossier, sans sous-dossiers ni filtres
+        unsupported = [flag for flag, used in (("--dry-run", args.dry_run), ("-r/--recursive", args.recursive),
+                                               ("--include", args.include), ("--exclude", args.exclude),
+                                               ("--profile", args.profile),
+                                               ("plusieurs dossiers", len(args.directories) > 1)) if used]
+        if unsupported:
+            parser.error(f"--watch ne s'utilise pas avec : {', '.join(unsupported)}")
 
-    if args.directory:
+    if args.rollback:
+        from afis_console.core.mover import rollback_moves
+        rollback_moves(args.rollback)
+    elif args.directories:
         run_cli(args)
     else:
         run_gui()
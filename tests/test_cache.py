@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import shutil
+import sys
+import os
+import tempfile
+import time
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.cache import AnalysisCache, file_digest
+from afis_console.core.sorter import process_folder
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_roundtrip_and_rules_version(self):
+        with AnalysisCache(self.tmp, rules_version=1) as cache:
+            cache.put("abc", {'category': 'ok', 'p1_clean': True})
+        with AnalysisCache(self.tmp, rules_version=1) as cache:
+            self.assertEqual(cache.get("abc"), {'category': 'ok', 'p1_clean': True})
+        with AnalysisCache(self.tmp, rules_version=2) as cache:
+            self.assertIsNone(cache.get("abc"))
+            # Les entrées d'une autre version des règles sont évincées
+            self.assertEqual(cache.evict(), 1)
+
+    def test_evict_by_age_and_size(self):
+        with AnalysisCache(self.tmp, rules_version=1) as cache:
+            for i in range(5):
+                cache.put(f"d{i}", {'i': i})
+            cache._conn.execute("UPDATE analyses SET last_used = ? WHERE digest = 'd0'",
+                                (time.time() - 10 * 86400,))
+            self.assertEqual(cache.evict(max_age_days=5, max_entries=None), 1)
+            self.assertEqual(cache.evict(max_age_days=None, max_entries=2), 2)
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.clear(), 2)
+            self.assertEqual(len(cache), 0)
+
+    def test_file_digest_depends_on_content(self):
+        a = os.path.join(self.tmp, "a.pdf")
+        b = os.path.join(self.tmp, "b.pdf")
+        for path, content in ((a, b"%PDF-1"), (b, b"%PDF-1")):
+            with open(path, "wb") as f:
+                f.write(content)
+        self.assertEqual(file_digest(a), file_digest(b))
+        with open(b, "ab") as f:
+            f.write(b"x")
+        self.assertNotEqual(file_digest(a), file_digest(b))
+
+    @patch('fitz.open')
+    def test_rerun_skips_cached_reports(self, mock_open):
+        mock_doc = MagicMock()
+        mock_page = MagicMock()
+        mock_open.return_value = mock_doc
+        mock_doc.__getitem__.return_value = mock_page
+        mock_doc.__len__.return_value = 1
+        mock_page.get_text.return_value = [
+            (10, 100, 50, 110, "Homonymes", 0, 0, 0),
+            (60, 100, 80, 110, "non", 0, 0, 1)
+        ]
+        with open(os.path.join(self.tmp, "rapport.pdf"), "wb") as f:
+            f.write(b"%PDF-1.4")
+
+        stats = process_folder(self.tmp, log_callback=lambda msg: None)
+        self.assertEqual(stats['cached'], 0)
+        calls = mock_open.call_count
+
+        # Remettre le fichier dans la source et relancer : pas de nouvelle lecture
+        shutil.move(os.path.join(self.tmp, "Pas_d_homonyme", "rapport.pdf"), self.tmp)
+        stats = process_folder(self.tmp, log_callback=lambda msg: None)
+        self.assertEqual(stats['cached'], 1)
+        self.assertEqual(stats['ok'], 1)
+        self.assertEqual(mock_open.call_count, calls)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import glob
+import sys
+import os
+import tempfile
+
+# Add src and the repository root (benchmarks) to path for testing
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_report
+from afis_console.core.control import CHECKPOINT_FILENAME, RunControl, load_checkpoint
+from afis_console.core.progress import FileMoved
+from afis_console.core.sorter import process_folder
+
+class TestRunControl(unittest.TestCase):
+    def test_checkpoint_reflects_cancel(self):
+        control = RunControl()
+        control.pause()
+        self.assertTrue(control.paused)
+        control.cancel()  # débloque la pause
+        self.assertFalse(control.paused)
+        self.assertFalse(control.checkpoint())
+
+    def test_cancel_writes_checkpoint_and_resume_completes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("a.pdf", "b.pdf", "c.pdf"):
+                generate_report(os.path.join(tmp, name), "DUPONT JEAN", "01/02/1980",
+                                [("DUPONT JEAN", "01/02/1980", 1, 0)])
+            control = RunControl()
+
+            def cancel_after_first_move(event):
+                if isinstance(event, FileMoved):
+                    control.cancel()
+
+            stats = process_folder(tmp, log_callback=lambda msg: None,
+                                   progress_callback=cancel_after_first_move, control=control)
+            self.assertTrue(stats['cancelled'])
+            self.assertEqual(stats['ok'], 1)
+            moved = load_checkpoint(tmp, tmp)
+            self.assertEqual([detail['filename'] for detail in moved], ["a.pdf"])
+            self.assertTrue(os.path.exists(os.path.join(tmp, "b.pdf")))
+
+            stats = process_folder(tmp, log_callback=lambda msg: None)
+            self.assertFalse(stats['cancelled'])
+            self.assertEqual(stats['ok'], 3)
+            self.assertFalse(os.path.exists(os.path.join(tmp, CHECKPOINT_FILENAME)))
+            self.assertEqual(sorted(os.listdir(os.path.join(tmp, "Pas_d_homonyme"))),
+                             ["a.pdf", "b.pdf", "c.pdf"])
+            latest = max(glob.glob(os.path.join(tmp, "rapport_traitement_*.html")))
+            with open(latest, encoding="utf-8") as f:
+                self.assertIn("a.pdf", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
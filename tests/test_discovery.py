@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.discovery import BackgroundScan, iter_pdfs
+
+class TestDiscovery(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        for relpath in ("b.pdf", "a.PDF", "notes.txt", "2024-01/c.pdf", "2024-01/brouillon_d.pdf",
+                        "2024-02/e.pdf", "archives/f.pdf", ".cache/g.pdf", "Pas_d_homonyme/h.pdf"):
+            path = os.path.join(self.root, *relpath.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def relpaths(self, paths):
+        return [os.path.relpath(p, self.root).replace(os.sep, '/') for p in paths]
+
+    def test_flat_scan_matches_pdf_extension(self):
+        self.assertEqual(self.relpaths(iter_pdfs(self.root)), ["a.PDF", "b.pdf"])
+
+    def test_recursive_scan_with_globs_and_skipped_dirs(self):
+        paths = iter_pdfs(self.root, recursive=True, exclude=["archives", "brouillon_*"],
+                          skip_dirs=[os.path.join(self.root, "Pas_d_homonyme")])
+        self.assertEqual(self.relpaths(paths), ["a.PDF", "b.pdf", "2024-01/c.pdf", "2024-02/e.pdf"])
+
+        paths = iter_pdfs(self.root, recursive=True, include=["2024-02/*.pdf"])
+        self.assertEqual(self.relpaths(paths), ["2024-02/e.pdf"])
+
+    def test_multiple_roots(self):
+        paths = iter_pdfs([os.path.join(self.root, "2024-02"), os.path.join(self.root, "2024-01")])
+        self.assertEqual([os.path.basename(p) for p in paths], ["e.pdf", "brouillon_d.pdf", "c.pdf"])
+
+    def test_background_scan_streams_and_counts(self):
+        scan = BackgroundScan(iter_pdfs(self.root, recursive=True))
+        paths = list(scan)
+        scan.close()
+        self.assertEqual(len(paths), 7)
+        self.assertEqual(scan.total, 7)
+
+    def test_close_releases_pending_items_and_wakes_consumer(self):
+        more = threading.Event()
+        def slow_source():
+            yield from (1, 2, 3)
+            more.wait(5)  # recherche bloquée (gros dossier, partage lent)
+            yield 4
+        released = []
+        scan = BackgroundScan(slow_source(), maxsize=5, release=released.append)
+        while scan.found < 3:
+            threading.Event().wait(0.01)
+        scan.close()
+        self.assertEqual(released, [1, 2, 3])
+        self.assertEqual(list(scan), [])
+        # Élément produit après l'arrêt : libéré par le thread
+        more.set()
+        scan._thread.join(5)
+        self.assertEqual(released, [1, 2, 3, 4])
+
+if __name__ == '__main__':
+    unittest.main()
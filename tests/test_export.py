@@ -0,0 +1,96 @@
+import unittest
+import csv
+import glob
+import json
+import sys
+import os
+import tempfile
+
+# Add src and the repository root (benchmarks) to path for testing
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_report
+from afis_console.core.export import COLUMNS, ResultExport, result_record
+from afis_console.core.records import FileResult
+from afis_console.core.sorter import process_folder
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+DETAIL = FileResult.from_dict({
+    'filename': "rapport.pdf", 'category': 'manual', 'message': "🔶 (homonyme)",
+    'p1_clean': True, 'is_manual': True, 'is_identity_error': False, 'is_identity_space': False,
+    'pages_decoded': 2,
+    'identities': [{'alias': "DUPONT JEAN", 'count': 0}, {'alias': "DUPOND JEAN", 'count': 3}],
+    'identity_check': {'main_identity': "DUPONT JEAN", 'section_identity': "DUPONT JEAN",
+                       'aliases': ["DUPONT JEAN", "DUPOND JEAN"], 'has_mismatch': False,
+                       'mismatch_type': 'none', 'has_identity_section': True},
+    'timings': {'open': 0.25, 'move': 0.5},
+})
+
+class TestExport(unittest.TestCase):
+    def test_record_flattens_identity_check_and_timings(self):
+        record = result_record(DETAIL, "/dest/rapport.pdf")
+        self.assertEqual(tuple(record), COLUMNS)
+        self.assertEqual(record['homonyms_total'], 3)
+        self.assertEqual(record['section_identity'], "DUPONT JEAN")
+        self.assertEqual(record['seconds_total'], 0.75)
+        self.assertIsNone(record['seconds_parse'])
+
+    def test_jsonl_and_csv_are_streamed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export = ResultExport(os.path.join(tmp, "resultats"), ('jsonl', 'csv'))
+            export.add(DETAIL, "/dest/rapport.pdf")
+            export.close()
+            with open(os.path.join(tmp, "resultats.jsonl"), encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f]
+            with open(os.path.join(tmp, "resultats.csv"), encoding="utf-8", newline="") as f:
+                csv_rows = list(csv.DictReader(f))
+        self.assertEqual(rows[0]['identities'], [{'alias': "DUPONT JEAN", 'count': 0},
+                                                 {'alias': "DUPOND JEAN", 'count': 3}])
+        self.assertEqual(csv_rows[0]['identities'], "DUPONT JEAN (0) | DUPOND JEAN (3)")
+        self.assertEqual(csv_rows[0]['category'], "manual")
+
+    @unittest.skipIf(pq is None, "pyarrow non installé")
+    def test_parquet_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export = ResultExport(os.path.join(tmp, "resultats"), ('parquet',))
+            export.add(DETAIL, "/dest/rapport.pdf")
+            export.add(DETAIL._replace(identities=None, identity_check=None), None)
+            export.close()
+            table = pq.read_table(os.path.join(tmp, "resultats.parquet"))
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column('homonyms_total').to_pylist(), [3, None])
+
+    def test_process_folder_exports_next_to_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_report(os.path.join(tmp, "rapport.pdf"), "DUPONT JEAN", "01/02/1980",
+                            [("DUPONT JEAN", "01/02/1980", 1, 0)])
+            process_folder(tmp, log_callback=lambda msg: None)
+            jsonl, = glob.glob(os.path.join(tmp, "rapport_traitement_*.jsonl"))
+            self.assertTrue(glob.glob(os.path.join(tmp, "rapport_traitement_*.csv")))
+            with open(jsonl, encoding="utf-8") as f:
+                row = json.loads(f.readline())
+        self.assertEqual(row['category'], "ok")
+        self.assertTrue(row['destination'].endswith(os.path.join("Pas_d_homonyme", "rapport.pdf")))
+        self.assertIsNotNone(row['seconds_move'])
+
+    def test_repeated_format_is_exported_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_report(os.path.join(tmp, "rapport.pdf"), "DUPONT JEAN", "01/02/1980",
+                            [("DUPONT JEAN", "01/02/1980", 1, 0)])
+            logs = []
+            process_folder(tmp, log_callback=logs.append, export_formats=['csv', 'jsonl', 'csv'])
+            csv_path, = glob.glob(os.path.join(tmp, "rapport_traitement_*.csv"))
+            with open(csv_path, encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 1)
+        exported, = [msg for msg in logs if msg.startswith("📤")]
+        self.assertRegex(exported, r"\.csv, rapport_traitement_[^,]+\.jsonl$")
+
+if __name__ == '__main__':
+    unittest.main()
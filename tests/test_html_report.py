@@ -0,0 +1,41 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.html_report import HtmlReportWriter
+
+DETAIL = {
+    'filename': 'rapport_<1>.pdf',
+    'p1_clean': True,
+    'identities': [{'alias': 'DUPONT JEAN', 'count': 2}],
+    'is_manual': True,
+    'is_identity_error': False,
+    'is_identity_space': False,
+    'identity_check': {'section_identity': 'DUPONT JEAN', 'has_mismatch': False, 'has_identity_section': True},
+}
+
+STATS = {"ok": 0, "manual": 1, "error": 0, "identity_error": 0, "identity_error_space": 0}
+
+class TestHtmlReportWriter(unittest.TestCase):
+    def test_rows_are_on_disk_before_close(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = HtmlReportWriter(tmp)
+            writer.add(DETAIL)
+            with open(writer.path, encoding="utf-8") as f:
+                partial = f.read()
+            self.assertIn("rapport_&lt;1&gt;.pdf", partial)
+            self.assertIn("2 homonyme(s)", partial)
+            self.assertNotIn("Total analysé", partial)
+
+            writer.close(STATS)
+            with open(writer.path, encoding="utf-8") as f:
+                full = f.read()
+            self.assertIn("<strong>Total analysé :</strong> 1", full)
+            self.assertTrue(full.rstrip().endswith("</html>"))
+
+if __name__ == '__main__':
+    unittest.main()
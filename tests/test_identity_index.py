@@ -0,0 +1,39 @@
+import unittest
+import sys
+import os
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.identity_index import IdentityIndex, identity_keys
+from afis_console.core.records import AliasEntry, FileResult, SectionIdentities
+
+def _result(filename, identity, dob, aliases=()):
+    section = SectionIdentities(identity, dob, tuple(AliasEntry(name, alias_dob, 1) for name, alias_dob in aliases))
+    return FileResult(filename, 'ok', '', True, (), None, 1, {}, section)
+
+class TestIdentityIndex(unittest.TestCase):
+    def test_identity_keys(self):
+        detail = _result("a.pdf", "Dupont-Jean", "01/02/1980", [("DUPONT JEAN", "01/02/1980"), ("MARTIN", None)])
+        self.assertEqual(identity_keys(detail), {("DUPONT JEAN", "01/02/1980")})
+        self.assertEqual(identity_keys(_result("b.pdf", None, None)._replace(section=None)), set())
+
+    def test_clusters_are_transitive(self):
+        index = IdentityIndex()
+        index.add(_result("a.pdf", "DUPONT JEAN", "01/02/1980"), "/dest/a.pdf")
+        index.add(_result("b.pdf", "DURAND PAUL", "03/04/1975"))
+        # Relie a (alias) et d (identité) : a, c et d forment un seul groupe
+        index.add(_result("c.pdf", "MARTIN LUC", "05/06/1990", [("Dupont Jean", "01/02/1980")]))
+        index.add(_result("d.pdf", "MARTIN LUC", "05/06/1990"))
+        index.add(_result("e.pdf", "DUPONT JEAN", "02/02/1980"))
+        [cluster] = index.clusters()
+        self.assertEqual([m.filename for m in cluster.reports], ["a.pdf", "c.pdf", "d.pdf"])
+        self.assertEqual(cluster.reports[0].destination, "/dest/a.pdf")
+        self.assertEqual(cluster.identities, (("DUPONT JEAN", "01/02/1980"), ("MARTIN LUC", "05/06/1990")))
+
+    def test_section_survives_dict_round_trip(self):
+        detail = _result("a.pdf", "DUPONT JEAN", "01/02/1980", [("DUPONT JEAN", "01/02/1980")])
+        self.assertEqual(FileResult.from_dict(detail.to_dict()), detail)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import glob
+import json
+import sys
+import os
+import tempfile
+
+# Add src and the repository root (benchmarks) to path for testing
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_report
+from afis_console.core.instrumentation import StageTimer, TimingsWriter
+from afis_console.core.sorter import process_folder
+
+class TestInstrumentation(unittest.TestCase):
+    def test_stage_timer_accumulates(self):
+        durations = {'open': 1.0}
+        timer = StageTimer(durations)
+        with timer.stage('open'):
+            pass
+        timer.merge({'move': 0.5})
+        self.assertGreaterEqual(durations['open'], 1.0)
+        self.assertEqual(durations['move'], 0.5)
+
+    def test_timings_writer_produces_valid_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "t.timings.json")
+            writer = TimingsWriter(path)
+            writer.add("a.pdf", {'open': 0.1})
+            writer.add("b.pdf", {'open': 0.2})
+            writer.close({'open': 0.3}, {'memory_peak_bytes': 10})
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.assertEqual([e['filename'] for e in data['files']], ["a.pdf", "b.pdf"])
+        self.assertEqual(data['aggregate'], {'open': 0.3})
+        self.assertEqual(data['profile'], {'memory_peak_bytes': 10})
+
+    def test_process_folder_reports_stage_timings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_report(os.path.join(tmp, "rapport.pdf"), "DUPONT JEAN", "01/02/1980",
+                            [("DUPONT JEAN", "01/02/1980", 1, 0)])
+            stats = process_folder(tmp, log_callback=lambda msg: None, profile=True)
+
+            for stage in ('open', 'page1_words', 'text', 'parse', 'hash', 'move', 'report'):
+                self.assertIn(stage, stats['timings'])
+            sidecar, = glob.glob(os.path.join(tmp, "*.timings.json"))
+            with open(sidecar, encoding="utf-8") as f:
+                data = json.load(f)
+            self.assertEqual(data['files'][0]['filename'], "rapport.pdf")
+            self.assertTrue(os.path.exists(data['profile']['cpu_profile']))
+
+if __name__ == '__main__':
+    unittest.main()
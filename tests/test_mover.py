@@ -0,0 +1,120 @@
+import unittest
+import errno
+import json
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core import mover as mover_module
+from afis_console.core.mover import MoveJournal, Mover, rollback_moves
+
+class TestMover(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self._tmp.name, "source")
+        self.dest = os.path.join(self._tmp.name, "Pas_d_homonyme")
+        os.makedirs(self.source)
+        os.makedirs(self.dest)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, directory, name, content):
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_collisions_get_numbered_suffix(self):
+        self.write(self.dest, "rapport.pdf", "ancien")
+        self.write(self.dest, "rapport (1).pdf", "ancien")
+        mover = Mover()
+        dst = mover.move(self.write(self.source, "rapport.pdf", "nouveau"), self.dest)
+        self.assertEqual(os.path.basename(dst), "rapport (2).pdf")
+        dst = mover.move(self.write(self.source, "rapport.pdf", "encore"), self.dest)
+        self.assertEqual(os.path.basename(dst), "rapport (3).pdf")
+        with open(os.path.join(self.dest, "rapport.pdf")) as f:
+            self.assertEqual(f.read(), "ancien")
+
+    def test_cross_device_falls_back_to_synced_copy(self):
+        src = self.write(self.source, "a.pdf", "contenu")
+        cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+
+        with mock.patch.object(mover_module, '_rename_exclusive', side_effect=cross_device):
+            dst = Mover().move(src, self.dest)
+        self.assertFalse(os.path.exists(src))
+        with open(dst) as f:
+            self.assertEqual(f.read(), "contenu")
+        self.assertEqual(os.listdir(self.dest), ["a.pdf"])  # pas de .part résiduel
+
+    def test_file_created_after_listing_is_not_overwritten(self):
+        mover = Mover()
+        mover.move(self.write(self.source, "a.pdf", "a"), self.dest)  # dossier listé
+        self.write(self.dest, "r.pdf", "existant")
+        dst = mover.move(self.write(self.source, "r.pdf", "nouveau"), self.dest)
+        self.assertEqual(os.path.basename(dst), "r (1).pdf")
+        with open(os.path.join(self.dest, "r.pdf")) as f:
+            self.assertEqual(f.read(), "existant")
+
+    def test_rename_fallback_does_not_overwrite_or_copy(self):
+        # Sans renameat2 (ou option refusée) : renommage après réservation exclusive
+        self.write(self.dest, "r.pdf", "existant")
+        copy = mock.Mock(side_effect=AssertionError("copie inattendue"))
+        with mock.patch.object(mover_module, '_renameat2', return_value=None), \
+                mock.patch.object(mover_module, '_copy_then_remove', copy):
+            with self.assertRaises(FileExistsError):
+                mover_module._relocate(self.write(self.source, "r.pdf", "nouveau"),
+                                       os.path.join(self.dest, "r.pdf"), same_device=True)
+            dst = Mover().move(self.write(self.source, "s.pdf", "s"), self.dest)
+        with open(os.path.join(self.dest, "r.pdf")) as f:
+            self.assertEqual(f.read(), "existant")
+        with open(dst) as f:
+            self.assertEqual(f.read(), "s")
+
+    def test_copy_does_not_overwrite(self):
+        existing = self.write(self.dest, "r.pdf", "existant")
+        src = self.write(self.source, "r.pdf", "nouveau")
+        with self.assertRaises(FileExistsError):
+            mover_module._copy_then_remove(src, existing)
+        with open(existing) as f:
+            self.assertEqual(f.read(), "existant")
+        self.assertTrue(os.path.exists(src))
+
+    def test_journal_and_rollback(self):
+        journal_path = os.path.join(self._tmp.name, "deplacements.jsonl")
+        journal = MoveJournal(journal_path)
+        mover = Mover(journal)
+        for name in ("a.pdf", "b.pdf"):
+            mover.move(self.write(self.source, name, name), self.dest)
+        journal.close()
+        with open(journal_path, encoding="utf-8") as f:
+            statuses = [json.loads(line)['status'] for line in f]
+        self.assertEqual(statuses, ['pending', 'done'] * 2)  # annoncé avant d'être fait
+
+        restored = rollback_moves(journal_path, log_callback=lambda msg: None)
+        self.assertEqual(restored, 2)
+        self.assertEqual(sorted(os.listdir(self.source)), ["a.pdf", "b.pdf"])
+        self.assertEqual(os.listdir(self.dest), [])
+
+    def test_rollback_of_interrupted_move(self):
+        journal_path = os.path.join(self._tmp.name, "deplacements.jsonl")
+        journal = MoveJournal(journal_path)
+        moved = os.path.join(self.dest, "a.pdf")
+        left = os.path.join(self.source, "b.pdf")
+        self.write(self.dest, "a.pdf", "a")
+        self.write(self.source, "b.pdf", "b")
+        # Arrêt brutal : déplacement de a.pdf fait, celui de b.pdf non
+        journal.begin(os.path.join(self.source, "a.pdf"), moved)
+        journal.begin(left, os.path.join(self.dest, "b.pdf"))
+        journal.close()
+
+        restored = rollback_moves(journal_path, log_callback=lambda msg: None)
+        self.assertEqual(restored, 1)
+        self.assertEqual(sorted(os.listdir(self.source)), ["a.pdf", "b.pdf"])
+
+if __name__ == '__main__':
+    unittest.main()
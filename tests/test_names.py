@@ -0,0 +1,38 @@
+import unittest
+import sys
+import os
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.names import NameIndex, name_keys, normalize_name, within_edit_distance
+from afis_console.core.records import AliasEntry
+
+class TestNames(unittest.TestCase):
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("  Léon-Marie  d'Arçy "), "LEON MARIE D ARCY")
+        self.assertEqual(normalize_name("ÉMILE\tZOLA"), "EMILE ZOLA")
+        # Caractères hors de la table précalculée (formes de compatibilité)
+        self.assertEqual(normalize_name("ＤＵＰＯＮＴ－ＪＥＡＮ"), "DUPONT JEAN")
+        self.assertEqual(normalize_name(""), "")
+
+    def test_name_keys(self):
+        keys = name_keys([AliasEntry("Dupont Jean", "01/02/1980", 1), AliasEntry("DUPONT-JEAN", "01/02/1980", 2)])
+        self.assertEqual(keys, {("DUPONT JEAN", "01/02/1980")})
+
+    def test_within_edit_distance(self):
+        self.assertTrue(within_edit_distance("DUPONT", "DUPOND", 1))
+        self.assertTrue(within_edit_distance("DUPONT", "DUPOTN", 1))  # lettres inversées
+        self.assertFalse(within_edit_distance("DUPONT", "DURAND", 1))
+        self.assertFalse(within_edit_distance("DUPONT", "DUPONTEL", 1))
+
+    def test_name_index_near(self):
+        index = NameIndex({("DUPONT JEAN MARIE", "01/02/1980"), ("MARTIN PAUL", "03/04/1975"), ("LI", "01/02/1980")})
+        self.assertTrue(index.near("DUPOND JEAN MARIE", "01/02/1980"))
+        self.assertTrue(index.near("JEAN MARIE DUPONT", "01/02/1980"))  # ordre des mots
+        self.assertFalse(index.near("DUPOND JEAN MARIE", "02/02/1980"))  # autre date de naissance
+        self.assertFalse(index.near("MARTIN PIERRE", "03/04/1975"))
+        self.assertTrue(index.near("LU", "01/02/1980"))  # nom court : pas de filtre par trigrammes
+
+if __name__ == '__main__':
+    unittest.main()
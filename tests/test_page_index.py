@@ -0,0 +1,39 @@
+import unittest
+import sys
+import os
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.page_index import PageWordIndex
+
+# (x0, y0, x1, y1, mot, bloc, ligne, mot_idx)
+WORDS = [
+    (10, 50, 80, 60, "Recherches", 0, 0, 0),
+    (85, 50, 200, 60, "dactyloscopiques", 0, 0, 1),
+    (205, 50, 270, 60, "concernant", 0, 0, 2),
+    (275, 50, 280, 60, ":", 0, 0, 3),
+    (10, 65, 60, 75, "DUPONT", 0, 1, 0),
+    (65, 65, 100, 75, "JEAN", 0, 1, 1),
+    (10, 100, 70, 110, "Homonymes", 1, 0, 0),
+    (300, 102, 320, 112, "NON", 2, 0, 0),
+    (10, 140, 30, 150, "non", 3, 0, 0),
+]
+
+class TestPageWordIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PageWordIndex(WORDS)
+
+    def test_first_containing_and_same_line(self):
+        homonymes = self.index.first_containing("homonyme")
+        self.assertEqual(homonymes.text, "Homonymes")
+        self.assertEqual([w.text for w in self.index.on_same_line(homonymes, "non", 3)], ["NON"])
+        self.assertEqual(self.index.on_same_line(homonymes, "non", 1), [])
+        self.assertIsNone(self.index.first_containing("signalisation"))
+
+    def test_line_after(self):
+        self.assertEqual(self.index.line_after("recherches dactyloscopiques concernant"), "DUPONT JEAN")
+        self.assertIsNone(self.index.line_after("absent"))
+
+if __name__ == '__main__':
+    unittest.main()
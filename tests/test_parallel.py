@@ -0,0 +1,20 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.parallel import resolve_workers
+
+class TestParallel(unittest.TestCase):
+    @patch('os.cpu_count', return_value=8)
+    def test_resolve_workers(self, _):
+        self.assertEqual(resolve_workers(0), 8)
+        self.assertEqual(resolve_workers(None), 8)
+        self.assertEqual(resolve_workers(3), 3)
+        self.assertEqual(resolve_workers(-1), 1)
+
+if __name__ == '__main__':
+    unittest.main()
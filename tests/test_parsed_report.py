@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import tempfile
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.parsed_report import ParsedReport
+from afis_console.core.sorter import process_folder
+
+def _mock_doc(words, text):
+    mock_doc = MagicMock()
+    mock_page = MagicMock()
+    mock_doc.__getitem__.return_value = mock_page
+    mock_doc.__len__.return_value = 1
+    mock_doc.__iter__.side_effect = lambda: iter([mock_page])
+    mock_page.get_text.side_effect = lambda *args, **kwargs: words if args == ('words',) else text
+    return mock_doc, mock_page
+
+class TestParsedReport(unittest.TestCase):
+    @patch('fitz.open')
+    def test_text_extracted_once(self, mock_open):
+        mock_doc, mock_page = _mock_doc([], "SECTION / Identités\n")
+        mock_open.return_value = mock_doc
+
+        with ParsedReport("dummy.pdf") as report:
+            self.assertEqual(report.full_text, "SECTION / Identités\n")
+            self.assertEqual(report.full_text, "SECTION / Identités\n")
+            self.assertEqual(report.page1_words, [])
+
+        mock_open.assert_called_once_with("dummy.pdf")
+        self.assertEqual(mock_page.get_text.call_count, 2)
+        mock_doc.close.assert_called_once()
+
+    @patch('fitz.open')
+    def test_section_stops_decoding_at_terminator(self, mock_open):
+        pages = [MagicMock() for _ in range(5)]
+        texts = ["Sommaire\nSECTION / Signalisations\n", "SECTION / Identités\nDUPONT\n",
+                 "SECTION / Signalisations\n", "page 4\n", "page 5\n"]
+        for page, text in zip(pages, texts):
+            page.get_text.return_value = text
+        mock_doc = MagicMock()
+        mock_doc.__len__.return_value = len(pages)
+        mock_doc.__getitem__.side_effect = lambda i: pages[i]
+        mock_open.return_value = mock_doc
+
+        with ParsedReport("long.pdf") as report:
+            text = report.text_through_section("SECTION / Identités", "SECTION / Signalisations")
+            self.assertEqual(text, ''.join(texts[:3]))
+            self.assertEqual(report.pages_decoded, 3)
+            # Deuxième appel : tout vient du cache
+            report.text_through_section("SECTION / Identités", "SECTION / Signalisations")
+            self.assertEqual(report.pages_decoded, 3)
+
+        for page in pages[3:]:
+            page.get_text.assert_not_called()
+
+    @patch('fitz.open')
+    def test_section_markers_must_be_whole_lines(self, mock_open):
+        # Sommaire en page 1 : les repères cités dans une ligne ne comptent pas
+        pages = [MagicMock() for _ in range(4)]
+        texts = ["Sommaire : SECTION / Identités, puis SECTION / Signalisations\n",
+                 "SECTION / Identités\nDUPONT JEAN\nné(e) le 01/01/1980\n",
+                 "SECTION / Signalisations\n", "page 4\n"]
+        for page, text in zip(pages, texts):
+            page.get_text.return_value = text
+        mock_doc = MagicMock()
+        mock_doc.__len__.return_value = len(pages)
+        mock_doc.__getitem__.side_effect = lambda i: pages[i]
+        mock_open.return_value = mock_doc
+
+        with ParsedReport("sommaire.pdf") as report:
+            text = report.text_through_section("SECTION / Identités", "SECTION / Signalisations")
+            self.assertEqual(text, ''.join(texts[:3]))
+            self.assertEqual(report.pages_decoded, 3)
+
+        pages[3].get_text.assert_not_called()
+
+    @patch('fitz.open')
+    def test_open_error_is_remembered(self, mock_open):
+        mock_open.side_effect = RuntimeError("broken")
+
+        with ParsedReport("broken.pdf") as report:
+            with self.assertRaises(RuntimeError):
+                report.page1_words
+            with self.assertRaises(RuntimeError):
+                report.full_text
+
+        mock_open.assert_called_once()
+
+    @patch('fitz.open')
+    def test_process_folder_opens_each_pdf_once(self, mock_open):
+        words = [
+            (10, 100, 50, 110, "Homonymes", 0, 0, 0),
+            (60, 100, 80, 110, "non", 0, 0, 1)
+        ]
+        mock_doc, _ = _mock_doc(words, "Recherches dactyloscopiques concernant :\nDUPONT JEAN\n")
+        mock_open.return_value = mock_doc
+
+        with tempfile.TemporaryDirectory() as tmp:
+            open(os.path.join(tmp, "rapport.pdf"), "wb").close()
+            stats = process_folder(tmp, log_callback=lambda msg: None)
+
+            self.assertEqual(stats['ok'], 1)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "Pas_d_homonyme", "rapport.pdf")))
+        mock_open.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
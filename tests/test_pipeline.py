@@ -0,0 +1,152 @@
+import unittest
+import json
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+
+# Add src and the repository root (benchmarks) to path for testing
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_report
+from afis_console.core import pipeline, sorter
+from afis_console.core.control import RunControl, load_checkpoint
+from afis_console.core.progress import FileClassified
+from afis_console.core.sorter import process_folder
+
+ID = "DUPONT JEAN"
+DOB = "01/02/1980"
+
+class TestPipelineEngine(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self._tmp.name, "source")
+        os.mkdir(self.source)
+        aliases = {
+            "a.pdf": [(ID, DOB, 1, 0), (ID, DOB, 4, 0)],
+            "b.pdf": [(ID, DOB, 1, 0), (ID, DOB, 4, 2)],
+            "c.pdf": [(ID, DOB, 1, 0), ("MARTIN PAUL", DOB, 3, 0)],
+            "d.pdf": [(ID, DOB, 1, 0), ("DUPONTJEAN", DOB, 3, 0)],
+        }
+        for name, entries in aliases.items():
+            generate_report(os.path.join(self.source, name), ID, DOB, entries)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, engine: str, **kwargs):
+        folder = os.path.join(self._tmp.name, engine)
+        shutil.copytree(self.source, folder)
+        logs = []
+        stats = process_folder(folder, log_callback=logs.append, use_cache=False, engine=engine, **kwargs)
+        placed = sorted(os.path.relpath(os.path.join(path, name), folder)
+                        for path, _, names in os.walk(folder) for name in names if name.endswith('.pdf'))
+        [export] = [name for name in os.listdir(folder) if name.startswith('rapport_') and name.endswith('.csv')]
+        with open(os.path.join(folder, export.replace('.csv', '.jsonl')), encoding='utf-8') as f:
+            rows = [(row['filename'], row['category'], row['destination'] is not None) for row in map(json.loads, f)]
+        stats.pop('timings')
+        return stats, placed, rows, [line for line in logs if '→' in line]
+
+    def test_same_results_as_sequential(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                sequential = self._run('sequential', workers=workers)
+                pipeline = self._run('pipeline', workers=workers)
+                self.assertEqual(pipeline, sequential)
+                shutil.rmtree(os.path.join(self._tmp.name, 'sequential'))
+                shutil.rmtree(os.path.join(self._tmp.name, 'pipeline'))
+
+    def test_cancel_keeps_remaining_files(self):
+        control = RunControl()
+
+        def cancel_after_first(event):
+            if isinstance(event, FileClassified):
+                control.cancel()
+
+        stats = process_folder(self.source, log_callback=lambda msg: None, use_cache=False, engine='pipeline',
+                               progress_callback=cancel_after_first, control=control)
+        self.assertTrue(stats['cancelled'])
+        self.assertEqual(stats['ok'], 1)
+        self.assertEqual([detail['filename'] for detail in load_checkpoint(self.source, self.source)], ["a.pdf"])
+        self.assertEqual(sorted(n for n in os.listdir(self.source) if n.endswith('.pdf')), ["b.pdf", "c.pdf", "d.pdf"])
+
+    def test_cancel_does_not_wait_for_discovery(self):
+        # La recherche des fichiers reste bloquée après les deux premiers
+        blocked = threading.Event()
+        iter_pdfs = sorter.iter_pdfs
+
+        def slow_discovery(*args, **kwargs):
+            for i, path in enumerate(iter_pdfs(*args, **kwargs)):
+                if i == 2:
+                    blocked.wait(5)
+                yield path
+
+        try:
+            for engine in ('sequential', 'pipeline'):
+                with self.subTest(engine=engine):
+                    folder = os.path.join(self._tmp.name, engine)
+                    shutil.copytree(self.source, folder)
+                    control = RunControl()
+                    def cancel_after_first(event):
+                        if isinstance(event, FileClassified):
+                            control.cancel()
+                    start = time.monotonic()
+                    with mock.patch.object(sorter, 'iter_pdfs', slow_discovery):
+                        stats = process_folder(folder, log_callback=lambda msg: None, use_cache=False,
+                                               engine=engine, io_mode='mmap', control=control,
+                                               progress_callback=cancel_after_first)
+                    self.assertTrue(stats['cancelled'])
+                    self.assertLess(time.monotonic() - start, 3)
+        finally:
+            blocked.set()
+
+    def test_cancel_with_full_read_queue(self):
+        # Plus de fichiers que les files n'en retiennent : la lecture
+        # interrompue attend une place pour signaler la fin
+        for i in range(36):
+            shutil.copy(os.path.join(self.source, "a.pdf"), os.path.join(self.source, f"copie_{i:02}.pdf"))
+        control = RunControl()
+
+        def cancel_after_first_move(message):
+            if '→' in message:
+                control.cancel()
+
+        stats = process_folder(self.source, log_callback=cancel_after_first_move, use_cache=False,
+                               engine='pipeline', control=control)
+        self.assertTrue(stats['cancelled'])
+        remaining = [n for n in os.listdir(self.source) if n.endswith('.pdf')]
+        placed = [n for path, _, names in os.walk(self.source) if path != self.source
+                  for n in names if n.endswith('.pdf')]
+        self.assertTrue(remaining)
+        self.assertEqual(len(remaining) + len(placed), 40)
+
+    def test_cache_digest_computed_in_read_thread(self):
+        copy = os.path.join(self._tmp.name, "copie")
+        shutil.copytree(self.source, copy)
+        dest = os.path.join(self._tmp.name, "dest")
+        threads = []
+
+        def digest(filepath, data=None):
+            threads.append(threading.current_thread().name)
+            return source_digest(filepath, data)
+
+        source_digest = pipeline._source_digest
+        with mock.patch.object(pipeline, '_source_digest', digest):
+            process_folder(self.source, log_callback=lambda msg: None, destination_dir=dest, engine='pipeline')
+            stats = process_folder(copy, log_callback=lambda msg: None, destination_dir=dest, engine='pipeline')
+        self.assertEqual(stats['cached'], 4)
+        self.assertEqual(len(threads), 8)
+        self.assertTrue(all(name.startswith('afis-read') for name in threads))
+
+    def test_unknown_engine_is_rejected(self):
+        with self.assertRaises(ValueError):
+            process_folder(self.source, log_callback=lambda msg: None, engine='pipelined')
+        self.assertEqual(sorted(os.listdir(self.source)), ["a.pdf", "b.pdf", "c.pdf", "d.pdf"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add src and the repository root (benchmarks) to path for testing
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_report
+from afis_console.core import progress
+from afis_console.core.progress import (
+    BatchSummary, FileClassified, FileMoved, FileStarted, ProgressMeter, format_seconds,
+)
+from afis_console.core.sorter import process_folder
+
+class TestProgress(unittest.TestCase):
+    def test_meter_rate_and_eta(self):
+        clock = iter([0.0, 1.0, 2.0])
+        with mock.patch.object(progress.time, 'monotonic', lambda: next(clock)):
+            meter = ProgressMeter(total=10)
+            meter.update(FileMoved("a.pdf", "ok", "/dest/a.pdf"))
+            meter.update(FileMoved("b.pdf", "ok", "/dest/b.pdf"))
+        self.assertEqual(meter.done, 2)
+        self.assertAlmostEqual(meter.rate, 1.0)
+        self.assertAlmostEqual(meter.eta, 8.0)
+        self.assertEqual(meter.describe(), "2/10 (20 %) · 1.0 fichiers/s · reste ~8 s")
+
+    def test_format_seconds(self):
+        self.assertEqual(format_seconds(42), "42 s")
+        self.assertEqual(format_seconds(130), "2 min 10 s")
+        self.assertEqual(format_seconds(3725), "1 h 02 min")
+
+    def test_process_folder_emits_events(self):
+        events = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("a.pdf", "b.pdf"):
+                generate_report(os.path.join(tmp, name), "DUPONT JEAN", "01/02/1980",
+                                [("DUPONT JEAN", "01/02/1980", 1, 0)])
+            process_folder(tmp, log_callback=lambda msg: None, use_cache=False,
+                           progress_callback=events.append)
+
+        kinds = [type(event) for event in events]
+        self.assertEqual(kinds, [FileStarted, FileClassified, FileMoved] * 2 + [BatchSummary])
+        # Le total n'est connu qu'une fois la recherche des PDF terminée
+        self.assertEqual(events[0][:2], ("a.pdf", 1))
+        self.assertEqual(events[3][:2], ("b.pdf", 2))
+        self.assertEqual(events[1].category, "ok")
+        self.assertIsNone(events[2].error)
+        self.assertEqual(events[-1].files, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add src and the repository root (benchmarks) to path for testing
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_report
+from afis_console.core import reader
+from afis_console.core.reader import read_source, read_sources, release_source, resolve_io_mode
+from afis_console.core.cache import data_digest
+from afis_console.core.sorter import _scheduled, analyze_report, process_folder
+
+class TestReader(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.pdf = os.path.join(self.tmp, "a.pdf")
+        generate_report(self.pdf, "DUPONT JEAN", "01/02/1980", [("DUPONT JEAN", "01/02/1980", 1, 2)])
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_resolve_io_mode(self):
+        with mock.patch.object(reader, 'is_network_path', return_value=True):
+            self.assertEqual(resolve_io_mode('auto', self.pdf), 'bulk')
+        with mock.patch.object(reader, 'is_network_path', return_value=False):
+            self.assertEqual(resolve_io_mode('auto', self.pdf), 'path')
+        # Une projection ne passe pas aux processus d'analyse
+        self.assertEqual(resolve_io_mode('mmap', self.pdf, workers=4), 'bulk')
+
+    def test_bulk_and_mmap_match_path(self):
+        with open(self.pdf, 'rb') as f:
+            content = f.read()
+        expected = analyze_report(self.pdf)
+        for mode in ('bulk', 'mmap'):
+            with self.subTest(mode=mode):
+                data = read_source(self.pdf, mode)
+                self.assertEqual(bytes(data), content)
+                detail = analyze_report(self.pdf, data)
+                release_source(data)
+                self.assertEqual(detail._replace(timings={}), expected._replace(timings={}))  # hors durées
+
+    def test_unreadable_file_falls_back_to_path(self):
+        missing = os.path.join(self.tmp, "absent.pdf")
+        [(path, data, _)] = list(read_sources([missing], 'bulk'))
+        self.assertEqual(path, missing)
+        self.assertIsNone(data)
+
+    def test_process_folder_with_prefetched_mmap(self):
+        stats = process_folder(self.tmp, log_callback=lambda msg: None, io_mode='mmap', prefetch=2)
+        self.assertEqual(stats['manual'], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "Homonymes_detectes", "a.pdf")))
+        self.assertIn('read', stats['timings'])
+
+    def test_read_ahead_bounded_when_mostly_cached(self):
+        # Un fichier à analyser suivi de fichiers en cache : la lecture
+        # anticipée s'arrête à la fenêtre, pas à la fin du lot
+        read = []
+        def sources():
+            for i in range(60):
+                read.append(i)
+                yield f"{i}.pdf", str(i).encode(), 0.0
+        first = data_digest(b"0")
+        cache = mock.MagicMock()
+        cache.get.side_effect = lambda digest: None if digest == first else {'category': 'ok'}
+        lookups = _scheduled(sources(), cache, workers=2)
+        try:
+            filepath, data, _, _, cached, _, analysis = next(lookups)
+            self.assertEqual(filepath, "0.pdf")
+            self.assertIsNone(cached)
+            self.assertIsNotNone(analysis)
+            self.assertEqual(len(read), 2 * 4)
+        finally:
+            lookups.close()
+
+if __name__ == '__main__':
+    unittest.main()
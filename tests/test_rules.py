@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.rules import AnalysisContext, Rule, evaluate
+from afis_console.core.sorter import analyze_report
+
+class TestRules(unittest.TestCase):
+    def test_extractions_run_only_when_needed(self):
+        calls = []
+
+        def extractor(name, value):
+            def extract(ctx):
+                calls.append(name)
+                return value
+            return extract
+
+        context = AnalysisContext(None, {'cheap': extractor('cheap', 1), 'costly': extractor('costly', 2)})
+        rules = (
+            Rule('first', ('cheap',), lambda v: v == 1, 'a', ''),
+            Rule('second', ('costly',), lambda v: True, 'b', ''),
+        )
+        self.assertEqual(evaluate(rules, context).name, 'first')
+        self.assertEqual(calls, ['cheap'])
+        self.assertIsNone(context.get_computed('costly'))
+
+    def test_extraction_is_memoized(self):
+        extract = MagicMock(return_value=False)
+        context = AnalysisContext(None, {'x': extract})
+        rules = (
+            Rule('first', ('x',), lambda v: v, 'a', ''),
+            Rule('second', ('x',), lambda v: not v, 'b', ''),
+        )
+        self.assertEqual(evaluate(rules, context).category, 'b')
+        extract.assert_called_once()
+
+    @patch('fitz.open')
+    def test_page1_error_skips_full_parse(self, mock_open):
+        mock_doc = MagicMock()
+        mock_doc.__len__.return_value = 0
+        mock_open.return_value = mock_doc
+
+        detail = analyze_report("vide.pdf")
+
+        self.assertEqual(detail.category, 'error')
+        self.assertIsNone(detail.identities)
+        self.assertIsNone(detail.identity_check)
+        self.assertEqual(detail.pages_decoded, 0)
+        mock_doc.__getitem__.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
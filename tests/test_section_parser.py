@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+# Add src to path for testing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from afis_console.core.records import AliasEntry, HomonymCount
+from afis_console.core.section_parser import scan_section
+
+SECTION = """SECTION / Identités
+DUPONT JEAN
+né(e) le 01/02/1980 à PARIS
+DUPONT JEAN est connu(e) sous les identités suivantes :
+né(e) le 01/02/1980
+DUPONT JEAN
+2
+Nombre d'homonymes :
+3
+né(e) le 03/04/1975
+DURAND JEAN
+1
+Nombre d'homonymes : 0
+Nombre d'homonymes
+(indique le nombre de personnes de même identité)
+né(e) le 05/06/1990
+MARTIN PAUL
+4"""
+
+class TestSectionParser(unittest.TestCase):
+    def test_aliases_and_homonyms_in_one_pass(self):
+        scan = scan_section(SECTION)
+        self.assertEqual(scan.identities.identity, "DUPONT JEAN")
+        self.assertEqual(scan.identities.dob, "01/02/1980")
+        # La légende « Nombre d'homonymes (indique ...) » termine la liste
+        self.assertEqual(scan.identities.aliases, (
+            AliasEntry("DUPONT JEAN", "01/02/1980", 2),
+            AliasEntry("DURAND JEAN", "03/04/1975", 1),
+        ))
+        # Valeur sur la ligne suivant le libellé
+        self.assertEqual(scan.homonyms, (HomonymCount("DUPONT JEAN", 3), HomonymCount("DURAND JEAN", 0)))
+
+    def test_lines_are_streamed(self):
+        self.assertEqual(scan_section(iter(SECTION.split('\n'))), scan_section(SECTION))
+
+    def test_count_without_birth_date_is_unidentified(self):
+        scan = scan_section("Texte\nNombre d'homonymes : 5\nSECTION / Identités\nX\n")
+        self.assertEqual(scan.homonyms, (HomonymCount("Non identifié", 5),))
+        self.assertEqual(scan.identities.identity, "X")
+        self.assertIsNone(scan.identities.dob)
+        self.assertEqual(scan.identities.aliases, ())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ import os
 # Add src to path for testing
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from afis_console.core.sorter import has_no_homonyme
+from afis_console.core.sorter import extract_main_identity, has_no_homonyme
 
 class TestSorter(unittest.TestCase):
     @patch('fitz.open')
@@ -63,5 +63,27 @@ class TestSorter(unittest.TestCase):
         result = has_no_homonyme("dummy.pdf")
         self.assertFalse(result)
 
+    @patch('fitz.open')
+    def test_main_identity_keeps_original_spacing(self, mock_open):
+        mock_doc = MagicMock()
+        mock_page = MagicMock()
+        mock_open.return_value = mock_doc
+        mock_doc.__getitem__.return_value = mock_page
+        mock_doc.__len__.return_value = 1
+
+        # Ligne repérée par les mots, affichée telle qu'écrite (double espace)
+        words = [
+            (10, 100, 50, 110, "Recherches", 0, 0, 0),
+            (60, 100, 90, 110, "dactyloscopiques", 0, 0, 1),
+            (95, 100, 130, 110, "concernant", 0, 0, 2),
+            (135, 100, 140, 110, ":", 0, 0, 3),
+            (10, 120, 50, 130, "DUPONT", 0, 1, 0),
+            (70, 120, 100, 130, "JEAN", 0, 1, 1),
+        ]
+        text = "Recherches dactyloscopiques concernant :\nDUPONT  JEAN \n"
+        mock_page.get_text.side_effect = lambda *args, **kwargs: words if args == ('words',) else text
+
+        self.assertEqual(extract_main_identity("dummy.pdf"), "DUPONT  JEAN")
+
 if __name__ == '__main__':
     unittest.main()
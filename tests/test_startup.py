@@ -0,0 +1,22 @@
+import unittest
+import sys
+import os
+import subprocess
+
+# Add src to path for testing
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC = os.path.join(ROOT, 'src')
+
+class TestStartup(unittest.TestCase):
+    def test_cli_does_not_import_heavy_modules(self):
+        # Processus neuf : les autres tests ont déjà chargé fitz dans celui-ci
+        code = (
+            "import sys, afis_console.main; "
+            "print(','.join(m for m in ('fitz', 'pymupdf', 'tkinter', 'customtkinter') if m in sys.modules))"
+        )
+        env = dict(os.environ, PYTHONPATH=SRC)
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True)
+        self.assertEqual(result.stdout.strip(), "")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add src and the repository root (benchmarks) to path for testing
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_report
+from afis_console.core.sorter import analyze_report, process_folder
+
+ID = "DUPONT JEAN"
+DOB = "01/02/1980"
+
+CASES = {
+    'propre.pdf': (dict(aliases=[(ID, DOB, 1, 0), (ID, DOB, 4, 0)]), 'ok'),
+    'page1.pdf': (dict(aliases=[(ID, DOB, 1, 0), (ID, DOB, 4, 0)], page1_homonyms=True), 'manual'),
+    'section.pdf': (dict(aliases=[(ID, DOB, 1, 0), (ID, DOB, 4, 2)]), 'manual'),
+    'espaces.pdf': (dict(aliases=[(ID, DOB, 1, 0), ("DUPONTJEAN", DOB, 3, 0)]), 'identity_error_space'),
+    'etat_civil.pdf': (dict(aliases=[(ID, DOB, 1, 0), ("MARTIN PAUL", DOB, 3, 0)]), 'identity_error'),
+    'proche.pdf': (dict(aliases=[(ID, DOB, 1, 0), ("JEAN DUPOND", DOB, 3, 0)]), 'identity_error_near'),
+}
+
+CATEGORIES = ('ok', 'manual', 'identity_error', 'identity_error_space', 'identity_error_near')
+
+class TestSyntheticReports(unittest.TestCase):
+    """Rapports PDF réels produits par benchmarks/synthetic.py (sans mock de fitz)."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        for filename, (kwargs, _) in CASES.items():
+            generate_report(os.path.join(self.tmp, filename), ID, DOB, signalisation_pages=3, **kwargs)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_categories(self):
+        for filename, (_, expected) in CASES.items():
+            with self.subTest(filename=filename):
+                detail = analyze_report(os.path.join(self.tmp, filename))
+                self.assertEqual(detail.category, expected)
+
+    def test_alias_counts_kept_when_decided_earlier(self):
+        # Tri décidé par l'état civil : les nombres d'homonymes restent au rapport
+        detail = analyze_report(os.path.join(self.tmp, 'etat_civil.pdf'))
+        self.assertEqual(detail.category, 'identity_error')
+        self.assertEqual([(i.alias, i.count) for i in detail.identities], [(ID, 0), ("MARTIN PAUL", 0)])
+
+    def test_signalisation_pages_are_not_decoded(self):
+        detail = analyze_report(os.path.join(self.tmp, 'propre.pdf'))
+        # Page de garde + SECTION / Identités ; les 3 pages de signalisations sont ignorées
+        self.assertEqual(detail.pages_decoded, 2)
+
+    def test_process_folder_parallel(self):
+        stats = process_folder(self.tmp, log_callback=lambda msg: None, workers=2, use_cache=False)
+        self.assertEqual((stats['ok'], stats['manual'], stats['identity_error'], stats['identity_error_space'],
+                          stats['identity_error_near']), (1, 2, 1, 1, 1))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "Erreur_Etat_civil", "Espaces_inseres", "espaces.pdf")))
+
+    def test_dry_run_leaves_source_untouched(self):
+        with tempfile.TemporaryDirectory() as out:
+            stats = process_folder(self.tmp, log_callback=lambda msg: None, destination_dir=out,
+                                   use_cache=False, dry_run=True)
+            self.assertEqual(sorted(os.listdir(self.tmp)), sorted(CASES))
+            self.assertEqual(stats['manual'], 2)
+            self.assertEqual(stats['reclassified'], 0)
+            self.assertTrue(any(name.endswith('.jsonl') for name in os.listdir(out)))
+            self.assertFalse(os.path.exists(os.path.join(out, "Pas_d_homonyme")))
+
+    def test_dry_run_reclassifies_sorted_archive(self):
+        process_folder(self.tmp, log_callback=lambda msg: None, use_cache=False, export_formats=())
+        # Un fichier rangé à tort dans l'archive
+        os.replace(os.path.join(self.tmp, "Pas_d_homonyme", "propre.pdf"),
+                   os.path.join(self.tmp, "Homonymes_detectes", "propre.pdf"))
+        with tempfile.TemporaryDirectory() as out:
+            stats = process_folder(self.tmp, log_callback=lambda msg: None, destination_dir=out,
+                                   use_cache=False, recursive=True, dry_run=True)
+        self.assertEqual(sum(stats[c] for c in CATEGORIES), len(CASES))
+        self.assertEqual(stats['reclassified'], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "Homonymes_detectes", "propre.pdf")))
+
+if __name__ == '__main__':
+    unittest.main()
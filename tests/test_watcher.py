@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+import threading
+
+# Add src and the repository root (benchmarks) to path for testing
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate_report
+from afis_console.core import parallel
+from afis_console.core.mover import rollback_moves
+from afis_console.core.watcher import _StabilityTracker, watch_folder
+
+class TestStabilityTracker(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.path = os.path.join(self.tmp, "rapport.pdf")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, content):
+        with open(self.path, "wb") as f:
+            f.write(content)
+
+    @patch('afis_console.core.watcher.time.monotonic')
+    def test_file_ready_once_size_is_stable(self, clock):
+        tracker = _StabilityTracker(settle_time=2)
+        self._write(b"%PDF")
+        clock.return_value = 100
+        self.assertEqual(tracker.ready(self.tmp), [])
+
+        # Le fichier grossit encore : le délai repart de zéro
+        self._write(b"%PDF-1.4 suite")
+        clock.return_value = 101
+        self.assertEqual(tracker.ready(self.tmp), [])
+        clock.return_value = 102
+        self.assertEqual(tracker.ready(self.tmp), [])
+        clock.return_value = 103
+        self.assertEqual(tracker.ready(self.tmp), [self.path])
+
+    @patch('afis_console.core.watcher.time.monotonic', return_value=100)
+    def test_close_write_event_makes_file_ready(self, _):
+        tracker = _StabilityTracker(settle_time=60)
+        self._write(b"%PDF")
+        tracker.mark_closed(self.path)
+        self.assertEqual(tracker.ready(self.tmp), [self.path])
+
+    @patch('afis_console.core.watcher.time.monotonic', return_value=100)
+    def test_empty_and_failed_files_are_skipped(self, _):
+        tracker = _StabilityTracker(settle_time=0)
+        self._write(b"")
+        self.assertEqual(tracker.ready(self.tmp), [])
+
+        self._write(b"%PDF")
+        self.assertEqual(tracker.ready(self.tmp), [self.path])
+        tracker.mark_failed(self.path)
+        self.assertEqual(tracker.ready(self.tmp), [])
+
+class TestWatchFolder(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.source = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _watch_until_sorted(self, **kwargs):
+        stop_event = threading.Event()
+        logs = []
+
+        def log(message):
+            logs.append(message)
+            if '→' in message:
+                stop_event.set()
+
+        stats = watch_folder(self.source, log_callback=log, use_cache=False, poll_interval=0.05, settle_time=0,
+                             stop_event=stop_event, **kwargs)
+        return stats, logs
+
+    def test_batch_outputs_and_rollback(self):
+        pdf = os.path.join(self.source, "a.pdf")
+        generate_report(pdf, "DUPONT JEAN", "01/02/1980", [("DUPONT JEAN", "01/02/1980", 1, 2)])
+        with patch('afis_console.core.watcher._open_notifier', return_value=None):
+            stats, _ = self._watch_until_sorted(engine='pipeline')
+        self.assertEqual(stats['manual'], 1)
+        self.assertFalse(os.path.exists(pdf))
+        names = os.listdir(self.source)
+        [journal] = [name for name in names if name.startswith('deplacements_')]
+        self.assertTrue(any(name.startswith('rapport_') and name.endswith('.jsonl') for name in names))
+        self.assertTrue(any(name.endswith('.timings.json') for name in names))
+
+        self.assertEqual(rollback_moves(os.path.join(self.source, journal), log_callback=lambda msg: None), 1)
+        self.assertTrue(os.path.exists(pdf))
+
+    def test_one_process_pool_for_all_batches(self):
+        for engine in ('sequential', 'pipeline'):
+            with self.subTest(engine=engine), tempfile.TemporaryDirectory() as source:
+                def add_batch(*names):
+                    for name in names:
+                        generate_report(os.path.join(source, name), "DUPONT JEAN", "01/02/1980",
+                                        [("DUPONT JEAN", "01/02/1980", 1, 0)])
+
+                stop_event = threading.Event()
+                moved = []
+
+                def log(message):
+                    if '→' in message:
+                        moved.append(message)
+                        if len(moved) == 2:
+                            add_batch("c.pdf", "d.pdf")  # second lot, après le premier
+                        elif len(moved) == 4:
+                            stop_event.set()
+
+                add_batch("a.pdf", "b.pdf")
+                pool = patch('afis_console.core.watcher.process_pool', wraps=parallel.process_pool)
+                own_pools = [patch(f'afis_console.core.{module}.process_pool', side_effect=AssertionError)
+                             for module in ('sorter', 'pipeline')]
+                with patch('afis_console.core.watcher._open_notifier', return_value=None), \
+                        pool as watcher_pool, own_pools[0], own_pools[1]:
+                    stats = watch_folder(source, log_callback=log, workers=2, use_cache=False, poll_interval=0.05,
+                                         settle_time=0, stop_event=stop_event, engine=engine)
+                self.assertEqual(stats['ok'], 4)
+                watcher_pool.assert_called_once_with(2)
+
+    def test_unknown_engine_is_rejected(self):
+        with self.assertRaises(ValueError):
+            watch_folder(self.source, log_callback=lambda msg: None, engine='pipelined')
+
+if __name__ == '__main__':
+    unittest.main()